@@ -6,7 +6,7 @@ qdrant &
 echo "Waiting for Qdrant to initialize..."
 until curl -s http://127.0.0.1:6333/collections >/dev/null; do
   echo "Qdrant is not ready yet, waiting..."
-  sleep 10
+  sleep 0.5
 done
 echo "Qdrant is up and running!"
 
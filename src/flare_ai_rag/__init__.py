@@ -1,6 +1,26 @@
-from flare_ai_rag.ai import GeminiProvider
-from flare_ai_rag.api import ChatRouter, router
-from flare_ai_rag.attestation import Vtpm
-from flare_ai_rag.bot_manager import start_bot_manager
+from typing import TYPE_CHECKING
 
-__all__ = ["ChatRouter", "GeminiProvider", "Vtpm", "router", "start_bot_manager"]
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .ai import GeminiProvider
+    from .api import ChatRouter
+    from .attestation import Vtpm
+    from .bot_manager import start_bot_manager
+
+__all__ = [
+    "ChatRouter",
+    "GeminiProvider",
+    "Vtpm",
+    "start_bot_manager",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "GeminiProvider": ".ai",
+        "ChatRouter": ".api",
+        "Vtpm": ".attestation",
+        "start_bot_manager": ".bot_manager",
+    },
+)
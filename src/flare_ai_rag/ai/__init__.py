@@ -1,15 +1,57 @@
-from .base import AsyncBaseClient, BaseClient, BaseAIProvider
-from .gemini import EmbeddingTaskType, GeminiEmbedding, GeminiProvider
-from .model import Model
-from .openrouter import OpenRouterClient
+from typing import TYPE_CHECKING
+
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .base import AsyncBaseClient, BaseAIProvider, BaseClient
+    from .batch import BatchItemResult, BatchResult, BatchStats
+    from .gemini import EmbeddingTaskType, GeminiEmbedding, GeminiProvider
+    from .model import GenerationProfile, Model
+    from .openrouter import AsyncOpenRouterClient, OpenRouterClient, OpenRouterProvider
+    from .pool import ProviderPool, ProviderPoolError
+    from .registry import GeminiRegistry, gemini_registry
 
 __all__ = [
     "AsyncBaseClient",
+    "AsyncOpenRouterClient",
     "BaseClient",
+    "BatchItemResult",
+    "BatchResult",
+    "BatchStats",
     "EmbeddingTaskType",
     "GeminiEmbedding",
     "GeminiProvider",
+    "GeminiRegistry",
+    "GenerationProfile",
     "Model",
     "OpenRouterClient",
-    "BaseAIProvider"
+    "OpenRouterProvider",
+    "ProviderPool",
+    "ProviderPoolError",
+    "BaseAIProvider",
+    "gemini_registry",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "AsyncBaseClient": ".base",
+        "BaseClient": ".base",
+        "BaseAIProvider": ".base",
+        "BatchItemResult": ".batch",
+        "BatchResult": ".batch",
+        "BatchStats": ".batch",
+        "EmbeddingTaskType": ".gemini",
+        "GeminiEmbedding": ".gemini",
+        "GeminiProvider": ".gemini",
+        "GenerationProfile": ".model",
+        "Model": ".model",
+        "AsyncOpenRouterClient": ".openrouter",
+        "OpenRouterClient": ".openrouter",
+        "OpenRouterProvider": ".openrouter",
+        "ProviderPool": ".pool",
+        "ProviderPoolError": ".pool",
+        "GeminiRegistry": ".registry",
+        "gemini_registry": ".registry",
+    },
+)
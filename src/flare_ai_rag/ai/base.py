@@ -1,10 +1,13 @@
+import threading
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Literal, Protocol, TypedDict, runtime_checkable
 
 import httpx
 import requests
 
+from flare_ai_rag.ai.model import GenerationProfile
+
 
 @dataclass
 class ModelResponse:
@@ -13,6 +16,8 @@ class ModelResponse:
     text: str
     raw_response: Any  # Original provider response
     metadata: dict[str, Any]
+    # Structured output (enum member or JSON object) when a schema was requested
+    parsed: Any = field(default=None)
 
 
 @runtime_checkable
@@ -54,6 +59,7 @@ class BaseAIProvider(ABC):
         prompt: str,
         response_mime_type: str | None = None,
         response_schema: Any | None = None,
+        generation_profile: GenerationProfile | None = None,
     ) -> ModelResponse:
         """Generate a response without maintaining conversation context
 
@@ -62,12 +68,12 @@ class BaseAIProvider(ABC):
             response_mime_type: Expected response format
                 (e.g., "text/plain", "application/json")
             response_schema: Expected response structure schema
+            generation_profile: Per-call sampling and output length settings
 
         Returns:
             ModelResponse containing the generated text and metadata
         """
 
-
     @abstractmethod
     def send_message(self, msg: str) -> ModelResponse:
         """Send a message in a conversational context
@@ -105,12 +111,27 @@ class BaseClient:
         """
         self.base_url = base_url.rstrip("/")  # Ensure no trailing slash
         self.api_key = api_key
-        self.session = requests.Session()
+        self._sessions = threading.local()
         # Set up headers: include the Authorization header if an API key is provided.
         self.headers = {"accept": "application/json"}
         if self.api_key:
             self.headers["Authorization"] = f"Bearer {self.api_key}"
 
+    @property
+    def session(self) -> requests.Session:
+        """
+        The HTTP session of the calling thread.
+
+        `requests.Session` is not thread-safe, so threads sending requests
+        concurrently (e.g. the workers of a batch) each get their own session
+        and connection pool.
+        """
+        session: requests.Session | None = getattr(self._sessions, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._sessions.session = session
+        return session
+
     def _get(self, endpoint: str, params: dict | None = None) -> dict:
         """
         Make a GET request to the API and return the JSON response.
@@ -0,0 +1,95 @@
+"""
+Batch Completion Helpers
+
+Result containers and aggregate statistics shared by the sync and async
+OpenRouter clients when fanning out many chat completion payloads at once.
+"""
+
+import math
+from dataclasses import dataclass
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of a single payload within a batch."""
+
+    index: int
+    response: dict | None
+    error: Exception | None
+    latency: float
+
+    @property
+    def ok(self) -> bool:
+        """Whether the request for this payload succeeded."""
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class BatchStats:
+    """Aggregate latency and throughput statistics for a batch."""
+
+    total: int
+    succeeded: int
+    failed: int
+    wall_time: float
+    mean_latency: float
+    p50_latency: float
+    p95_latency: float
+    max_latency: float
+    throughput: float
+
+
+@dataclass
+class BatchResult:
+    """Ordered per-item results of a batch together with aggregate statistics."""
+
+    items: list[BatchItemResult]
+    stats: BatchStats
+
+    @property
+    def responses(self) -> list[dict | None]:
+        """Responses in payload order, `None` where the request failed."""
+        return [item.response for item in self.items]
+
+    @property
+    def errors(self) -> list[Exception | None]:
+        """Errors in payload order, `None` where the request succeeded."""
+        return [item.error for item in self.items]
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Nearest-rank percentile of `values`.
+
+    :param values: Sample values, in any order.
+    :param q: Percentile in the range [0, 100].
+    :return: The percentile value, or 0.0 for an empty sample.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize_batch(items: list[BatchItemResult], wall_time: float) -> BatchStats:
+    """
+    Compute aggregate statistics for a finished batch.
+
+    :param items: Per-item results of the batch.
+    :param wall_time: Elapsed wall-clock time of the whole batch in seconds.
+    :return: The aggregated BatchStats.
+    """
+    latencies = [item.latency for item in items]
+    succeeded = sum(1 for item in items if item.ok)
+    return BatchStats(
+        total=len(items),
+        succeeded=succeeded,
+        failed=len(items) - succeeded,
+        wall_time=wall_time,
+        mean_latency=sum(latencies) / len(latencies) if latencies else 0.0,
+        p50_latency=percentile(latencies, 50),
+        p95_latency=percentile(latencies, 95),
+        max_latency=max(latencies, default=0.0),
+        throughput=len(items) / wall_time if wall_time > 0 else 0.0,
+    )
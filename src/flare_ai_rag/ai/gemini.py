@@ -6,20 +6,24 @@ with Google's Generative AI service. It handles chat sessions, content generatio
 and message management while maintaining a consistent AI personality.
 """
 
-from typing import Any, override
+from typing import TYPE_CHECKING, Any, override
 
 import structlog
-from google.generativeai.client import configure
 from google.generativeai.embedding import (
     EmbeddingTaskType,
 )
 from google.generativeai.embedding import (
     embed_content as _embed_content,
 )
-from google.generativeai.generative_models import ChatSession, GenerativeModel
 from google.generativeai.types import GenerationConfig
 
 from flare_ai_rag.ai.base import BaseAIProvider, ModelResponse
+from flare_ai_rag.ai.model import GenerationProfile
+from flare_ai_rag.ai.registry import gemini_registry
+from flare_ai_rag.utils.parser_utils import parse_structured_output
+
+if TYPE_CHECKING:
+    from google.generativeai.generative_models import ChatSession, GenerativeModel
 
 logger = structlog.get_logger(__name__)
 
@@ -38,6 +42,24 @@ more engaging - your goal is to be helpful first, entertaining second.
 """
 
 
+def token_usage(response: Any) -> dict[str, int]:
+    """
+    Token counts of a Gemini response, from its `usage_metadata`.
+
+    Returns:
+        dict[str, int]: `prompt_tokens`, `completion_tokens` and
+            `total_tokens`, or an empty dict if the response has no usage
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return {}
+    return {
+        "prompt_tokens": usage.prompt_token_count,
+        "completion_tokens": usage.candidates_token_count,
+        "total_tokens": usage.total_token_count,
+    }
+
+
 class GeminiProvider(BaseAIProvider):
     """
     Provider class for Google's Gemini AI service.
@@ -63,11 +85,10 @@ class GeminiProvider(BaseAIProvider):
             **kwargs (str): Additional configuration parameters including:
                 - system_instruction: Custom system prompt for the AI personality
         """
-        configure(api_key=api_key)
+        gemini_registry.configure(api_key)
         self.chat: ChatSession | None = None
-        self.model = GenerativeModel(
-            model_name=model,
-            system_instruction=kwargs.get("system_instruction", SYSTEM_INSTRUCTION),
+        self.model: GenerativeModel = gemini_registry.get_model(
+            model, kwargs.get("system_instruction", SYSTEM_INSTRUCTION)
         )
         self.chat_history = []
         self.logger = logger.bind(service="gemini")
@@ -98,10 +119,7 @@ class GeminiProvider(BaseAIProvider):
         """
         new_system_instruction = kwargs.get("system_instruction", SYSTEM_INSTRUCTION)
         # Reinitialize the generative model.
-        self.model = GenerativeModel(
-            model_name=model,
-            system_instruction=new_system_instruction,
-        )
+        self.model = gemini_registry.get_model(model, new_system_instruction)
         # Reset chat session and history with the new system instruction.
         self.chat = None
         self.chat_history = [{"role": "system", "content": new_system_instruction}]
@@ -115,6 +133,7 @@ class GeminiProvider(BaseAIProvider):
         prompt: str,
         response_mime_type: str | None = None,
         response_schema: Any | None = None,
+        generation_profile: GenerationProfile | None = None,
     ) -> ModelResponse:
         """
         Generate content using the Gemini model.
@@ -123,6 +142,8 @@ class GeminiProvider(BaseAIProvider):
             prompt (str): Input prompt for content generation
             response_mime_type (str | None): Expected MIME type for the response
             response_schema (Any | None): Schema defining the response structure
+            generation_profile (GenerationProfile | None): Max output tokens,
+                temperature, stop sequences and candidate count for this call
 
         Returns:
             ModelResponse: Generated content with metadata including:
@@ -131,11 +152,22 @@ class GeminiProvider(BaseAIProvider):
                 - metadata: Additional response information including:
                     - candidate_count: Number of generated candidates
                     - prompt_feedback: Feedback on the input prompt
+                    - usage: Prompt, completion and total token counts
+                - parsed: The enum member or JSON object when a response
+                    schema was requested
         """
+        profile = generation_profile or GenerationProfile()
         response = self.model.generate_content(
             prompt,
             generation_config=GenerationConfig(
-                response_mime_type=response_mime_type, response_schema=response_schema
+                response_mime_type=response_mime_type,
+                response_schema=response_schema,
+                max_output_tokens=profile.max_output_tokens,
+                temperature=profile.temperature,
+                stop_sequences=list(profile.stop_sequences)
+                if profile.stop_sequences
+                else None,
+                candidate_count=profile.candidate_count,
             ),
         )
         self.logger.debug("generate", prompt=prompt, response_text=response.text)
@@ -145,7 +177,11 @@ class GeminiProvider(BaseAIProvider):
             metadata={
                 "candidate_count": len(response.candidates),
                 "prompt_feedback": response.prompt_feedback,
+                "usage": token_usage(response),
             },
+            parsed=parse_structured_output(
+                response.text, response_mime_type, response_schema
+            ),
         )
 
     @override
@@ -168,6 +204,7 @@ class GeminiProvider(BaseAIProvider):
                 - metadata: Additional response information including:
                     - candidate_count: Number of generated candidates
                     - prompt_feedback: Feedback on the input message
+                    - usage: Prompt, completion and total token counts
         """
         if not self.chat:
             self.chat = self.model.start_chat(history=self.chat_history)
@@ -179,6 +216,7 @@ class GeminiProvider(BaseAIProvider):
             metadata={
                 "candidate_count": len(response.candidates),
                 "prompt_feedback": response.prompt_feedback,
+                "usage": token_usage(response),
             },
         )
 
@@ -192,7 +230,7 @@ class GeminiEmbedding:
         Args:
             api_key (str): Google API key for authentication
         """
-        configure(api_key=api_key)
+        gemini_registry.configure(api_key)
 
     def embed_content(
         self,
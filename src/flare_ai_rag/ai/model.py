@@ -1,4 +1,15 @@
 from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    """Per-call generation settings passed to a provider's generate method."""
+
+    max_output_tokens: int | None = None
+    temperature: float | None = None
+    stop_sequences: tuple[str, ...] | None = None
+    candidate_count: int | None = None
 
 
 @dataclass(frozen=True)
@@ -6,3 +17,27 @@ class Model:
     model_id: str
     max_tokens: int | None
     temperature: float | None
+    stop_sequences: tuple[str, ...] | None = None
+    candidate_count: int | None = None
+
+    @staticmethod
+    def load(model_config: dict[str, Any]) -> "Model":
+        """Loads the model settings from a model config entry."""
+        stop_sequences = model_config.get("stop_sequences")
+        return Model(
+            model_id=model_config["id"],
+            max_tokens=model_config.get("max_tokens"),
+            temperature=model_config.get("temperature"),
+            stop_sequences=tuple(stop_sequences) if stop_sequences else None,
+            candidate_count=model_config.get("candidate_count"),
+        )
+
+    @property
+    def generation_profile(self) -> GenerationProfile:
+        """The generation settings of this model as a GenerationProfile."""
+        return GenerationProfile(
+            max_output_tokens=self.max_tokens,
+            temperature=self.temperature,
+            stop_sequences=self.stop_sequences,
+            candidate_count=self.candidate_count,
+        )
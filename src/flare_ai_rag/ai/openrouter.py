@@ -1,4 +1,26 @@
+import asyncio
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, override
+
+import structlog
+
 from flare_ai_rag.ai import AsyncBaseClient, BaseClient
+from flare_ai_rag.ai.base import BaseAIProvider, ModelResponse
+from flare_ai_rag.ai.batch import BatchItemResult, BatchResult, summarize_batch
+from flare_ai_rag.ai.model import GenerationProfile
+from flare_ai_rag.utils.parser_utils import (
+    parse_chat_response,
+    parse_chat_usage,
+    parse_structured_output,
+)
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_BATCH_CONCURRENCY = 8
+# Asks OpenRouter to report the cost of a completion along with its tokens.
+USAGE_ACCOUNTING = {"include": True}
 
 
 class OpenRouterClient(BaseClient):
@@ -71,6 +93,43 @@ class OpenRouterClient(BaseClient):
         endpoint = "/chat/completions"
         return self._post(endpoint, payload)
 
+    def send_chat_completions_batch(
+        self,
+        payloads: Sequence[dict],
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> BatchResult:
+        """
+        Send many prompts to the chat completions endpoint concurrently.
+
+        Requests are fanned out over a bounded thread pool, each worker
+        sending over its own HTTP session. Results keep the order of
+        `payloads`, and a failing payload is recorded on its own item without
+        affecting the rest of the batch.
+
+        :param payloads: Chat completion payloads, as for `send_chat_completion`.
+        :param max_concurrency: Maximum number of requests in flight at once.
+        :return: A BatchResult with per-item results and aggregate statistics.
+        """
+        if max_concurrency < 1:
+            msg = "max_concurrency must be at least 1"
+            raise ValueError(msg)
+
+        def run(index: int, payload: dict) -> BatchItemResult:
+            start = time.perf_counter()
+            try:
+                response = self.send_chat_completion(payload)
+            except Exception as e:  # noqa: BLE001
+                logger.warning("batch_item_failed", index=index, error=str(e))
+                return BatchItemResult(index, None, e, time.perf_counter() - start)
+            return BatchItemResult(index, response, None, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            items = list(executor.map(run, range(len(payloads)), payloads))
+        stats = summarize_batch(items, time.perf_counter() - start)
+        logger.info("batch_completed", **vars(stats))
+        return BatchResult(items=items, stats=stats)
+
 
 class AsyncOpenRouterClient(AsyncBaseClient):
     """Asynchronous client to interact with the OpenRouter API."""
@@ -105,3 +164,141 @@ class AsyncOpenRouterClient(AsyncBaseClient):
         """
         endpoint = "/chat/completions"
         return await self._post(endpoint, payload)
+
+    async def send_chat_completions_batch(
+        self,
+        payloads: Sequence[dict],
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> BatchResult:
+        """
+        Send many prompts to the chat completions endpoint concurrently.
+
+        At most `max_concurrency` requests are in flight at once. Results keep
+        the order of `payloads`, and a failing payload is recorded on its own
+        item without cancelling the rest of the batch.
+
+        :param payloads: Chat completion payloads, as for `send_chat_completion`.
+        :param max_concurrency: Maximum number of requests in flight at once.
+        :return: A BatchResult with per-item results and aggregate statistics.
+        """
+        if max_concurrency < 1:
+            msg = "max_concurrency must be at least 1"
+            raise ValueError(msg)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(index: int, payload: dict) -> BatchItemResult:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await self.send_chat_completion(payload)
+                except Exception as e:  # noqa: BLE001
+                    logger.warning("batch_item_failed", index=index, error=str(e))
+                    return BatchItemResult(index, None, e, time.perf_counter() - start)
+                return BatchItemResult(
+                    index, response, None, time.perf_counter() - start
+                )
+
+        start = time.perf_counter()
+        items = await asyncio.gather(
+            *(run(index, payload) for index, payload in enumerate(payloads))
+        )
+        stats = summarize_batch(list(items), time.perf_counter() - start)
+        logger.info("batch_completed", **vars(stats))
+        return BatchResult(items=list(items), stats=stats)
+
+
+class OpenRouterProvider(BaseAIProvider):
+    """
+    BaseAIProvider adapter around a single OpenRouter model.
+
+    Lets OpenRouter models be used wherever a provider is expected, e.g. as
+    members of a ProviderPool next to Gemini models.
+    """
+
+    def __init__(self, api_key: str, model: str, **kwargs: str) -> None:
+        """
+        Initialize the provider.
+
+        Args:
+            api_key (str): OpenRouter API key
+            model (str): OpenRouter model identifier
+            **kwargs (str): Additional configuration parameters including:
+                - base_url: Custom OpenRouter API base URL
+                - system_instruction: System prompt sent with every request
+        """
+        self.client = OpenRouterClient(api_key=api_key, base_url=kwargs.get("base_url"))
+        self.model = model
+        self.system_instruction = kwargs.get("system_instruction")
+        self.chat_history: list[dict[str, str]] = []
+
+    def _messages(self, history: list[dict[str, str]]) -> list[dict[str, str]]:
+        if self.system_instruction:
+            return [{"role": "system", "content": self.system_instruction}, *history]
+        return history
+
+    @override
+    def reset(self) -> None:
+        self.chat_history = []
+
+    @override
+    def reset_model(self, model: str, **kwargs: str) -> None:
+        self.model = model
+        self.system_instruction = kwargs.get(
+            "system_instruction", self.system_instruction
+        )
+        self.chat_history = []
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+        generation_profile: GenerationProfile | None = None,
+    ) -> ModelResponse:
+        payload: dict[str, Any] = {
+            "model": self.model,
+            "messages": self._messages([{"role": "user", "content": prompt}]),
+            "usage": USAGE_ACCOUNTING,
+        }
+        if response_mime_type == "application/json":
+            payload["response_format"] = {"type": "json_object"}
+        if generation_profile:
+            optional = {
+                "max_tokens": generation_profile.max_output_tokens,
+                "temperature": generation_profile.temperature,
+                "stop": list(generation_profile.stop_sequences or []) or None,
+                "n": generation_profile.candidate_count,
+            }
+            payload.update({k: v for k, v in optional.items() if v is not None})
+        response = self.client.send_chat_completion(payload)
+        text = parse_chat_response(response)
+        return ModelResponse(
+            text=text,
+            raw_response=response,
+            metadata={
+                "model": response.get("model", self.model),
+                "usage": parse_chat_usage(response),
+            },
+            parsed=parse_structured_output(text, response_mime_type, response_schema),
+        )
+
+    @override
+    def send_message(self, msg: str) -> ModelResponse:
+        self.chat_history.append({"role": "user", "content": msg})
+        payload = {
+            "model": self.model,
+            "messages": self._messages(self.chat_history),
+            "usage": USAGE_ACCOUNTING,
+        }
+        response = self.client.send_chat_completion(payload)
+        text = parse_chat_response(response)
+        self.chat_history.append({"role": "assistant", "content": text})
+        return ModelResponse(
+            text=text,
+            raw_response=response,
+            metadata={
+                "model": response.get("model", self.model),
+                "usage": parse_chat_usage(response),
+            },
+        )
@@ -0,0 +1,292 @@
+"""
+Provider Pool Module
+
+This module implements a BaseAIProvider that fronts several other providers
+(e.g. Gemini models and OpenRouter models). It tracks per-provider health and
+latency, prefers the fastest healthy provider, fails over on errors, opens a
+circuit breaker on providers that keep failing and can optionally hedge a slow
+request by firing a second provider once the first misses its p95 deadline.
+"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, override
+
+import structlog
+
+from flare_ai_rag.ai.base import BaseAIProvider, ModelResponse
+from flare_ai_rag.ai.batch import percentile
+from flare_ai_rag.ai.model import GenerationProfile
+
+logger = structlog.get_logger(__name__)
+
+# Minimum number of latency samples before a provider's own p95 is trusted
+# as its hedging deadline.
+MIN_HEDGE_SAMPLES = 5
+
+
+class ProviderPoolError(RuntimeError):
+    """Raised when no provider in the pool could serve a request."""
+
+
+@dataclass
+class ProviderHealth:
+    """Rolling health and latency statistics for one pooled provider."""
+
+    name: str
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=50))
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    open_until: float = 0.0
+
+    @property
+    def p50(self) -> float:
+        return percentile(list(self.latencies), 50)
+
+    @property
+    def p95(self) -> float:
+        return percentile(list(self.latencies), 95)
+
+    def is_available(self, now: float) -> bool:
+        """Closed or half-open circuits accept traffic, open ones do not."""
+        return now >= self.open_until
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "circuit_open": time.monotonic() < self.open_until,
+            "p50_latency": self.p50,
+            "p95_latency": self.p95,
+        }
+
+
+class ProviderPool(BaseAIProvider):
+    """
+    A BaseAIProvider that distributes calls over several member providers.
+
+    Members are ranked by median latency (members without samples are tried
+    first so they get measured). Calls fail over to the next member on error.
+    After `failure_threshold` consecutive failures a member's circuit opens for
+    `cooldown` seconds; once the cooldown elapses it is retried (half-open) and
+    closes again on the first success.
+
+    When `hedge` is enabled, `generate` fires the second-ranked member if the
+    first has not answered within its p95 latency (or `hedge_after` seconds
+    until enough samples exist) and returns whichever answers first. A member
+    failing before its deadline is failed over from like without hedging.
+    Health statistics are updated under a lock, as hedged calls complete on
+    the pool's worker threads.
+
+    Conversational state is kept by each member, so `send_message` sticks to
+    the best member and only fails over (without hedging) on errors.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        providers: Sequence[BaseAIProvider],
+        *,
+        names: Sequence[str] | None = None,
+        hedge: bool = False,
+        hedge_after: float = 2.0,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            providers: Member providers, in order of preference.
+            names: Optional labels for the members used in logs and metadata.
+            hedge: Whether to send hedged requests from `generate`.
+            hedge_after: Hedging deadline in seconds used until a member has
+                enough latency samples for its own p95.
+            failure_threshold: Consecutive failures that open a member's circuit.
+            cooldown: Seconds a member's circuit stays open.
+        """
+        if not providers:
+            msg = "ProviderPool requires at least one provider"
+            raise ValueError(msg)
+        if names is not None and len(names) != len(providers):
+            msg = "names must have the same length as providers"
+            raise ValueError(msg)
+        self.providers = list(providers)
+        labels = names or [
+            f"{type(provider).__name__}[{idx}]"
+            for idx, provider in enumerate(providers)
+        ]
+        self.health = [ProviderHealth(name=label) for label in labels]
+        self._lock = threading.Lock()
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.model = "pool"
+        self.chat_history = []
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(2, len(self.providers)), thread_name_prefix="pool"
+        )
+        self.logger = logger.bind(service="provider_pool")
+
+    def _ranked(self) -> list[int]:
+        """Indices of available members, fastest first."""
+        now = time.monotonic()
+        with self._lock:
+            ranks = {
+                idx: (bool(health.latencies), health.p50)
+                for idx, health in enumerate(self.health)
+                if health.is_available(now)
+            }
+        return sorted(ranks, key=ranks.__getitem__)
+
+    def _record_success(self, idx: int, latency: float) -> None:
+        health = self.health[idx]
+        with self._lock:
+            health.latencies.append(latency)
+            health.successes += 1
+            health.consecutive_failures = 0
+            health.open_until = 0.0
+
+    def _record_failure(self, idx: int, error: Exception) -> None:
+        health = self.health[idx]
+        with self._lock:
+            health.failures += 1
+            health.consecutive_failures += 1
+            opened = health.consecutive_failures >= self.failure_threshold
+            if opened:
+                health.open_until = time.monotonic() + self.cooldown
+        if opened:
+            self.logger.warning(
+                "circuit_opened", provider=health.name, cooldown=self.cooldown
+            )
+        self.logger.warning("provider_failed", provider=health.name, error=str(error))
+
+    def _timed(
+        self, idx: int, call: Callable[[BaseAIProvider], ModelResponse]
+    ) -> ModelResponse:
+        start = time.perf_counter()
+        try:
+            response = call(self.providers[idx])
+        except Exception as e:
+            self._record_failure(idx, e)
+            raise
+        self._record_success(idx, time.perf_counter() - start)
+        response.metadata["pool_member"] = self.health[idx].name
+        return response
+
+    def _hedge_deadline(self, idx: int) -> float:
+        health = self.health[idx]
+        with self._lock:
+            if len(health.latencies) >= MIN_HEDGE_SAMPLES:
+                return health.p95
+        return self.hedge_after
+
+    def _hedged(
+        self,
+        primary: int,
+        fallbacks: list[int],
+        call: Callable[[BaseAIProvider], ModelResponse],
+    ) -> ModelResponse:
+        """
+        Run `call` on `primary`, hedging with the first fallback past the deadline.
+
+        The fallback is taken off `fallbacks` only if it is fired, so when the
+        primary fails before its deadline the caller fails over to it at once.
+        """
+        first = self._executor.submit(self._timed, primary, call)
+        done, _ = wait([first], timeout=self._hedge_deadline(primary))
+        if done:
+            return first.result()
+
+        secondary = fallbacks.pop(0)
+        self.logger.info(
+            "hedging_request",
+            primary=self.health[primary].name,
+            secondary=self.health[secondary].name,
+        )
+        pending: set[Future[ModelResponse]] = {
+            first,
+            self._executor.submit(self._timed, secondary, call),
+        }
+        last_error: Exception | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:  # noqa: BLE001
+                    last_error = e
+        raise last_error or ProviderPoolError("Hedged request failed")
+
+    def _dispatch(
+        self,
+        call: Callable[[BaseAIProvider], ModelResponse],
+        *,
+        hedge: bool,
+    ) -> ModelResponse:
+        ranked = self._ranked()
+        if not ranked:
+            msg = "No healthy providers available in the pool"
+            raise ProviderPoolError(msg)
+
+        errors: list[str] = []
+        while ranked:
+            primary = ranked.pop(0)
+            try:
+                if hedge and ranked:
+                    return self._hedged(primary, ranked, call)
+                return self._timed(primary, call)
+            except Exception as e:  # noqa: BLE001
+                errors.append(str(e))
+        msg = f"All pooled providers failed: {errors}"
+        raise ProviderPoolError(msg)
+
+    def health_snapshot(self) -> list[dict[str, Any]]:
+        """Return the current health statistics of every member."""
+        with self._lock:
+            return [health.snapshot() for health in self.health]
+
+    @override
+    def reset(self) -> None:
+        """Reset the conversation history of every member."""
+        for provider in self.providers:
+            provider.reset()
+        self.chat_history = []
+
+    @override
+    def reset_model(self, model: str, **kwargs: str) -> None:
+        """Reinitialize every member with the given model and parameters."""
+        for provider in self.providers:
+            provider.reset_model(model, **kwargs)
+        self.chat_history = []
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+        generation_profile: GenerationProfile | None = None,
+    ) -> ModelResponse:
+        """Generate a response on the best available member."""
+        return self._dispatch(
+            lambda provider: provider.generate(
+                prompt,
+                response_mime_type=response_mime_type,
+                response_schema=response_schema,
+                generation_profile=generation_profile,
+            ),
+            hedge=self.hedge,
+        )
+
+    @override
+    def send_message(self, msg: str) -> ModelResponse:
+        """Send a chat message on the best available member."""
+        return self._dispatch(lambda provider: provider.send_message(msg), hedge=False)
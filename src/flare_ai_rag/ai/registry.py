@@ -0,0 +1,86 @@
+"""
+Gemini Client Registry
+
+This module keeps process-wide Gemini state in one place so that components
+do not repeat startup work:
+
+- `genai.configure` runs once per API key instead of once per provider,
+  embedding client and retriever.
+- `GenerativeModel` instances are shared per (model, system_instruction);
+  they are stateless, so providers keep their own chat sessions on top.
+- Tuned-model listings are cached with a TTL, so startup makes at most one
+  `list_tuned_models` network call.
+"""
+
+import threading
+import time
+
+import structlog
+from google.generativeai.client import configure
+from google.generativeai.generative_models import GenerativeModel
+from google.generativeai.models import list_tuned_models
+
+logger = structlog.get_logger(__name__)
+
+
+class GeminiRegistry:
+    """
+    Registry of configured Gemini clients and shared model instances.
+
+    Attributes:
+        listing_ttl (float): Seconds a tuned-model listing stays cached
+    """
+
+    def __init__(self, listing_ttl: float = 300.0) -> None:
+        self.listing_ttl = listing_ttl
+        self._api_key: str | None = None
+        self._models: dict[tuple[str, str | None], GenerativeModel] = {}
+        self._tuned_models: tuple[float, list[str]] | None = None
+        self._lock = threading.Lock()
+
+    def configure(self, api_key: str) -> None:
+        """Configure the Gemini client, skipping the call if already done."""
+        with self._lock:
+            if api_key == self._api_key:
+                return
+            configure(api_key=api_key)
+            # Cached state belongs to the previous credentials.
+            self._api_key = api_key
+            self._models.clear()
+            self._tuned_models = None
+        logger.debug("gemini_configured")
+
+    def get_model(
+        self, model_name: str, system_instruction: str | None = None
+    ) -> GenerativeModel:
+        """Return the shared GenerativeModel for a model and system prompt."""
+        key = (model_name, system_instruction)
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                model = GenerativeModel(
+                    model_name=model_name, system_instruction=system_instruction
+                )
+                self._models[key] = model
+            return model
+
+    def list_tuned_models(self) -> list[str]:
+        """Return the names of the available tuned models (cached with TTL)."""
+        with self._lock:
+            cached = self._tuned_models
+        if cached is not None and time.monotonic() - cached[0] < self.listing_ttl:
+            return cached[1]
+        names = [model.name for model in list_tuned_models()]
+        with self._lock:
+            self._tuned_models = (time.monotonic(), names)
+        return names
+
+    def clear(self) -> None:
+        """Drop every shared model and cached listing."""
+        with self._lock:
+            self._models.clear()
+            self._tuned_models = None
+
+
+# Create a global registry instance
+gemini_registry = GeminiRegistry()
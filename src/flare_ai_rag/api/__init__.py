@@ -1,3 +1,21 @@
-from .routes.chat import ChatMessage, ChatRouter, router
+from typing import TYPE_CHECKING
 
-__all__ = ["ChatMessage", "ChatRouter", "router"]
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .routes.chat import ChatMessage, ChatRouter, router
+
+__all__ = [
+    "ChatMessage",
+    "ChatRouter",
+    "router",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "ChatMessage": ".routes.chat",
+        "ChatRouter": ".routes.chat",
+        "router": ".routes.chat",
+    },
+)
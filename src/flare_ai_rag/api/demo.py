@@ -9,12 +9,13 @@ from datetime import datetime
 
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-from qdrant_client import QdrantClient
 from qdrant_client.http.models import Distance, VectorParams
 
 from flare_ai_rag.ingestion.pipeline import DataIngestionPipeline, DataSource
 from flare_ai_rag.retrieval.advanced_retriever import AdvancedRetriever
 from flare_ai_rag.embeddings.gemini_embeddings import GeminiEmbeddings
+from flare_ai_rag.retriever import RetrieverConfig, create_qdrant_client
+from flare_ai_rag.utils import load_json
 
 app = FastAPI(title="Flare AI RAG Demo")
 logger = logging.getLogger(__name__)
@@ -22,12 +23,23 @@ logger = logging.getLogger(__name__)
 # Initialize components
 QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
 QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 if not GEMINI_API_KEY:
     raise ValueError("GEMINI_API_KEY environment variable must be set")
 
-client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+retriever_config = RetrieverConfig.load(
+    {
+        **load_json(Path(__file__).parents[1] / "input_parameters.json")[
+            "retriever_config"
+        ],
+        "host": QDRANT_HOST,
+        "port": QDRANT_PORT,
+        "prefer_grpc": QDRANT_PREFER_GRPC,
+    }
+)
+client = create_qdrant_client(retriever_config)
 embedding_model = GeminiEmbeddings(api_key=GEMINI_API_KEY)
 pipeline = DataIngestionPipeline(client, embedding_model=embedding_model)
 retriever = AdvancedRetriever(
@@ -1,26 +1,75 @@
+import math
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from functools import partial
+from typing import Any
+
 import structlog
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, Field, field_validator
 
-from flare_ai_rag.ai import GeminiProvider
+from flare_ai_rag.ai import BaseAIProvider, GenerationProfile
 from flare_ai_rag.attestation import Vtpm, VtpmAttestationError
 from flare_ai_rag.prompts import PromptService, SemanticRouterResponse
+from flare_ai_rag.reranker import RerankStage
 from flare_ai_rag.responder import GeminiResponder
-from flare_ai_rag.retriever import QdrantRetriever
-from flare_ai_rag.router import GeminiRouter
+from flare_ai_rag.retriever import (
+    AdaptiveCutoff,
+    CutoffDecision,
+    MultiCollectionRetriever,
+    QdrantRetriever,
+    SearchHit,
+    build_filter,
+)
+from flare_ai_rag.router import (
+    BaseQueryRouter,
+    FastPathClassifier,
+    RouterDecisionCache,
+)
+from flare_ai_rag.telemetry import (
+    Admission,
+    PipelineTrace,
+    UsageAccountant,
+    UsageLimitError,
+    pipeline_trace,
+    stage,
+)
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
 
+
 class ChatMessage(BaseModel):
     """
     Pydantic model for chat message validation.
 
     Attributes:
         message (str): The chat message content, must not be empty
+        filters (dict[str, Any] | None): Optional payload filters restricting
+            document retrieval, e.g. {"keywords": ["ftso"]}
     """
 
     message: str = Field(..., min_length=1)
+    filters: dict[str, Any] | None = None
+
+    @field_validator("filters")
+    @classmethod
+    def check_filters(cls, filters: dict[str, Any] | None) -> dict[str, Any] | None:
+        """Reject filters on unindexed fields or with malformed expressions."""
+        build_filter(filters)
+        return filters
+
+
+def client_identity(request: Request) -> str | None:
+    """
+    Identify the caller of a request for usage accounting.
+
+    This is the client address, as seen through the trusted proxy (uvicorn
+    applies the proxy's `X-Forwarded-For` header). Callers cannot choose it,
+    so they cannot spread their usage over made-up accounts.
+    """
+    return request.client.host if request.client else None
 
 
 class ChatRouter:
@@ -34,26 +83,52 @@ class ChatRouter:
     def __init__(  # noqa: PLR0913
         self,
         router: APIRouter,
-        ai: GeminiProvider,
-        query_router: GeminiRouter,
-        retriever: QdrantRetriever,
+        ai: BaseAIProvider,
+        query_router: BaseQueryRouter,
+        retriever: QdrantRetriever | MultiCollectionRetriever,
         responder: GeminiResponder,
         attestation: Vtpm,
         prompts: PromptService,
+        *,
+        semantic_fast_path: FastPathClassifier | None = None,
+        rag_fast_path: FastPathClassifier | None = None,
+        decision_cache: RouterDecisionCache | None = None,
+        classification_profile: GenerationProfile | None = None,
+        rerank_stage: RerankStage | None = None,
+        cutoff: AdaptiveCutoff | None = None,
+        stage_timings: bool = False,
+        usage: UsageAccountant | None = None,
     ) -> None:
         """
         Initialize the ChatRouter.
 
         Args:
             router (APIRouter): FastAPI router to attach endpoints.
-            ai (GeminiProvider): AI client used by a simple semantic router
+            ai (BaseAIProvider): AI client used by a simple semantic router
                 to determine if an attestation was requested or if RAG
                 pipeline should be used.
             query_router: RAG Component that classifies the query.
-            retriever: RAG Component that retrieves relevant documents.
+            retriever: RAG Component that retrieves relevant documents, from
+                one collection or several routed collections.
             responder: RAG Component that generates a response.
             attestation (Vtpm): Provider for attestation services
             prompts (PromptService): Service for managing prompts
+            semantic_fast_path: Optional local classifier answering confident
+                semantic routing decisions without an LLM call.
+            rag_fast_path: Optional local classifier answering confident
+                ANSWER/CLARIFY/REJECT decisions without an LLM call.
+            decision_cache: Optional cache memoizing semantic routing decisions.
+            classification_profile: Generation settings (e.g. a few max output
+                tokens, temperature 0) for the semantic routing call.
+            rerank_stage: Optional stage reranking over-fetched candidates
+                within a latency budget before they reach the responder.
+            cutoff: Optional policy choosing how many retrieved documents
+                reach the responder, by score and context size.
+            stage_timings: Whether responses include the stage timings and
+                model token usage of the request under `metadata.timings`.
+            usage: Optional accountant recording the token usage and cost of
+                each request and rejecting requests over budget or rate
+                limits with HTTP 429.
         """
         self._router = router
         self.ai = ai
@@ -62,6 +137,14 @@ class ChatRouter:
         self.responder = responder
         self.attestation = attestation
         self.prompts = prompts
+        self.semantic_fast_path = semantic_fast_path
+        self.rag_fast_path = rag_fast_path
+        self.decision_cache = decision_cache
+        self.classification_profile = classification_profile
+        self.rerank_stage = rerank_stage
+        self.cutoff = cutoff
+        self.stage_timings = stage_timings
+        self.usage = usage
         self.logger = logger.bind(router="chat")
         self._setup_routes()
 
@@ -71,35 +154,97 @@ class ChatRouter:
         """
 
         @self._router.post("/")
-        async def chat(message: ChatMessage) -> dict[str, str] | None:  # pyright: ignore [reportUnusedFunction]
+        async def chat(message: ChatMessage, request: Request) -> dict[str, Any] | None:
             """
             Process a chat message through the RAG pipeline.
             Returns a response containing the query classification and the answer.
             """
+            admission = self.admit(client_identity(request))
             try:
                 self.logger.debug("Received chat message", message=message.message)
 
-                # If attestation has previously been requested:
-                if self.attestation.attestation_requested:
-                    try:
-                        resp = self.attestation.get_token([message.message])
-                    except VtpmAttestationError as e:
-                        resp = f"The attestation failed with  error:\n{e.args[0]}"
-                    self.attestation.attestation_requested = False
-                    return {"response": resp}
-
-                route = await self.get_semantic_route(message.message)
-                return await self.route_message(route, message.message)
+                with self.traced_request(admission) as trace:
+                    # If attestation has previously been requested:
+                    if self.attestation.attestation_requested:
+                        trace.route = "AttestationToken"
+                        response = self.handle_attestation_token(message.message)
+                    else:
+                        with stage("semantic_route"):
+                            route = await self.get_semantic_route(message.message)
+                        trace.route = route.value
+                        response = await self.route_message(
+                            route, message.message, filters=message.filters
+                        )
+                return self.report_timings(response, trace)
 
             except Exception as e:
                 self.logger.exception("Chat processing failed", error=str(e))
                 raise HTTPException(status_code=500, detail=str(e)) from e
 
+        @self._router.get("/router-cache")
+        async def router_cache_stats() -> dict[str, Any]:
+            """Return hit-rate metrics of the semantic routing decision cache."""
+            if not self.decision_cache:
+                return {"enabled": False}
+            return {"enabled": True, **self.decision_cache.stats()}
+
+        @self._router.get("/usage")
+        async def usage_stats() -> dict[str, Any]:
+            """Return token usage and spend by route and model."""
+            if not self.usage:
+                return {"enabled": False}
+            return {"enabled": True, **self.usage.spend()}
+
+        @self._router.get("/rerank")
+        async def rerank_stats() -> dict[str, Any]:
+            """Return counters of the rerank stage."""
+            if not self.rerank_stage:
+                return {"enabled": False}
+            return {"enabled": True, **self.rerank_stage.stats()}
+
     @property
     def router(self) -> APIRouter:
         """Return the underlying FastAPI router with registered endpoints."""
         return self._router
 
+    def admit(self, user: str | None) -> Admission | None:
+        """Reject a request over its budget or rate limits with HTTP 429."""
+        if not self.usage:
+            return None
+        try:
+            return self.usage.check(user)
+        except UsageLimitError as e:
+            raise HTTPException(
+                status_code=429,
+                detail=str(e),
+                headers={"Retry-After": str(math.ceil(e.retry_after))},
+            ) from e
+
+    @contextmanager
+    def traced_request(self, admission: Admission | None) -> Generator[PipelineTrace]:
+        """
+        Trace a request and record the usage of an admitted one, even if it fails.
+
+        Set the trace's `route` so the usage is accounted to the route.
+        """
+        with pipeline_trace() as trace:
+            try:
+                yield trace
+            finally:
+                if self.usage and admission:
+                    self.usage.record(trace, admission)
+
+    def report_timings(
+        self, response: dict[str, Any], trace: PipelineTrace
+    ) -> dict[str, Any]:
+        """Log the stage timings of a request and add them to the response."""
+        timings = trace.to_dict()
+        self.logger.info("Request timings", **timings)
+        # Only returned to clients when enabled in the telemetry config.
+        if self.stage_timings:
+            response.setdefault("metadata", {})["timings"] = timings
+        return response
+
     async def get_semantic_route(self, message: str) -> SemanticRouterResponse:
         """
         Determine the semantic route for a message using AI provider.
@@ -110,33 +255,63 @@ class ChatRouter:
         Returns:
             SemanticRouterResponse: Determined route for the message
         """
+        if self.semantic_fast_path:
+            label = self.semantic_fast_path.classify(message)
+            if label is not None:
+                self.logger.debug("semantic_route_fast_path", route=label)
+                return SemanticRouterResponse(label)
+
+        model_name = getattr(self.ai.model, "model_name", self.ai.model)
+        model_id = f"semantic_router:{model_name}"
+        if self.decision_cache:
+            cached = self.decision_cache.get(model_id, message)
+            if cached is not None:
+                return SemanticRouterResponse(cached)
+
         try:
             prompt, mime_type, schema = self.prompts.get_formatted_prompt(
                 "semantic_router", user_input=message
             )
             route_response = self.ai.generate(
-                prompt=prompt, response_mime_type=mime_type, response_schema=schema
+                prompt=prompt,
+                response_mime_type=mime_type,
+                response_schema=schema,
+                generation_profile=self.classification_profile,
+            )
+            route = (
+                route_response.parsed
+                if isinstance(route_response.parsed, SemanticRouterResponse)
+                else SemanticRouterResponse(route_response.text.strip())
             )
-            return SemanticRouterResponse(route_response.text)
         except Exception as e:
             self.logger.exception("routing_failed", error=str(e))
             return SemanticRouterResponse.CONVERSATIONAL
 
+        if self.decision_cache:
+            self.decision_cache.set(model_id, message, route.value)
+        return route
+
     async def route_message(
-        self, route: SemanticRouterResponse, message: str
-    ) -> dict[str, str]:
+        self,
+        route: SemanticRouterResponse,
+        message: str,
+        filters: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
         """
         Route a message to the appropriate handler based on semantic route.
 
         Args:
             route: Determined semantic route
             message: Original message to handle
+            filters: Payload filters for document retrieval in the RAG pipeline
 
         Returns:
-            dict[str, str]: Response from the appropriate handler
+            dict[str, Any]: Response from the appropriate handler
         """
         handlers = {
-            SemanticRouterResponse.RAG_ROUTER: self.handle_rag_pipeline,
+            SemanticRouterResponse.RAG_ROUTER: partial(
+                self.handle_rag_pipeline, filters=filters
+            ),
             SemanticRouterResponse.REQUEST_ATTESTATION: self.handle_attestation,
             SemanticRouterResponse.CONVERSATIONAL: self.handle_conversation,
         }
@@ -147,32 +322,112 @@ class ChatRouter:
 
         return await handler(message)
 
-    async def handle_rag_pipeline(self, _: str) -> dict[str, str]:
+    def classify_rag_query(self, message: str) -> str:
         """
-        Handle attestation requests.
+        Classify a query as ANSWER, CLARIFY or REJECT.
+
+        Uses the local fast-path classifier when it is confident and the
+        LLM-based query router otherwise.
+        """
+        if self.rag_fast_path:
+            label = self.rag_fast_path.classify(message)
+            if label is not None:
+                self.logger.debug("rag_route_fast_path", classification=label)
+                return label
+
+        prompt, mime_type, schema = self.prompts.get_formatted_prompt(
+            "rag_router", user_input=message
+        )
+        return self.query_router.route_query(
+            prompt=prompt,
+            response_mime_type=mime_type,
+            response_schema=schema,
+            user_input=message,
+        )
+
+    def retrieve(
+        self, message: str, filters: dict[str, Any] | None = None
+    ) -> tuple[list[SearchHit], CutoffDecision | None]:
+        """
+        Retrieve the documents passed to the responder, with their text.
+
+        Without a cutoff policy the top 5 hits are used; with one, up to its
+        `max_k` hits above its score thresholds, within its token cap. With a
+        rerank stage, more candidates are over-fetched and reranked down to
+        the stage's top-K. Text is only fetched for hits that are scored or
+        kept: if the stage skips reranking, for its top-K alone.
+
+        Returns:
+            The hits and, with a cutoff policy, where the list was cut.
+        """
+        started = time.perf_counter()
+        top_k = self.cutoff.config.max_k if self.cutoff else 5
+        if self.rerank_stage:
+            top_k = self.rerank_stage.candidates
+        hits = self.retriever.search(
+            message,
+            top_k=top_k,
+            filters=filters,
+            with_text=False,
+            score_threshold=self.cutoff.config.min_score if self.cutoff else None,
+        )
+
+        decision = None
+        if self.cutoff:
+            hits, decision = self.cutoff.by_score(hits, limit=top_k)
+        if self.rerank_stage:
+            with stage("rerank"):
+                hits = self.rerank_stage.rerank(
+                    message, hits, started=started, fetch_text=self.fetch_text
+                )
+        else:
+            hits = self.fetch_text(hits)
+        if self.cutoff and decision:
+            hits = self.cutoff.by_tokens(hits, decision)
+        return hits, decision
+
+    def fetch_text(self, hits: list[SearchHit]) -> list[SearchHit]:
+        """Fill in the text of retrieved hits, timed as its own stage."""
+        with stage("fetch_text"):
+            return self.retriever.fetch_text(hits)
+
+    async def handle_rag_pipeline(
+        self, message: str, filters: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """
+        Handle queries through the RAG pipeline.
 
         Args:
-            _: Unused message parameter
+            message: Message to answer
+            filters: Payload filters restricting the retrieved documents
 
         Returns:
-            dict[str, str]: Response containing attestation request
+            dict[str, Any]: Response containing the classification and answer,
+                and with a cutoff policy, the retrieval cut as metadata
         """
         # Step 1. Classify the user query.
-        prompt, mime_type, schema = self.prompts.get_formatted_prompt("rag_router")
-        classification = self.query_router.route_query(
-            prompt=prompt, response_mime_type=mime_type, response_schema=schema
-        )
+        with stage("rag_classification"):
+            classification = self.classify_rag_query(message)
         self.logger.info("Query classified", classification=classification)
 
         if classification == "ANSWER":
             # Step 2. Retrieve relevant documents.
-            retrieved_docs = self.retriever.semantic_search(_, top_k=5)
-            self.logger.info("Documents retrieved")
+            with stage("retrieval"):
+                hits, cut = self.retrieve(message, filters)
+            retrieved_docs = [hit.to_dict() for hit in hits]
+            self.logger.info("Documents retrieved", count=len(retrieved_docs))
 
             # Step 3. Generate the final answer.
-            answer = self.responder.generate_response(_, retrieved_docs)
+            with stage("generation"):
+                answer = self.responder.generate_response(message, retrieved_docs)
             self.logger.info("Response generated", answer=answer)
-            return {"classification": classification, "response": answer}
+            response: dict[str, Any] = {
+                "classification": classification,
+                "response": answer,
+            }
+            if cut:
+                response["metadata"] = {"retrieval": cut.to_dict()}
+            return response
 
         # Map static responses for CLARIFY and REJECT.
         static_responses = {
@@ -189,6 +444,24 @@ class ChatRouter:
         self.logger.exception("RAG Routing failed")
         raise ValueError(classification)
 
+    def handle_attestation_token(self, message: str) -> dict[str, Any]:
+        """
+        Answer the message following an attestation request with a token.
+
+        Args:
+            message: Message to include as the token's nonce
+
+        Returns:
+            dict[str, Any]: Response containing the token or the failure
+        """
+        try:
+            with stage("attestation"):
+                resp = self.attestation.get_token([message])
+        except VtpmAttestationError as e:
+            resp = f"The attestation failed with  error:\n{e.args[0]}"
+        self.attestation.attestation_requested = False
+        return {"response": resp}
+
     async def handle_attestation(self, _: str) -> dict[str, str]:
         """
         Handle attestation requests.
@@ -200,7 +473,8 @@ class ChatRouter:
             dict[str, str]: Response containing attestation request
         """
         prompt = self.prompts.get_formatted_prompt("request_attestation")[0]
-        request_attestation_response = self.ai.generate(prompt=prompt)
+        with stage("attestation"):
+            request_attestation_response = self.ai.generate(prompt=prompt)
         self.attestation.attestation_requested = True
         return {"response": request_attestation_response.text}
 
@@ -214,5 +488,6 @@ class ChatRouter:
         Returns:
             dict[str, str]: Response from AI provider
         """
-        response = self.ai.send_message(message)
+        with stage("conversation"):
+            response = self.ai.send_message(message)
         return {"response": response.text}
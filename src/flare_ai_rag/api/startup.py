@@ -0,0 +1,84 @@
+"""
+Application Startup Tracking
+
+This module tracks the staged, background initialization of the API. Each
+blocking init step runs in a worker thread, records its status and duration,
+and the aggregated state backs the readiness endpoint.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class StartupTracker:
+    """
+    Records the progress of the application's startup stages.
+
+    Attributes:
+        stages (dict[str, dict[str, Any]]): Status and duration per stage
+        ready (bool): Whether every stage finished and traffic can be served
+        failed (bool): Whether startup was given up on
+        error (str | None): Error of the last stage that aborted a startup
+            attempt, if any
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, dict[str, Any]] = {}
+        self.ready = False
+        self.failed = False
+        self.error: str | None = None
+        self._started = time.perf_counter()
+
+    async def run[T](self, name: str, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a blocking init step in a worker thread and record its outcome.
+
+        Args:
+            name: Stage name reported by the readiness endpoint.
+            func: The blocking callable to run.
+            *args: Positional arguments passed to `func`.
+
+        Returns:
+            The return value of `func`.
+        """
+        self.stages[name] = {"status": "running"}
+        start = time.perf_counter()
+        try:
+            result = await asyncio.to_thread(func, *args)
+        except Exception as e:
+            self.stages[name] = {
+                "status": "failed",
+                "error": str(e),
+                "duration": time.perf_counter() - start,
+            }
+            self.error = f"{name}: {e}"
+            raise
+        self.stages[name] = {"status": "done", "duration": time.perf_counter() - start}
+        logger.info("startup_stage_done", stage=name, **self.stages[name])
+        return result
+
+    def mark_ready(self) -> None:
+        """Mark startup as complete."""
+        self.ready = True
+        logger.info("startup_complete", duration=time.perf_counter() - self._started)
+
+    def mark_failed(self) -> None:
+        """Mark startup as given up on."""
+        self.failed = True
+        logger.error("startup_failed", error=self.error)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the readiness state and per-stage details."""
+        if self.ready:
+            status = "ready"
+        elif self.failed:
+            status = "failed"
+        else:
+            status = "starting"
+        return {"status": status, "error": self.error, "stages": self.stages}
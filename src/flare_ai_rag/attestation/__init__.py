@@ -1,14 +1,16 @@
-from .vtpm_attestation import (
-    Vtpm,
-    VtpmAttestationError,
-)
-from .vtpm_validation import (
-    CertificateParsingError,
-    InvalidCertificateChainError,
-    SignatureValidationError,
-    VtpmValidation,
-    VtpmValidationError,
-)
+from typing import TYPE_CHECKING
+
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .vtpm_attestation import Vtpm, VtpmAttestationError
+    from .vtpm_validation import (
+        CertificateParsingError,
+        InvalidCertificateChainError,
+        SignatureValidationError,
+        VtpmValidation,
+        VtpmValidationError,
+    )
 
 __all__ = [
     "CertificateParsingError",
@@ -19,3 +21,16 @@ __all__ = [
     "VtpmValidation",
     "VtpmValidationError",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "Vtpm": ".vtpm_attestation",
+        "VtpmAttestationError": ".vtpm_attestation",
+        "CertificateParsingError": ".vtpm_validation",
+        "InvalidCertificateChainError": ".vtpm_validation",
+        "SignatureValidationError": ".vtpm_validation",
+        "VtpmValidation": ".vtpm_validation",
+        "VtpmValidationError": ".vtpm_validation",
+    },
+)
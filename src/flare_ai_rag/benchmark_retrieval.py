@@ -0,0 +1,96 @@
+"""
+Retrieval benchmark runner.
+
+Runs the labeled query set against the retriever configured in
+`input_parameters.json` (the indexed Qdrant collection, or the routed
+collections if configured) and writes a JSON report. With `--baseline`, exits
+non-zero if quality or latency regressed. Run with
+`uv run benchmark-retrieval [--queries PATH] [--baseline REPORT]`.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import structlog
+
+from flare_ai_rag.evaluation import (
+    BenchmarkReport,
+    RetrievalBenchmark,
+    build_query_set,
+    load_query_set,
+    save_query_set,
+)
+from flare_ai_rag.main import setup_collections, setup_qdrant, setup_retriever
+from flare_ai_rag.retriever import open_document_source
+from flare_ai_rag.settings import settings
+from flare_ai_rag.utils import load_json
+
+logger = structlog.get_logger(__name__)
+
+
+def start() -> None:
+    """Run the retrieval benchmark and write its report."""
+    input_config = load_json(settings.input_path / "input_parameters.json")
+    parser = argparse.ArgumentParser(
+        description=(__doc__ or "").strip().partition("\n")[0]
+    )
+    parser.add_argument(
+        "--queries",
+        type=Path,
+        default=settings.data_path / "benchmark_queries.jsonl",
+        help="labeled query set (JSON lines), built from the documents if missing",
+    )
+    parser.add_argument(
+        "--documents",
+        type=Path,
+        default=settings.data_path / input_config.get("documents", "docs.csv"),
+        help="documents to build the query set from",
+    )
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=settings.data_path
+        / "benchmarks"
+        / f"retrieval-{int(time.time())}.json",
+        help="report file",
+    )
+    parser.add_argument("--baseline", type=Path, help="report to compare against")
+    args = parser.parse_args()
+
+    if args.queries.exists():
+        queries = load_query_set(args.queries)
+    else:
+        queries = build_query_set(open_document_source(args.documents))
+        save_query_set(queries, args.queries)
+        logger.info("Built query set.", path=str(args.queries), queries=len(queries))
+
+    qdrant_client = setup_qdrant(input_config)
+    retriever = setup_retriever(qdrant_client, input_config)
+    retriever = setup_collections(retriever, input_config) or retriever
+
+    report = RetrievalBenchmark(
+        retriever, queries, k_values=args.k, concurrency=args.concurrency
+    ).run(
+        config={
+            "queries_path": str(args.queries),
+            "retriever_config": input_config["retriever_config"],
+            "collections": input_config.get("collections"),
+        }
+    )
+    report.save(args.output)
+    logger.info("Benchmark report written.", path=str(args.output))
+
+    if args.baseline is not None:
+        regressions = report.compare(BenchmarkReport.load(args.baseline))
+        for regression in regressions:
+            logger.warning("Retrieval regression.", regression=regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    start()
@@ -2,12 +2,11 @@ import asyncio
 import contextlib
 import threading
 
-import google.generativeai as genai
 import structlog
 from anyio import Event
 from google.api_core.exceptions import InvalidArgument, NotFound
 
-from flare_ai_rag.ai import BaseAIProvider, GeminiProvider
+from flare_ai_rag.ai import BaseAIProvider, GeminiProvider, gemini_registry
 from flare_ai_rag.prompts import FEW_SHOT_PROMPT
 from flare_ai_rag.settings import settings
 from flare_ai_rag.telegram.service import TelegramBot
@@ -33,12 +32,16 @@ class BotManager:
 
     def initialize_ai_provider(self) -> None:
         """Initialize the AI provider with either tuned model or default model."""
-        genai.configure(api_key=settings.gemini_api_key)
         tuned_model_id = settings.tuned_model_name
+        if not tuned_model_id:
+            # No tuned model configured: skip the model listing network call.
+            self._initialize_default_model()
+            return
 
+        gemini_registry.configure(settings.gemini_api_key)
         try:
             # Check available tuned models
-            tuned_models = [m.name for m in genai.list_tuned_models()]
+            tuned_models = gemini_registry.list_tuned_models()
             logger.info("Available tuned models", tuned_models=tuned_models)
 
             # Try to get tuned model if it exists
@@ -0,0 +1,71 @@
+"""
+Offline index snapshot builder.
+
+Embeds the RAG documents once (e.g. while building the container image) and
+writes a snapshot that the API restores at startup instead of calling the
+embedding API. Run with `uv run build-index [--documents PATH] [--output DIR]`.
+"""
+
+import argparse
+from pathlib import Path
+
+import structlog
+
+from flare_ai_rag.ai import GeminiEmbedding
+from flare_ai_rag.retriever import (
+    IndexManifest,
+    RetrieverConfig,
+    build_snapshot,
+    open_document_source,
+)
+from flare_ai_rag.settings import settings
+from flare_ai_rag.utils import load_json
+
+logger = structlog.get_logger(__name__)
+
+
+def start() -> None:
+    """Build the index snapshot unless an up-to-date one already exists."""
+    input_config = load_json(settings.input_path / "input_parameters.json")
+    parser = argparse.ArgumentParser(
+        description=(__doc__ or "").strip().partition("\n")[0]
+    )
+    parser.add_argument(
+        "--documents",
+        type=Path,
+        default=settings.data_path / input_config.get("documents", "docs.csv"),
+        help="CSV, JSONL or Parquet file with the documents to index",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=settings.index_snapshot_path,
+        help="snapshot directory",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="rebuild even if the snapshot matches"
+    )
+    args = parser.parse_args()
+
+    retriever_config = RetrieverConfig.load(input_config["retriever_config"])
+    documents = open_document_source(args.documents)
+
+    manifest = IndexManifest.load(args.output)
+    if (
+        manifest is not None
+        and not args.force
+        and manifest.matches(documents, retriever_config)
+    ):
+        logger.info("Index snapshot is up to date.", path=str(args.output))
+        return
+
+    build_snapshot(
+        documents,
+        retriever_config,
+        GeminiEmbedding(settings.gemini_api_key),
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    start()
@@ -6,9 +6,10 @@ import os
 import hashlib
 
 import numpy as np
-import google.generativeai as genai
 from langchain.embeddings.base import Embeddings
 
+from flare_ai_rag.ai.registry import gemini_registry
+
 class GeminiEmbeddings(Embeddings):
     """Gemini embeddings wrapper for LangChain."""
     
@@ -18,8 +19,8 @@ class GeminiEmbeddings(Embeddings):
         if not api_key:
             raise ValueError("GEMINI_API_KEY must be provided")
             
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-pro')
+        gemini_registry.configure(api_key)
+        self.model = gemini_registry.get_model('gemini-pro')
         
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
         """Embed documents using Gemini."""
@@ -0,0 +1,42 @@
+from typing import TYPE_CHECKING
+
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .benchmark import BenchmarkReport, QueryResult, RetrievalBenchmark
+    from .metrics import ndcg_at_k, recall_at_k, reciprocal_rank
+    from .queries import (
+        LabeledQuery,
+        build_query_set,
+        load_query_set,
+        save_query_set,
+    )
+
+__all__ = [
+    "BenchmarkReport",
+    "LabeledQuery",
+    "QueryResult",
+    "RetrievalBenchmark",
+    "build_query_set",
+    "load_query_set",
+    "ndcg_at_k",
+    "recall_at_k",
+    "reciprocal_rank",
+    "save_query_set",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "BenchmarkReport": ".benchmark",
+        "QueryResult": ".benchmark",
+        "RetrievalBenchmark": ".benchmark",
+        "ndcg_at_k": ".metrics",
+        "recall_at_k": ".metrics",
+        "reciprocal_rank": ".metrics",
+        "LabeledQuery": ".queries",
+        "build_query_set": ".queries",
+        "load_query_set": ".queries",
+        "save_query_set": ".queries",
+    },
+)
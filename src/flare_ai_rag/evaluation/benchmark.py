@@ -0,0 +1,236 @@
+"""
+Retrieval Benchmark
+
+This module runs a labeled query set against any `BaseRetriever` and reports:
+
+- quality: mean recall@k and nDCG@k for each k, and MRR
+- latency: p50/p95/p99 of sequential searches
+- throughput: queries per second and latency percentiles with `concurrency`
+  searches in flight
+
+Reports are saved as JSON (with per-query results) and compared against a
+baseline report to catch regressions before a retrieval change ships.
+"""
+
+import json
+import statistics
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from flare_ai_rag.ai.batch import percentile
+from flare_ai_rag.evaluation.metrics import ndcg_at_k, recall_at_k, reciprocal_rank
+from flare_ai_rag.evaluation.queries import LabeledQuery
+from flare_ai_rag.retriever.base import BaseRetriever
+
+logger = structlog.get_logger(__name__)
+
+
+def result_documents(result: dict) -> frozenset[str]:
+    """Documents a search result stands for: its merged sources or its file."""
+    metadata = result.get("metadata", {})
+    sources = metadata.get("sources")
+    if sources:
+        return frozenset(sources)
+    file_name = metadata.get("filename") or metadata.get("file_name")
+    return frozenset([file_name]) if file_name else frozenset()
+
+
+def latency_summary(latencies: Sequence[float]) -> dict[str, float]:
+    """Latency percentiles and mean, in milliseconds."""
+    samples = list(latencies)
+    summary = {
+        f"p{q}_ms": round(percentile(samples, q) * 1000, 2) for q in (50, 95, 99)
+    }
+    summary["mean_ms"] = round(statistics.fmean(samples) * 1000 if samples else 0.0, 2)
+    return summary
+
+
+@dataclass
+class QueryResult:
+    """Retrieved documents, scores and latency of one benchmark query."""
+
+    query: str
+    latency_ms: float
+    retrieved: list[list[str]]
+    metrics: dict[str, float]
+    error: str | None = None
+
+
+@dataclass
+class BenchmarkReport:
+    """
+    Aggregate results of a benchmark run.
+
+    Attributes:
+        retriever (str): Name of the benchmarked retriever
+        queries (int): Number of queries run
+        metrics (dict): Mean quality metrics ("recall@5", "ndcg@5", "mrr")
+        latency (dict): Sequential search latency percentiles
+        throughput (dict): Queries per second and latency percentiles under
+            concurrency
+        errors (int): Searches that raised (scored as empty rankings)
+        config (dict): Settings the run was made with
+        results (list): Per-query results
+    """
+
+    retriever: str
+    queries: int
+    metrics: dict[str, float]
+    latency: dict[str, float]
+    throughput: dict[str, float]
+    errors: int = 0
+    config: dict[str, Any] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    results: list[QueryResult] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def save(self, path: Path) -> None:
+        """Write the report as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+
+    @staticmethod
+    def load(path: Path) -> "BenchmarkReport":
+        """Read a report written by `save`."""
+        report = json.loads(path.read_text())
+        report["results"] = [QueryResult(**r) for r in report.get("results", [])]
+        return BenchmarkReport(**report)
+
+    def compare(
+        self,
+        baseline: "BenchmarkReport",
+        metric_tolerance: float = 0.01,
+        latency_tolerance: float = 0.2,
+    ) -> list[str]:
+        """
+        List the regressions of this report against a baseline.
+
+        :param baseline: Report of the reference run.
+        :param metric_tolerance: Allowed absolute drop of a quality metric.
+        :param latency_tolerance: Allowed relative increase of p95 latency.
+        :return: One description per regressed metric; empty if none.
+        """
+        regressions = [
+            f"{name}: {baseline.metrics[name]:.4f} -> {value:.4f}"
+            for name, value in self.metrics.items()
+            if name in baseline.metrics
+            and value < baseline.metrics[name] - metric_tolerance
+        ]
+        for name, current, reference in (
+            ("latency p95", self.latency, baseline.latency),
+            ("throughput p95", self.throughput, baseline.throughput),
+        ):
+            before, after = reference.get("p95_ms"), current.get("p95_ms")
+            if before and after and after > before * (1 + latency_tolerance):
+                regressions.append(f"{name}: {before:.2f}ms -> {after:.2f}ms")
+        return regressions
+
+
+class RetrievalBenchmark:
+    """
+    Runs labeled queries against a retriever.
+
+    Attributes:
+        retriever (BaseRetriever): Retriever under test
+        queries (list[LabeledQuery]): Labeled query set
+        k_values (tuple[int, ...]): Cutoffs of recall@k and nDCG@k; the
+            largest is the `top_k` of every search
+        concurrency (int): Searches in flight during the throughput pass
+        warmup (int): Untimed searches run first (connections, JIT caches)
+    """
+
+    def __init__(
+        self,
+        retriever: BaseRetriever,
+        queries: Sequence[LabeledQuery],
+        k_values: Sequence[int] = (1, 3, 5, 10),
+        concurrency: int = 8,
+        warmup: int = 3,
+    ) -> None:
+        self.retriever = retriever
+        self.queries = list(queries)
+        self.k_values = tuple(sorted(k_values))
+        self.concurrency = concurrency
+        self.warmup = warmup
+
+    def _search(self, query: str) -> tuple[list[dict], float, str | None]:
+        start = time.perf_counter()
+        try:
+            results = self.retriever.semantic_search(query, top_k=self.k_values[-1])
+        except Exception as e:  # noqa: BLE001
+            logger.warning("benchmark_query_failed", query=query, error=str(e))
+            return [], time.perf_counter() - start, repr(e)
+        return results, time.perf_counter() - start, None
+
+    def _score(self, labeled: LabeledQuery, results: list[dict]) -> dict[str, float]:
+        ranking = [result_documents(result) for result in results]
+        metrics = {"mrr": reciprocal_rank(ranking, labeled.relevant)}
+        for k in self.k_values:
+            metrics[f"recall@{k}"] = recall_at_k(ranking, labeled.relevant, k)
+            metrics[f"ndcg@{k}"] = ndcg_at_k(ranking, labeled.relevant, k)
+        return metrics
+
+    def run(self, config: dict[str, Any] | None = None) -> BenchmarkReport:
+        """
+        Run the sequential (quality and latency) and concurrent passes.
+
+        :param config: Settings recorded in the report for comparisons.
+        """
+        for labeled in self.queries[: self.warmup]:
+            self._search(labeled.query)
+
+        results: list[QueryResult] = []
+        for labeled in self.queries:
+            hits, latency, error = self._search(labeled.query)
+            results.append(
+                QueryResult(
+                    query=labeled.query,
+                    latency_ms=round(latency * 1000, 2),
+                    retrieved=[sorted(result_documents(hit)) for hit in hits],
+                    metrics=self._score(labeled, hits),
+                    error=error,
+                )
+            )
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            concurrent = list(
+                executor.map(self._search, (q.query for q in self.queries))
+            )
+        wall_time = time.perf_counter() - start
+
+        names = results[0].metrics if results else {}
+        report = BenchmarkReport(
+            retriever=type(self.retriever).__name__,
+            queries=len(results),
+            metrics={
+                name: round(statistics.fmean(r.metrics[name] for r in results), 4)
+                for name in names
+            },
+            latency=latency_summary([r.latency_ms / 1000 for r in results]),
+            throughput={
+                "concurrency": self.concurrency,
+                "qps": round(len(concurrent) / wall_time, 2) if wall_time else 0.0,
+                **latency_summary([latency for _, latency, _ in concurrent]),
+            },
+            errors=sum(r.error is not None for r in results),
+            config=config or {},
+            results=results,
+        )
+        logger.info(
+            "Retrieval benchmark finished.",
+            retriever=report.retriever,
+            queries=report.queries,
+            **report.metrics,
+            p95_ms=report.latency["p95_ms"],
+            qps=report.throughput["qps"],
+        )
+        return report
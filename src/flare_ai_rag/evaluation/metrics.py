@@ -0,0 +1,57 @@
+"""
+Retrieval Metrics
+
+Ranking metrics of a single query. A ranking is the list of retrieved hits,
+each given as the set of documents it stands for (a point that absorbed
+near-duplicates at ingestion stands for all of its sources). Relevance is
+graded: `relevant` maps a document to its gain (1.0 for a plain label).
+"""
+
+import math
+from collections.abc import Mapping, Sequence
+from collections.abc import Set as AbstractSet
+
+
+def recall_at_k(
+    ranking: Sequence[AbstractSet[str]], relevant: Mapping[str, float], k: int
+) -> float:
+    """Fraction of the relevant documents retrieved in the top `k` hits."""
+    if not relevant:
+        return 0.0
+    found = set().union(*ranking[:k]) & relevant.keys()
+    return len(found) / len(relevant)
+
+
+def reciprocal_rank(
+    ranking: Sequence[AbstractSet[str]], relevant: Mapping[str, float]
+) -> float:
+    """Inverse rank of the first relevant hit (0.0 if there is none)."""
+    for rank, documents in enumerate(ranking, start=1):
+        if documents & relevant.keys():
+            return 1.0 / rank
+    return 0.0
+
+
+def ndcg_at_k(
+    ranking: Sequence[AbstractSet[str]], relevant: Mapping[str, float], k: int
+) -> float:
+    """
+    Normalized discounted cumulative gain of the top `k` hits.
+
+    A hit gains the highest grade among the relevant documents it stands for
+    that no earlier hit already retrieved, so repeated documents add nothing.
+    """
+    credited: set[str] = set()
+    dcg = 0.0
+    for position, documents in enumerate(ranking[:k]):
+        new = (documents & relevant.keys()) - credited
+        if new:
+            dcg += (2 ** max(relevant[doc] for doc in new) - 1) / math.log2(
+                position + 2
+            )
+            credited |= new
+    ideal = sorted(relevant.values(), reverse=True)[:k]
+    idcg = sum(
+        (2**grade - 1) / math.log2(position + 2) for position, grade in enumerate(ideal)
+    )
+    return dcg / idcg if idcg else 0.0
@@ -0,0 +1,72 @@
+"""
+Labeled Queries
+
+This module defines the query set retrieval is benchmarked on. Queries are
+stored as JSON lines, `{"query": ..., "relevant": {file_name: grade}}`, so a
+set can be curated by hand. `build_query_set` derives a starting set from the
+documents themselves: each document's frontmatter description (or a
+descriptive title) becomes a query that the document answers.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from flare_ai_rag.retriever.documents import DocumentSource
+from flare_ai_rag.retriever.metadata import parse_metadata
+
+# Titles with fewer words (e.g. "Introduction") are too vague to be queries.
+MIN_TITLE_WORDS = 3
+
+
+@dataclass(frozen=True)
+class LabeledQuery:
+    """A query and the graded relevance of the documents answering it."""
+
+    query: str
+    relevant: dict[str, float]
+
+    @staticmethod
+    def load(labeled_query: dict) -> "LabeledQuery":
+        """Loads a labeled query from a JSON line."""
+        relevant = labeled_query["relevant"]
+        if isinstance(relevant, list):
+            relevant = dict.fromkeys(relevant, 1.0)
+        return LabeledQuery(
+            query=labeled_query["query"],
+            relevant={str(doc): float(grade) for doc, grade in relevant.items()},
+        )
+
+
+def build_query_set(documents: DocumentSource) -> list[LabeledQuery]:
+    """
+    Derive labeled queries from the documents' frontmatter.
+
+    Documents sharing a description are all relevant to its query.
+    """
+    relevant: dict[str, dict[str, float]] = {}
+    for doc in documents:
+        if not doc.content:
+            continue
+        metadata = parse_metadata(doc.meta_data)
+        query = metadata.description
+        if not query and len((metadata.title or "").split()) >= MIN_TITLE_WORDS:
+            query = metadata.title
+        if query:
+            relevant.setdefault(query, {})[doc.file_name] = 1.0
+    return [LabeledQuery(query, docs) for query, docs in relevant.items()]
+
+
+def load_query_set(path: Path) -> list[LabeledQuery]:
+    """Read a query set written by `save_query_set` (or by hand)."""
+    with path.open(encoding="utf-8") as f:
+        return [LabeledQuery.load(json.loads(line)) for line in f if line.strip()]
+
+
+def save_query_set(queries: list[LabeledQuery], path: Path) -> None:
+    """Write a query set as JSON lines."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        for labeled in queries:
+            record = {"query": labeled.query, "relevant": labeled.relevant}
+            f.write(json.dumps(record) + "\n")
@@ -2,6 +2,7 @@
 Enhanced data ingestion pipeline for Flare AI RAG system.
 Supports multiple data sources and implements sophisticated preprocessing.
 """
+
 from typing import Any
 from pathlib import Path
 import json
@@ -19,30 +20,46 @@ from langchain.document_loaders import (
     UnstructuredMarkdownLoader,
 )
 from flare_ai_rag.embeddings.gemini_embeddings import GeminiEmbeddings
+from flare_ai_rag.retriever.diversity import (
+    DedupReport,
+    NearDuplicateDetector,
+    simhash,
+)
 
 logger = logging.getLogger(__name__)
 
+
 @dataclass
 class DataSource:
     """Configuration for a data source"""
+
     source_type: str  # git, csv, markdown, text
     path: str
     metadata: dict[str, Any]
     last_updated: datetime
     verification_score: float = 1.0  # Source reliability score (0-1)
 
+
 class DataIngestionPipeline:
     def __init__(
         self,
         qdrant_client: QdrantClient,
         collection_name: str = "flare_knowledge_base",
         embedding_model: Any | None = None,
+        near_duplicate_distance: int = 3,
     ):
         self.client = qdrant_client
         self.collection_name = collection_name
         self.embedding_model = embedding_model or GeminiEmbeddings()
         self._ensure_collection()
-        
+
+        # Near-duplicate chunks across all ingested sources collapse into
+        # one point that lists every source it was found in.
+        self.dedup_index = NearDuplicateDetector(near_duplicate_distance)
+        self.dedup_report = DedupReport()
+        self._sources: dict[int, list[str]] = {}
+        self._next_id = 0
+
         # Configure text splitter for optimal chunk sizes
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=500,
@@ -55,7 +72,7 @@ class DataIngestionPipeline:
         """Ensure Qdrant collection exists with proper configuration"""
         collections = self.client.get_collections().collections
         exists = any(c.name == self.collection_name for c in collections)
-        
+
         if not exists:
             self.client.create_collection(
                 collection_name=self.collection_name,
@@ -68,31 +85,31 @@ class DataIngestionPipeline:
     def load_source(self, source: DataSource) -> list[dict[str, Any]]:
         """Load and preprocess documents from a data source"""
         documents = []
-        
+
         try:
             if source.source_type == "git":
                 loader = GitLoader(
                     clone_url=source.path,
                     branch="main",
                     file_filter=lambda file_path: any(
-                        file_path.endswith(ext) 
+                        file_path.endswith(ext)
                         for ext in [".md", ".py", ".js", ".ts", ".txt"]
                     ),
                 )
                 documents = loader.load()
-                
+
             elif source.source_type == "csv":
                 loader = CSVLoader(file_path=source.path)
                 documents = loader.load()
-                
+
             elif source.source_type == "markdown":
                 loader = UnstructuredMarkdownLoader(file_path=source.path)
                 documents = loader.load()
-                
+
             elif source.source_type == "text":
                 loader = TextLoader(file_path=source.path)
                 documents = loader.load()
-                
+
             else:
                 raise ValueError(f"Unsupported source type: {source.source_type}")
 
@@ -101,54 +118,96 @@ class DataIngestionPipeline:
             for doc in documents:
                 doc_chunks = self.text_splitter.split_text(doc.page_content)
                 for chunk in doc_chunks:
-                    chunks.append({
-                        "content": chunk,
-                        "metadata": {
-                            **doc.metadata,
-                            "source_type": source.source_type,
-                            "source_path": source.path,
-                            "verification_score": source.verification_score,
-                            "last_updated": source.last_updated.isoformat(),
-                            "chunk_size": len(chunk),
+                    chunks.append(
+                        {
+                            "content": chunk,
+                            "metadata": {
+                                **doc.metadata,
+                                "source_type": source.source_type,
+                                "source_path": source.path,
+                                "verification_score": source.verification_score,
+                                "last_updated": source.last_updated.isoformat(),
+                                "chunk_size": len(chunk),
+                            },
                         }
-                    })
-            
+                    )
+
             return chunks
 
         except Exception as e:
             logger.error(f"Error loading source {source.path}: {str(e)}")
             return []
 
-    def process_and_index(self, chunks: list[dict[str, Any]]):
-        """Process chunks and index them in Qdrant"""
+    def process_and_index(self, chunks: list[dict[str, Any]]) -> DedupReport:
+        """Process chunks and index them in Qdrant, merging near-duplicates"""
+        report = DedupReport()
         try:
+            # Collapse near-duplicates of this run's and earlier runs' chunks
+            unique_chunks = []
+            for chunk in chunks:
+                report.documents += 1
+                fingerprint = simhash(chunk["content"])
+                metadata = chunk["metadata"]
+                reference = metadata.get("source", metadata["source_path"])
+                point_id = self.dedup_index.find(fingerprint)
+                if point_id is not None:
+                    report.merge(point_id, self._sources[point_id][0], reference)
+                    self._sources[point_id].append(reference)
+                    continue
+                point_id = self._next_id
+                self._next_id += 1
+                self.dedup_index.add(fingerprint, point_id)
+                self._sources[point_id] = [reference]
+                unique_chunks.append((point_id, fingerprint, chunk))
+
             # Generate embeddings
-            texts = [chunk["content"] for chunk in chunks]
-            embeddings = self.embedding_model.embed_documents(texts)
-            
+            texts = [chunk["content"] for _, _, chunk in unique_chunks]
+            embeddings = self.embedding_model.embed_documents(texts) if texts else []
+
             # Prepare points for Qdrant
             points = []
-            for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-                points.append({
-                    "id": i,
-                    "vector": embedding,
-                    "payload": {
-                        "content": chunk["content"],
-                        **chunk["metadata"]
+            for (point_id, fingerprint, chunk), embedding in zip(
+                unique_chunks, embeddings, strict=True
+            ):
+                points.append(
+                    {
+                        "id": point_id,
+                        "vector": embedding,
+                        "payload": {
+                            "content": chunk["content"],
+                            **chunk["metadata"],
+                            "simhash": fingerprint,
+                            "sources": self._sources[point_id],
+                        },
                     }
-                })
-            
+                )
+
             # Upload to Qdrant
-            self.client.upsert(
-                collection_name=self.collection_name,
-                points=points
+            if points:
+                self.client.upsert(collection_name=self.collection_name, points=points)
+
+            # Add the new references to points indexed by earlier runs
+            indexed = {point["id"] for point in points}
+            for point_id in report.merged.keys() - indexed:
+                self.client.set_payload(
+                    collection_name=self.collection_name,
+                    payload={"sources": self._sources[point_id]},
+                    points=[point_id],
+                )
+
+            logger.info(
+                f"Successfully indexed {len(points)} chunks, merged "
+                f"{report.duplicates} near-duplicates "
+                f"(dedup ratio {report.ratio:.2%})"
             )
-            
-            logger.info(f"Successfully indexed {len(points)} chunks")
-            
+
         except Exception as e:
             logger.error(f"Error indexing chunks: {str(e)}")
 
+        self.dedup_report.documents += report.documents
+        self.dedup_report.duplicates += report.duplicates
+        return report
+
     def ingest_source(self, source: DataSource):
         """Main method to ingest a data source"""
         chunks = self.load_source(source)
@@ -165,6 +224,7 @@ class DataIngestionPipeline:
                 "total_points": collection_info.points_count,
                 "vectors_size": collection_info.vectors_size,
                 "status": collection_info.status,
+                "dedup": self.dedup_report.summary(),
             }
         except Exception as e:
             logger.error(f"Error getting collection stats: {str(e)}")
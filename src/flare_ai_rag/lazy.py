@@ -0,0 +1,45 @@
+"""
+Lazy Package Exports
+
+Package `__init__` modules re-export their public names through
+`lazy_exports` instead of importing every submodule eagerly. A submodule is
+imported the first time one of its names is accessed (PEP 562), so importing
+`flare_ai_rag` or one of its subpackages does not pull in heavy dependencies
+(Gemini SDK, Qdrant client, pandas, bot and attestation stacks) the process
+never uses.
+"""
+
+import importlib
+from collections.abc import Callable
+from typing import Any
+
+
+def lazy_exports(
+    package: str, exports: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Build the module-level `__getattr__` and `__dir__` of a package.
+
+    Args:
+        package: The package's `__name__`.
+        exports: Maps each exported name to the (relative) module defining it.
+
+    Returns:
+        The `(__getattr__, __dir__)` pair to assign in the package namespace.
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:  # noqa: N807
+        module_name = exports.get(name)
+        if module_name is None:
+            msg = f"module {package!r} has no attribute {name!r}"
+            raise AttributeError(msg)
+        value = getattr(importlib.import_module(module_name, package), name)
+        # Cache the resolved object so later lookups bypass __getattr__.
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:  # noqa: N807
+        return sorted({*namespace, *exports})
+
+    return __getattr__, __dir__
@@ -0,0 +1,152 @@
+"""
+Chat API load test.
+
+Boots the app with stub model providers (simulated latency and token rate),
+stub embeddings and an in-memory Qdrant, then drives the chat endpoint at a
+fixed request rate and reports latency histograms, error rates per route and
+event loop lag. Run with `uv run load-test [--rps N] [--duration S]`.
+"""
+
+import argparse
+import asyncio
+import copy
+from functools import partial
+from pathlib import Path
+
+import structlog
+
+from flare_ai_rag.ai import BaseAIProvider
+from flare_ai_rag.evaluation import load_query_set
+from flare_ai_rag.loadtest import ChatLoadTest, StubEmbedding, StubProvider
+from flare_ai_rag.main import ServiceClients, create_app
+from flare_ai_rag.settings import settings
+from flare_ai_rag.utils import load_json
+
+logger = structlog.get_logger(__name__)
+
+CONVERSATIONAL_MESSAGES = (
+    "Hi there!",
+    "Thanks, that was helpful.",
+    "How are you doing today?",
+    "Can you tell me a joke?",
+    "Good morning!",
+)
+
+
+def load_test_config(input_config: dict) -> dict:
+    """
+    Adapt the app configuration to run without external services.
+
+    The collection lives in an in-memory Qdrant, embedded with the stub
+    embedding (so no prebuilt snapshot matches), under names that do not
+    clash with the real index files in the data directory. The routing
+    decision cache stays in memory, and only the main collection is served.
+    """
+    config = copy.deepcopy(input_config)
+    retriever_config = config["retriever_config"]
+    retriever_config.update(
+        path=":memory:",
+        embedding_model="stub-hashing",
+        collection_name=f"loadtest_{retriever_config['collection_name']}",
+        parent_store="parents_loadtest.sqlite3",
+    )
+    config.pop("collections", None)
+    if config.get("router_cache"):
+        config["router_cache"] = {**config["router_cache"], "shared_path": None}
+    return config
+
+
+def stub_clients(args: argparse.Namespace, vector_size: int) -> ServiceClients:
+    """Stub providers and embeddings with the latencies given on the CLI."""
+
+    def provider(model_config: dict, **kwargs: str) -> BaseAIProvider:
+        return StubProvider(
+            model=model_config["id"],
+            latency=args.provider_latency,
+            tokens_per_second=args.tokens_per_second,
+            output_tokens=args.output_tokens,
+            conversational=CONVERSATIONAL_MESSAGES,
+            **kwargs,
+        )
+
+    return ServiceClients(
+        provider=provider,
+        embedding=partial(StubEmbedding, vector_size, args.embedding_latency),
+    )
+
+
+def start() -> None:
+    """Run the load test and log (and optionally write) its report."""
+    parser = argparse.ArgumentParser(
+        description=(__doc__ or "").strip().partition("\n")[0]
+    )
+    parser.add_argument("--rps", type=float, default=10.0, help="requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument(
+        "--conversational-ratio",
+        type=float,
+        default=0.2,
+        help="share of conversational (non-RAG) messages",
+    )
+    parser.add_argument(
+        "--provider-latency",
+        type=float,
+        default=0.3,
+        help="seconds to the first token of a stub model call",
+    )
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--output-tokens", type=int, default=150)
+    parser.add_argument(
+        "--embedding-latency",
+        type=float,
+        default=0.05,
+        help="seconds per stub embedding request",
+    )
+    parser.add_argument(
+        "--queries",
+        type=Path,
+        default=settings.data_path / "benchmark_queries.jsonl",
+        help="labeled query set whose queries are the RAG messages",
+    )
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    args = parser.parse_args()
+
+    input_config = load_test_config(
+        load_json(settings.input_path / "input_parameters.json")
+    )
+    # There is no TEE to attest in a load test.
+    settings.simulate_attestation = True
+    app = create_app(
+        input_config,
+        stub_clients(args, input_config["retriever_config"]["vector_size"]),
+        exit_on_failure=False,
+    )
+    load_test = ChatLoadTest(
+        app,
+        workload={
+            "rag": [labeled.query for labeled in load_query_set(args.queries)],
+            "conversational": CONVERSATIONAL_MESSAGES,
+        },
+        weights={
+            "rag": 1.0 - args.conversational_ratio,
+            "conversational": args.conversational_ratio,
+        },
+        rps=args.rps,
+        duration=args.duration,
+        timeout=args.timeout,
+        seed=args.seed,
+    )
+    report = asyncio.run(load_test.run())
+    report.config = {
+        name: str(value) if isinstance(value, Path) else value
+        for name, value in vars(args).items()
+    }
+    if args.output:
+        report.save(args.output)
+    logger.info("Load test report.", **report.to_dict())
+
+
+if __name__ == "__main__":
+    start()
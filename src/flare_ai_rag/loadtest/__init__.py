@@ -0,0 +1,26 @@
+from typing import TYPE_CHECKING
+
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .driver import ChatLoadTest, EventLoopLagMonitor, LoadReport
+    from .stubs import StubEmbedding, StubProvider
+
+__all__ = [
+    "ChatLoadTest",
+    "EventLoopLagMonitor",
+    "LoadReport",
+    "StubEmbedding",
+    "StubProvider",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "ChatLoadTest": ".driver",
+        "EventLoopLagMonitor": ".driver",
+        "LoadReport": ".driver",
+        "StubEmbedding": ".stubs",
+        "StubProvider": ".stubs",
+    },
+)
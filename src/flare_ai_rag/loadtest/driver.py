@@ -0,0 +1,244 @@
+"""
+Chat Load Test
+
+This module drives the chat endpoint of an app built by `create_app` at a
+fixed request rate, in process through the app's ASGI interface. Requests are
+sent open-loop (on schedule, whether or not earlier ones have finished), so a
+saturated app shows up as growing latency instead of a lower request rate.
+
+For each workload route (RAG or conversational messages) it reports request
+and error counts, response classifications and a latency histogram; for the
+whole run, the achieved rate and the event loop lag: how late the app's event
+loop wakes up a sleeping task, which grows when handlers block the loop.
+Latency is measured from the time a request was scheduled, so time spent
+waiting for a blocked loop to send it is included.
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Self
+
+import httpx
+import structlog
+from fastapi import FastAPI
+
+from flare_ai_rag.ai.batch import percentile
+
+logger = structlog.get_logger(__name__)
+
+CHAT_PATH = "/api/routes/chat/"
+# Upper bounds (milliseconds) of the latency histogram buckets.
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def latency_histogram(latencies: Sequence[float]) -> dict[str, Any]:
+    """Bucket counts and percentiles of latencies given in seconds."""
+    samples = [latency * 1000 for latency in latencies]
+    buckets: dict[str, int] = {f"le_{bound}ms": 0 for bound in LATENCY_BUCKETS_MS}
+    buckets["le_inf"] = 0
+    for sample in samples:
+        bound = next((b for b in LATENCY_BUCKETS_MS if sample <= b), None)
+        buckets[f"le_{bound}ms" if bound else "le_inf"] += 1
+    return {
+        "buckets": buckets,
+        **{f"p{q}_ms": round(percentile(samples, q), 2) for q in (50, 95, 99)},
+        "max_ms": round(max(samples, default=0.0), 2),
+    }
+
+
+class EventLoopLagMonitor:
+    """
+    Samples how late the running event loop resumes a sleeping task.
+
+    Use as an async context manager around the measured work.
+    """
+
+    def __init__(self, interval: float = 0.05) -> None:
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(loop.time() - start - self.interval, 0.0))
+
+    async def __aenter__(self) -> Self:
+        self._task = asyncio.create_task(self._sample())
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._task:
+            self._task.cancel()
+
+    def summary(self) -> dict[str, float]:
+        samples = [lag * 1000 for lag in self.samples]
+        return {
+            **{f"p{q}_ms": round(percentile(samples, q), 2) for q in (50, 95, 99)},
+            "max_ms": round(max(samples, default=0.0), 2),
+        }
+
+
+@dataclass
+class RouteStats:
+    """Outcomes of the requests of one workload route."""
+
+    requests: int = 0
+    errors: int = 0
+    status_codes: Counter[str] = field(default_factory=Counter)
+    classifications: Counter[str] = field(default_factory=Counter)
+    latencies: list[float] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.requests, 4)
+            if self.requests
+            else 0.0,
+            "status_codes": dict(self.status_codes),
+            "classifications": dict(self.classifications),
+            "latency": latency_histogram(self.latencies),
+        }
+
+
+@dataclass
+class LoadReport:
+    """Results of a load test run."""
+
+    target_rps: float
+    achieved_rps: float
+    duration: float
+    requests: int
+    errors: int
+    routes: dict[str, dict[str, Any]]
+    event_loop_lag: dict[str, float]
+    config: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def save(self, path: Path) -> None:
+        """Write the report as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+
+
+class ChatLoadTest:
+    """
+    Sends a mix of chat messages to an app at a fixed rate.
+
+    Attributes:
+        app (FastAPI): App built by `create_app`, started by the test
+        workload (dict[str, Sequence[str]]): Messages of each route
+        weights (dict[str, float]): Share of the requests of each route
+        rps (float): Requests started per second
+        duration (float): Seconds during which requests are started
+        timeout (float): Seconds before a request counts as failed
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        app: FastAPI,
+        workload: dict[str, Sequence[str]],
+        *,
+        weights: dict[str, float] | None = None,
+        rps: float = 10.0,
+        duration: float = 30.0,
+        timeout: float = 30.0,
+        seed: int = 0,
+    ) -> None:
+        self.app = app
+        self.workload = {route: list(messages) for route, messages in workload.items()}
+        self.weights = weights or dict.fromkeys(self.workload, 1.0)
+        self.rps = rps
+        self.duration = duration
+        self.timeout = timeout
+        self._random = random.Random(seed)  # noqa: S311
+        self.stats = {route: RouteStats() for route in self.workload}
+
+    async def _wait_ready(self, deadline: float) -> None:
+        tracker = self.app.state.startup
+        while not tracker.ready:
+            if tracker.failed or time.monotonic() > deadline:
+                msg = f"App did not start: {tracker.snapshot()}"
+                raise RuntimeError(msg)
+            await asyncio.sleep(0.1)
+
+    async def _request(
+        self, client: httpx.AsyncClient, route: str, scheduled: float
+    ) -> None:
+        stats = self.stats[route]
+        message = self._random.choice(self.workload[route])
+        stats.requests += 1
+        try:
+            # Transport timeouts do not apply to in-process ASGI requests.
+            async with asyncio.timeout(self.timeout):
+                response = await client.post(CHAT_PATH, json={"message": message})
+        except (TimeoutError, httpx.HTTPError) as e:
+            stats.errors += 1
+            stats.status_codes[type(e).__name__] += 1
+            return
+        finally:
+            stats.latencies.append(time.perf_counter() - scheduled)
+        stats.status_codes[str(response.status_code)] += 1
+        if response.status_code != HTTPStatus.OK:
+            stats.errors += 1
+            return
+        body = response.json() or {}
+        stats.classifications[body.get("classification", "NONE")] += 1
+
+    async def run(self, startup_timeout: float = 300.0) -> LoadReport:
+        """Start the app, run the load and return the report."""
+        routes = list(self.workload)
+        weights = [self.weights.get(route, 0.0) for route in routes]
+        total = int(self.rps * self.duration)
+
+        async with self.app.router.lifespan_context(self.app):
+            await self._wait_ready(time.monotonic() + startup_timeout)
+            logger.info("App ready, starting load.", rps=self.rps, requests=total)
+            transport = httpx.ASGITransport(app=self.app)
+            async with (
+                httpx.AsyncClient(transport=transport, base_url="http://app") as client,
+                EventLoopLagMonitor() as lag,
+            ):
+                start = time.perf_counter()
+                tasks = []
+                for idx in range(total):
+                    scheduled = start + idx / self.rps
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    route = self._random.choices(routes, weights)[0]
+                    tasks.append(
+                        asyncio.create_task(self._request(client, route, scheduled))
+                    )
+                await asyncio.gather(*tasks)
+                elapsed = time.perf_counter() - start
+
+        report = LoadReport(
+            target_rps=self.rps,
+            achieved_rps=round(total / elapsed, 2) if elapsed else 0.0,
+            duration=round(elapsed, 2),
+            requests=sum(stats.requests for stats in self.stats.values()),
+            errors=sum(stats.errors for stats in self.stats.values()),
+            routes={route: stats.to_dict() for route, stats in self.stats.items()},
+            event_loop_lag=lag.summary(),
+        )
+        logger.info(
+            "Load test finished.",
+            requests=report.requests,
+            errors=report.errors,
+            achieved_rps=report.achieved_rps,
+            loop_lag_p99_ms=report.event_loop_lag["p99_ms"],
+        )
+        return report
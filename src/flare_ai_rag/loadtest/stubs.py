@@ -0,0 +1,166 @@
+"""
+Stub Model Clients
+
+Local stand-ins for the Gemini provider and embedding client, so the chat API
+can be load-tested without calling (or paying for) a model API:
+
+- `StubProvider` sleeps like a remote model (a fixed time to first token plus
+  the output tokens at a configurable rate) and answers each structured
+  prompt of the pipeline with a valid value: a semantic route, ANSWER for the
+  RAG router, and one score per document for the LLM reranker. Its token
+  usage counts the words of the prompt and the simulated output tokens.
+- `StubEmbedding` embeds text by feature-hashing its words, so queries and
+  documents sharing terms still score as similar in Qdrant.
+"""
+
+import hashlib
+import re
+import time
+from collections.abc import Collection
+from typing import Any, override
+
+import numpy as np
+
+from flare_ai_rag.ai import BaseAIProvider, EmbeddingTaskType, GeminiEmbedding
+from flare_ai_rag.ai.base import ModelResponse
+from flare_ai_rag.ai.model import GenerationProfile
+from flare_ai_rag.prompts import RAGRouterClassification, SemanticRouterResponse
+
+_WORD = re.compile(r"\w+")
+_RERANK_DOCUMENT = re.compile(r"^\[(\d+)\] ", re.MULTILINE)
+
+
+class StubProvider(BaseAIProvider):
+    """
+    Provider answering instantly-valid responses after a simulated delay.
+
+    Attributes:
+        latency (float): Seconds before the first output token
+        tokens_per_second (float): Output token rate
+        output_tokens (int): Tokens of a free-text answer, capped by the
+            profile's `max_output_tokens`
+        conversational (Collection[str]): Messages routed as conversational;
+            every other message is routed to the RAG pipeline
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        api_key: str = "",
+        model: str = "stub",
+        *,
+        latency: float = 0.3,
+        tokens_per_second: float = 80.0,
+        output_tokens: int = 150,
+        conversational: Collection[str] = (),
+        system_instruction: str | None = None,
+    ) -> None:
+        self.api_key = api_key
+        self.model = model
+        self.chat_history: list[Any] = []
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.conversational = conversational
+        self.system_instruction = system_instruction
+        self.calls = 0
+
+    @override
+    def reset(self) -> None:
+        self.chat_history = []
+
+    @override
+    def reset_model(self, model: str, **kwargs: str) -> None:
+        self.model = model
+        self.system_instruction = kwargs.get("system_instruction")
+        self.reset()
+
+    def _respond(
+        self, prompt: str, tokens: int, text: str, parsed: Any = None
+    ) -> ModelResponse:
+        # Blocking, like the provider SDKs the pipeline calls.
+        time.sleep(self.latency + tokens / self.tokens_per_second)
+        self.calls += 1
+        prompt_tokens = len(_WORD.findall(prompt))
+        return ModelResponse(
+            text=text,
+            raw_response=None,
+            metadata={
+                "model": self.model,
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": tokens,
+                    "total_tokens": prompt_tokens + tokens,
+                },
+            },
+            parsed=parsed,
+        )
+
+    def _route(self, prompt: str) -> SemanticRouterResponse:
+        if any(message in prompt for message in self.conversational):
+            return SemanticRouterResponse.CONVERSATIONAL
+        return SemanticRouterResponse.RAG_ROUTER
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+        generation_profile: GenerationProfile | None = None,
+    ) -> ModelResponse:
+        if response_schema is SemanticRouterResponse:
+            route = self._route(prompt)
+            return self._respond(prompt, 1, route.value, route)
+        if response_schema is RAGRouterClassification:
+            answer = RAGRouterClassification.ANSWER
+            return self._respond(prompt, 1, answer.value, answer)
+        if response_schema == list[float]:
+            documents = len(_RERANK_DOCUMENT.findall(prompt))
+            scores = [1.0 - idx / (documents + 1) for idx in range(documents)]
+            return self._respond(prompt, documents, str(scores), scores)
+
+        tokens = self.output_tokens
+        if generation_profile and generation_profile.max_output_tokens:
+            tokens = min(tokens, generation_profile.max_output_tokens)
+        return self._respond(prompt, tokens, " ".join(["token"] * tokens))
+
+    @override
+    def send_message(self, msg: str) -> ModelResponse:
+        self.chat_history.append(msg)
+        return self._respond(
+            msg, self.output_tokens, " ".join(["token"] * self.output_tokens)
+        )
+
+
+class StubEmbedding(GeminiEmbedding):
+    """
+    Feature-hashing embedding of the words of a text.
+
+    Attributes:
+        vector_size (int): Embedding dimension
+        latency (float): Simulated seconds per query embedding request;
+            documents embedded at startup are embedded instantly
+    """
+
+    def __init__(self, vector_size: int = 768, latency: float = 0.0) -> None:
+        self.vector_size = vector_size
+        self.latency = latency
+
+    @override
+    def embed_content(
+        self,
+        embedding_model: str,
+        contents: str,
+        task_type: EmbeddingTaskType,
+        title: str | None = None,
+    ) -> list[float]:
+        if self.latency and task_type == EmbeddingTaskType.RETRIEVAL_QUERY:
+            time.sleep(self.latency)
+        vector = np.zeros(self.vector_size, dtype=np.float32)
+        for word in _WORD.findall(contents.casefold()):
+            digest = int.from_bytes(
+                hashlib.blake2b(word.encode(), digest_size=8).digest()
+            )
+            vector[digest % self.vector_size] += 1.0 if digest >> 63 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
@@ -6,28 +6,153 @@ It sets up CORS middleware, loads configuration and data, and wires together the
 Gemini-based Router, Retriever, and Responder components into a chat endpoint.
 """
 
-import pandas as pd
+import asyncio
+import hashlib
+import json
+import signal
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
 import structlog
 import uvicorn
-from fastapi import APIRouter, FastAPI
+from fastapi import APIRouter, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from qdrant_client import QdrantClient
 
-from flare_ai_rag.ai import GeminiEmbedding, GeminiProvider
+from flare_ai_rag.ai import (
+    BaseAIProvider,
+    GeminiEmbedding,
+    GeminiProvider,
+    OpenRouterProvider,
+    ProviderPool,
+)
 from flare_ai_rag.api import ChatRouter
+from flare_ai_rag.api.startup import StartupTracker
 from flare_ai_rag.attestation import Vtpm
-from flare_ai_rag.bot_manager import start_bot_manager
 from flare_ai_rag.prompts import PromptService
+from flare_ai_rag.reranker import (
+    CrossEncoderReranker,
+    LLMReranker,
+    RerankerConfig,
+    RerankStage,
+)
 from flare_ai_rag.responder import GeminiResponder, ResponderConfig
-from flare_ai_rag.retriever import QdrantRetriever, RetrieverConfig, generate_collection
-from flare_ai_rag.router import GeminiRouter, RouterConfig
+from flare_ai_rag.retriever import (
+    AdaptiveCutoff,
+    CollectionRoute,
+    CollectionRouter,
+    CutoffConfig,
+    DocumentSource,
+    IndexManifest,
+    MultiCollectionRetriever,
+    ParentStore,
+    QdrantRetriever,
+    RetrieverConfig,
+    SnapshotError,
+    create_qdrant_client,
+    generate_collection,
+    open_document_source,
+    restore_snapshot,
+)
+from flare_ai_rag.router import (
+    BaseQueryRouter,
+    CachedQueryRouter,
+    FastPathClassifier,
+    GeminiRouter,
+    RouterConfig,
+    RouterDecisionCache,
+)
+from flare_ai_rag.router.classifier import build_fast_path, load_labeled_queries
 from flare_ai_rag.settings import settings
-from flare_ai_rag.utils import load_json
+from flare_ai_rag.telemetry import (
+    InstrumentedProvider,
+    SharedLimitStore,
+    UsageAccountant,
+    UsageConfig,
+    enable_multiprocess,
+    render_metrics,
+)
+from flare_ai_rag.utils import file_lock, load_json
 
 logger = structlog.get_logger(__name__)
 
+# Initialization attempts before the process gives up and exits, and the
+# delay before each retry (multiplied by the number of failed attempts).
+STARTUP_ATTEMPTS = 3
+STARTUP_RETRY_SECONDS = 5.0
+CHAT_PREFIX = "/api/routes/chat"
+
+
+def _single_provider(model_config: dict, **kwargs: str) -> BaseAIProvider:
+    """Initialize the provider for a single model entry."""
+    if model_config.get("provider", "gemini") == "openrouter":
+        return OpenRouterProvider(
+            api_key=settings.open_router_api_key,
+            model=model_config["id"],
+            base_url=settings.open_router_base_url,
+            **kwargs,
+        )
+    return GeminiProvider(
+        api_key=settings.gemini_api_key, model=model_config["id"], **kwargs
+    )
+
+
+def _gemini_embedding() -> GeminiEmbedding:
+    return GeminiEmbedding(settings.gemini_api_key)
+
+
+@dataclass(frozen=True)
+class ServiceClients:
+    """
+    Factories of the clients calling external model APIs.
+
+    The app uses the Gemini/OpenRouter providers and the Gemini embedding
+    client by default; load tests substitute local stubs.
+    """
+
+    # Builds the provider of a single model entry (no fallbacks).
+    provider: Callable[..., BaseAIProvider] = _single_provider
+    embedding: Callable[[], GeminiEmbedding] = _gemini_embedding
+
+
+DEFAULT_CLIENTS = ServiceClients()
+
+
+def build_provider(
+    model_config: dict, clients: ServiceClients = DEFAULT_CLIENTS, **kwargs: str
+) -> BaseAIProvider:
+    """
+    Initialize the provider for a model config.
 
-def setup_router(input_config: dict) -> tuple[GeminiProvider, GeminiRouter]:
+    If the config lists `fallbacks`, the primary model and its fallbacks are
+    wrapped in a ProviderPool (with hedged requests if `hedge` is set). The
+    provider is instrumented to record the latency and token usage of its
+    calls in the pipeline metrics.
+    """
+    primary = clients.provider(model_config, **kwargs)
+    fallbacks = model_config.get("fallbacks", [])
+    if not fallbacks:
+        return InstrumentedProvider(primary)
+    entries = [model_config, *fallbacks]
+    return InstrumentedProvider(
+        ProviderPool(
+            [primary, *(clients.provider(entry, **kwargs) for entry in fallbacks)],
+            names=[entry["id"] for entry in entries],
+            hedge=model_config.get("hedge", False),
+        )
+    )
+
+
+def setup_router(
+    input_config: dict,
+    decision_cache: RouterDecisionCache | None = None,
+    clients: ServiceClients = DEFAULT_CLIENTS,
+) -> tuple[BaseAIProvider, BaseQueryRouter]:
     """Initialize a Gemini Provider for routing."""
     # Setup router config
     router_model_config = input_config["router_model"]
@@ -35,90 +160,561 @@ def setup_router(input_config: dict) -> tuple[GeminiProvider, GeminiRouter]:
 
     # Setup Gemini client based on Router config
     # Older version used a system_instruction
-    gemini_provider = GeminiProvider(
-        api_key=settings.gemini_api_key, model=router_config.model.model_id
-    )
+    gemini_provider = build_provider(router_model_config, clients)
     gemini_router = GeminiRouter(client=gemini_provider, config=router_config)
-    return gemini_provider, gemini_router
+    if decision_cache is None:
+        return gemini_provider, gemini_router
+    return gemini_provider, CachedQueryRouter(
+        gemini_router, decision_cache, model_id=router_config.model.model_id
+    )
+
+
+def setup_decision_cache(input_config: dict) -> RouterDecisionCache | None:
+    """Initialize the routing decision cache, if configured."""
+    cache_config = input_config.get("router_cache")
+    if not cache_config:
+        return None
+    return RouterDecisionCache(
+        max_size=cache_config.get("max_size", 1024),
+        ttl=cache_config.get("ttl_seconds", 3600.0),
+        shared_path=(
+            settings.data_path / cache_config["shared_path"]
+            if cache_config.get("shared_path")
+            else None
+        ),
+    )
+
+
+def setup_cutoff(input_config: dict) -> AdaptiveCutoff | None:
+    """Initialize the adaptive retrieval cutoff, if configured."""
+    cutoff_config = input_config.get("retrieval_cutoff")
+    if not cutoff_config:
+        return None
+    return AdaptiveCutoff(CutoffConfig.load(cutoff_config))
+
+
+def setup_usage(input_config: dict) -> UsageAccountant | None:
+    """
+    Initialize token usage and cost accounting, if configured.
+
+    Budgets and rate limits are checked against the spend in `usage.shared_path`
+    when set, so that they hold across API workers. Without it, each worker
+    would enforce them on its own share of the traffic, so several workers
+    with limits configured are refused.
+    """
+    usage_config = input_config.get("usage")
+    if not usage_config:
+        return None
+    config = UsageConfig.load(usage_config)
+    if usage_config.get("shared_path"):
+        return UsageAccountant(
+            config,
+            limits=SharedLimitStore(
+                settings.data_path / usage_config["shared_path"], config
+            ),
+        )
+    limited = any(
+        limit is not None
+        for limit in (
+            config.user_daily_tokens,
+            config.user_daily_cost,
+            config.daily_cost,
+            config.user_requests_per_minute,
+            config.user_tokens_per_minute,
+        )
+    )
+    if limited and settings.api_workers > 1:
+        msg = (
+            f"Usage limits cannot be enforced across {settings.api_workers} "
+            "API workers without usage.shared_path; set it or run one worker"
+        )
+        raise ValueError(msg)
+    return UsageAccountant(config)
+
+
+def setup_fast_path(
+    input_config: dict,
+) -> tuple[FastPathClassifier | None, FastPathClassifier | None]:
+    """
+    Train the local fast-path classifiers for semantic and RAG routing.
+
+    The classifiers are off unless `fast_path.enabled` is set: the bundled
+    examples are too few to route reliably, so enable them only with a
+    labeled set whose leave-one-out report supports the thresholds.
+    """
+    fast_path_config = input_config.get("fast_path")
+    if not fast_path_config or not fast_path_config.get("enabled", False):
+        return None, None
+    examples_path = settings.data_path / fast_path_config["training_data"]
+    if not examples_path.exists():
+        logger.warning("Fast-path training data not found.", path=examples_path)
+        return None, None
+    examples = load_labeled_queries(examples_path)
+    return (
+        build_fast_path(examples, "semantic", fast_path_config["semantic_threshold"]),
+        build_fast_path(examples, "rag", fast_path_config["rag_threshold"]),
+    )
+
 
 def setup_retriever(
     qdrant_client: QdrantClient,
     input_config: dict,
-    df_docs: pd.DataFrame,
+    clients: ServiceClients = DEFAULT_CLIENTS,
 ) -> QdrantRetriever:
     """Initialize the Qdrant retriever."""
     # Set up Qdrant config
     retriever_config = RetrieverConfig.load(input_config["retriever_config"])
 
     # Set up Gemini Embedding client
-    embedding_client = GeminiEmbedding(settings.gemini_api_key)
-    # (Re)generate qdrant collection
-    generate_collection(
-        df_docs,
-        qdrant_client,
-        retriever_config,
-        embedding_client=embedding_client,
-    )
-    logger.info(
-        "The Qdrant collection has been generated.",
-        collection_name=retriever_config.collection_name,
-    )
+    embedding_client = clients.embedding()
     # Return retriever
     return QdrantRetriever(
         client=qdrant_client,
         retriever_config=retriever_config,
         embedding_client=embedding_client,
+        parent_store=setup_parent_store(retriever_config),
+    )
+
+
+def setup_parent_store(retriever_config: RetrieverConfig) -> ParentStore | None:
+    """Initialize the parent section store, if child chunks are embedded."""
+    if retriever_config.child_chunk_size is None:
+        return None
+    return ParentStore(settings.data_path / retriever_config.parent_store)
+
+
+def setup_collections(
+    retriever: QdrantRetriever, input_config: dict
+) -> MultiCollectionRetriever | None:
+    """
+    Initialize the retrievers of the configured collections, if any.
+
+    Every retriever shares the Qdrant client and embedding client of the
+    main retriever, which serves the route of the main collection.
+    """
+    routes_config = input_config.get("collections")
+    if not routes_config:
+        return None
+    routes = [
+        CollectionRoute.load(route_config, input_config["retriever_config"])
+        for route_config in routes_config
+    ]
+    retrievers = {
+        route.name: (
+            retriever
+            if route.retriever_config == retriever.retriever_config
+            else QdrantRetriever(
+                client=retriever.client,
+                retriever_config=route.retriever_config,
+                embedding_client=retriever.embedding_client,
+                parent_store=setup_parent_store(route.retriever_config),
+            )
+        )
+        for route in routes
+    }
+    logger.info("Collection routes have been set up.", routes=list(retrievers))
+    return MultiCollectionRetriever(retrievers, CollectionRouter(routes))
+
+
+def _index_fingerprint(retriever: QdrantRetriever, documents: DocumentSource) -> str:
+    """Hash the documents and the settings that shape the collection."""
+    config = retriever.retriever_config
+    digest = hashlib.sha256(documents.fingerprint().encode())
+    digest.update(
+        f"{config.collection_name}:{config.embedding_model}:{config.vector_size}".encode()
+    )
+    digest.update(
+        f"{config.near_duplicate_distance}:{config.child_chunk_size}:"
+        f"{config.child_chunk_overlap}:{config.parent_max_chars}".encode()
+    )
+    return digest.hexdigest()
+
+
+def _index_is_current(
+    retriever: QdrantRetriever, marker_path: Path, fingerprint: str
+) -> bool:
+    """Whether the collection was already built from the same documents."""
+    if not marker_path.exists():
+        return False
+    marker = json.loads(marker_path.read_text())
+    collection_name = retriever.retriever_config.collection_name
+    return (
+        marker.get("fingerprint") == fingerprint
+        and retriever.client.collection_exists(collection_name)
+        and retriever.client.count(collection_name).count == marker.get("points")
+        and (retriever.parent_store is None or len(retriever.parent_store) > 0)
     )
 
 
+def _restore_index(snapshot_path: Path, retriever: QdrantRetriever) -> bool:
+    """Restore the collection from a snapshot; False if the snapshot is damaged."""
+    try:
+        restore_snapshot(
+            snapshot_path,
+            retriever.client,
+            retriever.retriever_config,
+            parent_store=retriever.parent_store,
+        )
+    except SnapshotError as e:
+        logger.warning(
+            "Index snapshot is damaged, rebuilding the collection.", error=str(e)
+        )
+        return False
+    return True
+
+
+def build_index(
+    retriever: QdrantRetriever,
+    documents: DocumentSource,
+    snapshot_path: Path | None = settings.index_snapshot_path,
+) -> None:
+    """
+    Generate the Qdrant collection searched by the retriever, exactly once.
+
+    With several API workers every process runs startup, so the build is
+    serialized with a file lock and skipped when the collection already holds
+    the points built from the same documents (recorded in a marker file).
+    Otherwise a prebuilt snapshot is restored if its manifest matches the
+    documents, and only as a last resort are the documents embedded again.
+    Additional collections are built without a snapshot (`snapshot_path`
+    None).
+    """
+    config = retriever.retriever_config
+    collection_name = config.collection_name
+    marker_path = settings.data_path / f".{collection_name}.index.json"
+    fingerprint = _index_fingerprint(retriever, documents)
+
+    with file_lock(settings.data_path / f".{collection_name}.index.lock"):
+        if _index_is_current(retriever, marker_path, fingerprint):
+            logger.info("Reusing existing Qdrant collection.", name=collection_name)
+            return
+        manifest = IndexManifest.load(snapshot_path) if snapshot_path else None
+        from_snapshot = False
+        if manifest is not None and snapshot_path:
+            if manifest.matches(documents, config):
+                from_snapshot = _restore_index(snapshot_path, retriever)
+            else:
+                logger.warning("Index snapshot is stale, rebuilding the collection.")
+        if not from_snapshot:
+            generate_collection(
+                documents,
+                retriever.client,
+                config,
+                embedding_client=retriever.embedding_client,
+                parent_store=retriever.parent_store,
+            )
+        points = retriever.client.count(collection_name).count
+        marker_path.write_text(
+            json.dumps({"fingerprint": fingerprint, "points": points})
+        )
+    logger.info(
+        "The Qdrant collection has been generated.",
+        collection_name=collection_name,
+        points=points,
+        from_snapshot=from_snapshot,
+    )
+
+
+def wait_for_qdrant(
+    qdrant_client: QdrantClient, timeout: float = 60.0, interval: float = 0.5
+) -> None:
+    """Block until the Qdrant server answers, polling at a short interval."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            qdrant_client.get_collections()
+        except Exception:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(interval)
+        else:
+            return
+
+
 def setup_qdrant(input_config: dict) -> QdrantClient:
-    """Initialize Qdrant client."""
+    """
+    Initialize Qdrant client.
+
+    Raises:
+        ValueError: If an embedded Qdrant is configured with several API
+            workers: only one process can open its storage, and an in-memory
+            one would be a separate index in each worker.
+    """
     logger.info("Setting up Qdrant client...")
     retriever_config = RetrieverConfig.load(input_config["retriever_config"])
-    qdrant_client = QdrantClient(host=retriever_config.host, port=retriever_config.port)
-    logger.info("Qdrant client has been set up.")
+    embedded_path = retriever_config.path
+    if embedded_path is not None and settings.api_workers > 1:
+        msg = (
+            f"Embedded Qdrant at {embedded_path} cannot be shared by "
+            f"{settings.api_workers} API workers; run one worker or a Qdrant server"
+        )
+        raise ValueError(msg)
+    qdrant_client = create_qdrant_client(retriever_config)
+    wait_for_qdrant(qdrant_client)
+    logger.info(
+        "Qdrant client has been set up.",
+        transport="grpc" if retriever_config.prefer_grpc else "rest",
+        embedded=retriever_config.path is not None,
+    )
 
     return qdrant_client
 
 
-def setup_responder(input_config: dict) -> GeminiResponder:
+def setup_responder(
+    input_config: dict, clients: ServiceClients = DEFAULT_CLIENTS
+) -> GeminiResponder:
     """Initialize the responder."""
     # Set up Responder Config.
-    responder_config = input_config["responder_model"]
-    responder_config = ResponderConfig.load(responder_config)
+    responder_model_config = input_config["responder_model"]
+    responder_config = ResponderConfig.load(responder_model_config)
 
     # Set up a new Gemini Provider based on Responder Config.
-    gemini_provider = GeminiProvider(
-        api_key=settings.gemini_api_key,
-        model=responder_config.model.model_id,
+    gemini_provider = build_provider(
+        responder_model_config,
+        clients,
         system_instruction=responder_config.system_prompt,
     )
 
     return GeminiResponder(client=gemini_provider, responder_config=responder_config)
 
 
-def create_app() -> FastAPI:
+def setup_reranker(
+    input_config: dict, clients: ServiceClients = DEFAULT_CLIENTS
+) -> RerankStage | None:
+    """Initialize the rerank stage, if configured."""
+    reranker_config_json = input_config.get("reranker")
+    if not reranker_config_json:
+        return None
+    reranker_config = RerankerConfig.load(reranker_config_json)
+    if reranker_config.kind == "cross_encoder":
+        reranker = CrossEncoderReranker(reranker_config)
+    else:
+        reranker = LLMReranker(
+            client=build_provider(
+                reranker_config_json["model"],
+                clients,
+                system_instruction=reranker_config.system_prompt,
+            ),
+            reranker_config=reranker_config,
+        )
+    return RerankStage(
+        reranker,
+        candidates=reranker_config.candidates,
+        top_k=reranker_config.top_k,
+        budget=reranker_config.budget_seconds,
+    )
+
+
+def load_documents(input_config: dict) -> DocumentSource:
+    """Open the RAG documents (CSV, JSONL or Parquet) for streaming."""
+    documents = open_document_source(
+        settings.data_path / input_config.get("documents", "docs.csv")
+    )
+    logger.info("Opened document source.", path=documents.path)
+    return documents
+
+
+async def _initialize(
+    app: FastAPI,
+    tracker: StartupTracker,
+    input_config: dict | None,
+    clients: ServiceClients,
+) -> None:
+    """Run one attempt at initializing the RAG components."""
+    # Load input configuration.
+    if input_config is None:
+        input_config = load_json(settings.input_path / "input_parameters.json")
+        logger.info("Loaded input configuration successfully")
+    decision_cache = setup_decision_cache(input_config)
+
+    async with asyncio.TaskGroup() as group:
+        documents_task = group.create_task(
+            tracker.run("documents", load_documents, input_config)
+        )
+        router_task = group.create_task(
+            tracker.run("router", setup_router, input_config, decision_cache, clients)
+        )
+        qdrant_task = group.create_task(
+            tracker.run("qdrant", setup_qdrant, input_config)
+        )
+        responder_task = group.create_task(
+            tracker.run("responder", setup_responder, input_config, clients)
+        )
+        fast_path_task = group.create_task(
+            tracker.run("fast_path", setup_fast_path, input_config)
+        )
+        reranker_task = group.create_task(
+            tracker.run("reranker", setup_reranker, input_config, clients)
+        )
+        attestation_task = group.create_task(
+            tracker.run(
+                "attestation", partial(Vtpm, simulate=settings.simulate_attestation)
+            )
+        )
+    documents = documents_task.result()
+    base_ai, router_component = router_task.result()
+    semantic_fast_path, rag_fast_path = fast_path_task.result()
+    retriever_component = setup_retriever(qdrant_task.result(), input_config, clients)
+    collections = setup_collections(retriever_component, input_config)
+
+    # Create an APIRouter for chat endpoints and initialize ChatRouter.
+    chat_router = ChatRouter(
+        router=APIRouter(),
+        ai=base_ai,
+        query_router=router_component,
+        retriever=collections or retriever_component,
+        responder=responder_task.result(),
+        attestation=attestation_task.result(),
+        prompts=PromptService(),
+        semantic_fast_path=semantic_fast_path,
+        rag_fast_path=rag_fast_path,
+        decision_cache=decision_cache,
+        classification_profile=RouterConfig.load(
+            input_config["router_model"]
+        ).model.generation_profile,
+        rerank_stage=reranker_task.result(),
+        cutoff=setup_cutoff(input_config),
+        stage_timings=input_config.get("telemetry", {}).get("response_timings", False),
+        usage=setup_usage(input_config),
+    )
+
+    await tracker.run("index", build_index, retriever_component, documents)
+    if collections:
+        for route in collections.router.routes.values():
+            if route.documents:
+                await tracker.run(
+                    f"index:{route.name}",
+                    build_index,
+                    collections.retrievers[route.name],
+                    open_document_source(settings.data_path / route.documents),
+                    None,
+                )
+    # Register the chat endpoints once the index is in place, so a failed
+    # attempt leaves nothing registered for the next one.
+    app.include_router(chat_router.router, prefix=CHAT_PREFIX, tags=["chat"])
+    logger.info("Chat router initialized and endpoints registered")
+    tracker.mark_ready()
+
+
+async def initialize_app(
+    app: FastAPI,
+    tracker: StartupTracker,
+    input_config: dict | None = None,
+    clients: ServiceClients = DEFAULT_CLIENTS,
+    *,
+    exit_on_failure: bool = True,
+) -> None:
+    """
+    Initialize the RAG components in the background and register the chat API.
+
+    Independent steps (loading documents, router, Qdrant connection, responder
+    and fast-path classifiers) run concurrently, then the Qdrant index is
+    built and the chat endpoints are registered; the app reports ready once
+    they are in place. A failed initialization is retried up to
+    `STARTUP_ATTEMPTS` times. After that the tracker reports the failure and,
+    with `exit_on_failure`, the process terminates itself (SIGTERM) so its
+    supervisor restarts it instead of leaving a live process that never
+    serves.
+    """
+    for attempt in range(1, STARTUP_ATTEMPTS + 1):
+        try:
+            await _initialize(app, tracker, input_config, clients)
+        except Exception:
+            logger.exception("Error initializing application", attempt=attempt)
+        else:
+            return
+        if attempt < STARTUP_ATTEMPTS:
+            await asyncio.sleep(STARTUP_RETRY_SECONDS * attempt)
+    tracker.mark_failed()
+    if exit_on_failure:
+        logger.critical("Initialization failed, shutting down")
+        signal.raise_signal(signal.SIGTERM)
+
+
+def create_app(
+    input_config: dict | None = None,
+    clients: ServiceClients = DEFAULT_CLIENTS,
+    *,
+    exit_on_failure: bool = True,
+) -> FastAPI:
     """
     Create and configure the FastAPI application instance.
 
-    This function:
-      1. Creates a new FastAPI instance with optional CORS middleware.
-      2. Loads configuration.
-      3. Sets up the Gemini Router, Qdrant Retriever, and Gemini Responder.
-      4. Loads RAG data and (re)generates the Qdrant collection.
-      5. Initializes a ChatRouter that wraps the RAG pipeline.
-      6. Registers the chat endpoint under the /chat prefix.
+    This function only builds the app and performs no I/O, so the server can
+    bind immediately. On startup, a FastAPI lifespan launches
+    `initialize_app` in the background, which:
+      1. Loads configuration and RAG data.
+      2. Sets up the Gemini Router, Qdrant client, Gemini Responder and
+         fast-path classifiers concurrently.
+      3. (Re)generates the Qdrant collection.
+      4. Initializes a ChatRouter and registers it under the /chat prefix.
+
+    `/health` reports liveness right away; `/ready` and the chat endpoints
+    return 503 until startup has finished.
+
+    Args:
+        input_config: Configuration to use instead of `input_parameters.json`.
+        clients: Factories of the model API clients (stubs in load tests).
+        exit_on_failure: Whether the process exits when initialization keeps
+            failing (disable when the app runs in-process, e.g. load tests).
 
     Returns:
         FastAPI: The configured FastAPI application instance.
     """
-    app = FastAPI(title="RAG Knowledge API", version="1.0", redirect_slashes=False)
+    tracker = StartupTracker()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
+        init_task = asyncio.create_task(
+            initialize_app(
+                app, tracker, input_config, clients, exit_on_failure=exit_on_failure
+            )
+        )
+        yield
+        init_task.cancel()
+
+    app = FastAPI(
+        title="RAG Knowledge API",
+        version="1.0",
+        redirect_slashes=False,
+        lifespan=lifespan,
+    )
+    app.state.startup = tracker
 
     # Add health check endpoint
     @app.get("/health")
     async def health_check():
         return {"status": "healthy"}
 
+    # Add readiness endpoint
+    @app.get("/ready")
+    async def readiness_check() -> JSONResponse:
+        status_code = 200 if tracker.ready else 503
+        return JSONResponse(tracker.snapshot(), status_code=status_code)
+
+    # Answer chat requests with 503 until the index is built and the chat
+    # endpoints are registered.
+    @app.middleware("http")
+    async def require_ready(
+        request: Request, call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        if not tracker.ready and request.url.path.startswith(CHAT_PREFIX):
+            return JSONResponse(
+                {"detail": "Service is starting", **tracker.snapshot()},
+                status_code=503,
+                headers={"Retry-After": str(int(STARTUP_RETRY_SECONDS))},
+            )
+        return await call_next(request)
+
+    # Expose the pipeline metrics when prometheus-client is installed.
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        rendered = render_metrics()
+        if rendered is None:
+            return Response("prometheus-client is not installed", status_code=404)
+        body, content_type = rendered
+        return Response(body, media_type=content_type)
+
     # Optional: configure CORS middleware using settings.
     app.add_middleware(
         CORSMiddleware,
@@ -128,48 +724,6 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    try:
-        # Load input configuration.
-        input_config = load_json(settings.input_path / "input_parameters.json")
-        logger.info("Loaded input configuration successfully")
-
-        # Load RAG data.
-        df_docs = pd.read_csv(settings.data_path / "docs.csv", delimiter=",")
-        logger.info("Loaded CSV Data.", num_rows=len(df_docs))
-
-        # Set up the RAG components: 1. Gemini Provider
-        base_ai, router_component = setup_router(input_config)
-        logger.info("Router component initialized successfully")
-
-        # 2a. Set up Qdrant client.
-        qdrant_client = setup_qdrant(input_config)
-        logger.info("Qdrant client initialized successfully")
-
-        # 2b. Set up the Retriever.
-        retriever_component = setup_retriever(qdrant_client, input_config, df_docs)
-        logger.info("Retriever component initialized successfully")
-
-        # 3. Set up the Responder.
-        responder_component = setup_responder(input_config)
-        logger.info("Responder component initialized successfully")
-
-        # Create an APIRouter for chat endpoints and initialize ChatRouter.
-        chat_router = ChatRouter(
-            router=APIRouter(),
-            ai=base_ai,
-            query_router=router_component,
-            retriever=retriever_component,
-            responder=responder_component,
-            attestation=Vtpm(simulate=settings.simulate_attestation),
-            prompts=PromptService(),
-        )
-        app.include_router(chat_router.router, prefix="/api/routes/chat", tags=["chat"])
-        logger.info("Chat router initialized and endpoints registered")
-
-    except Exception as e:
-        logger.error(f"Error initializing application: {str(e)}")
-        raise
-
     return app
 
 
@@ -181,13 +735,31 @@ def start() -> None:
     Start the FastAPI application server.
     """
     try:
-        logger.info("Starting FastAPI application on port 8000")
-        uvicorn.run(app, host="0.0.0.0", port=8000)  # noqa: S104
+        logger.info(
+            "Starting FastAPI application on port 8000", workers=settings.api_workers
+        )
+        if settings.api_workers > 1:
+            # Multiple workers need an import string so each process builds
+            # its own app; startup work shared between them is coordinated
+            # through file locks in the data directory. Their metrics are
+            # collected through files there too.
+            enable_multiprocess(settings.data_path / "prometheus")
+            uvicorn.run(
+                "flare_ai_rag.main:app",
+                host="0.0.0.0",  # noqa: S104
+                port=8000,
+                workers=settings.api_workers,
+            )
+        else:
+            uvicorn.run(app, host="0.0.0.0", port=8000)  # noqa: S104
     except Exception as e:
         logger.error(f"Failed to start application: {str(e)}")
         raise
 
 
 if __name__ == "__main__":
+    # The bot stacks are only needed when running the bots alongside the API.
+    from flare_ai_rag.bot_manager import start_bot_manager
+
     start()
     start_bot_manager()
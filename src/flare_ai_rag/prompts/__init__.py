@@ -1,6 +1,14 @@
 from .library import PromptLibrary
-from .schemas import SemanticRouterResponse
+from .schemas import RAGRouterClassification, SemanticRouterResponse
 from .service import PromptService
 from .templates import CHAIN_OF_THOUGHT_PROMPT, FEW_SHOT_PROMPT, ZERO_SHOT_PROMPT
 
-__all__ = ["PromptLibrary", "PromptService", "SemanticRouterResponse","CHAIN_OF_THOUGHT_PROMPT", "FEW_SHOT_PROMPT", "ZERO_SHOT_PROMPT"]
+__all__ = [
+    "CHAIN_OF_THOUGHT_PROMPT",
+    "FEW_SHOT_PROMPT",
+    "ZERO_SHOT_PROMPT",
+    "PromptLibrary",
+    "PromptService",
+    "RAGRouterClassification",
+    "SemanticRouterResponse",
+]
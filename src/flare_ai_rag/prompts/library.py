@@ -15,7 +15,7 @@ import structlog
 
 from flare_ai_rag.prompts.schemas import (
     Prompt,
-    RAGRouterResponse,
+    RAGRouterClassification,
     SemanticRouterResponse,
 )
 from flare_ai_rag.prompts.templates import (
@@ -95,8 +95,8 @@ class PromptLibrary:
                 description="The ",
                 template=RAG_ROUTER,
                 required_inputs=["user_input"],
-                response_mime_type="application/json",
-                response_schema=RAGRouterResponse,
+                response_mime_type="text/x.enum",
+                response_schema=RAGRouterClassification,
                 category="rag-router",
             ),
             Prompt(
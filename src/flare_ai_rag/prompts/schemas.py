@@ -10,7 +10,7 @@ across the application.
 """
 
 from dataclasses import dataclass
-from enum import Enum
+from enum import Enum, StrEnum
 from string import Template
 from typing import TypedDict
 
@@ -37,6 +37,24 @@ class SemanticRouterResponse(str, Enum):
     
 
 
+class RAGRouterClassification(StrEnum):
+    """
+    Enumeration of possible RAG router classifications.
+
+    Used as an enum-constrained response schema so the model can only
+    answer with one of these values.
+
+    Attributes:
+        ANSWER: The query can be answered from the knowledge base
+        CLARIFY: The query needs additional context
+        REJECT: The query is out of scope
+    """
+
+    ANSWER = "ANSWER"
+    CLARIFY = "CLARIFY"
+    REJECT = "REJECT"
+
+
 class RAGRouterResponse(TypedDict):
     """
     Type definition for RAG router response type.
@@ -44,10 +62,10 @@ class RAGRouterResponse(TypedDict):
     Defines the required fields for a RAG routing operation,
 
     Attributes:
-        classification (str): The response class
+        classification (RAGRouterClassification): The response class
     """
 
-    classification: str
+    classification: RAGRouterClassification
 
 
 class PromptInputs(TypedDict, total=False):
@@ -159,24 +159,18 @@ options:
 
 Input: ${user_input}
 
-Response format:
-{
-  "classification": "<UPPERCASE_CATEGORY>"
-}
-
 Processing rules:
 - The response should be exactly one of the three categories
 - DO NOT infer missing values
-- Normalize response to uppercase
 
 Examples:
-- "What is Flare's block time?" → {"category": "ANSWER"}
-- "How do you stake on Flare?" → {"category": "ANSWER"}
-- "How is the weather today?" → {"category": "REJECT"}
+- "What is Flare's block time?" → ANSWER
+- "How do you stake on Flare?" → ANSWER
+- "How is the weather today?" → REJECT
 - "What is the average block time?" - No specific chain is mentioned.
-   → {"category": "CLARIFY"}
-- "How secure is it?" → {"category": "CLARIFY"}
-- "Tell me about Flare." → {"category": "CLARIFY"}
+   → CLARIFY
+- "How secure is it?" → CLARIFY
+- "Tell me about Flare." → CLARIFY
 """
 
 RAG_RESPONDER: Final = """
@@ -0,0 +1,33 @@
+from typing import TYPE_CHECKING
+
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .base import BaseReranker
+    from .config import RerankerConfig
+    from .prompts import RERANK_INSTRUCTION, RERANK_PROMPT
+    from .reranker import CrossEncoderReranker, LLMReranker
+    from .stage import RerankStage
+
+__all__ = [
+    "RERANK_INSTRUCTION",
+    "RERANK_PROMPT",
+    "BaseReranker",
+    "CrossEncoderReranker",
+    "LLMReranker",
+    "RerankStage",
+    "RerankerConfig",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "BaseReranker": ".base",
+        "RerankerConfig": ".config",
+        "RERANK_INSTRUCTION": ".prompts",
+        "RERANK_PROMPT": ".prompts",
+        "CrossEncoderReranker": ".reranker",
+        "LLMReranker": ".reranker",
+        "RerankStage": ".stage",
+    },
+)
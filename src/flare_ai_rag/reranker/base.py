@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+
+
+class BaseReranker(ABC):
+    """
+    An abstract base class for relevance scorers used to rerank retrieved documents.
+    """
+
+    @abstractmethod
+    def score(self, query: str, documents: list[str]) -> list[float]:
+        """
+        Score every document's relevance to the query (higher is more relevant).
+        """
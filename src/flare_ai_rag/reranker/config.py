@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from typing import Any
+
+from flare_ai_rag.ai import Model
+from flare_ai_rag.reranker.prompts import RERANK_INSTRUCTION, RERANK_PROMPT
+
+
+@dataclass(frozen=True)
+class RerankerConfig:
+    kind: str
+    candidates: int
+    top_k: int
+    budget_seconds: float
+    max_chars: int
+    system_prompt: str
+    rerank_prompt: str
+    model: Model | None = None
+    cross_encoder_model: str | None = None
+
+    @staticmethod
+    def load(reranker_config: dict[str, Any]) -> "RerankerConfig":
+        """Loads the reranker config."""
+        model_config = reranker_config.get("model")
+
+        return RerankerConfig(
+            kind=reranker_config.get("kind", "llm"),
+            candidates=reranker_config.get("candidates", 20),
+            top_k=reranker_config.get("top_k", 5),
+            budget_seconds=reranker_config.get("budget_seconds", 1.5),
+            max_chars=reranker_config.get("max_chars", 1500),
+            system_prompt=RERANK_INSTRUCTION,
+            rerank_prompt=RERANK_PROMPT,
+            model=Model.load(model_config) if model_config else None,
+            cross_encoder_model=reranker_config.get("cross_encoder_model"),
+        )
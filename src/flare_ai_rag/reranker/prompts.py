@@ -0,0 +1,14 @@
+RERANK_INSTRUCTION = """You are a relevance judge for a documentation search engine
+about the Flare Network blockchain. Given a user query and a numbered list of
+documents, rate how useful each document is for answering the query on a scale
+from 0 (irrelevant) to 10 (directly answers it).
+
+Return only a JSON array with one number per document, in the order the
+documents are listed.
+"""
+
+RERANK_PROMPT = """Query: ${query}
+
+Documents:
+${documents}
+"""
@@ -0,0 +1,78 @@
+import json
+from string import Template
+from typing import Any, override
+
+from flare_ai_rag.ai import BaseAIProvider
+from flare_ai_rag.reranker.base import BaseReranker
+from flare_ai_rag.reranker.config import RerankerConfig
+
+
+class LLMReranker(BaseReranker):
+    def __init__(self, client: BaseAIProvider, reranker_config: RerankerConfig) -> None:
+        """
+        Initialize the reranker with a provider that scores all documents at once.
+
+        :param client: Provider created with the reranker's system prompt.
+        :param reranker_config: The reranker configuration.
+        """
+        self.client = client
+        self.reranker_config = reranker_config
+
+    @override
+    def score(self, query: str, documents: list[str]) -> list[float]:
+        """
+        Score the documents with a single LLM call returning a JSON array.
+
+        :param query: The user query.
+        :param documents: Texts of the candidate documents.
+        :return: One score per document.
+        :raises ValueError: If the model does not return one number per document.
+        """
+        max_chars = self.reranker_config.max_chars
+        listing = "\n\n".join(
+            f"[{idx}] {text[:max_chars]}" for idx, text in enumerate(documents, 1)
+        )
+        prompt = Template(self.reranker_config.rerank_prompt).safe_substitute(
+            query=query, documents=listing
+        )
+        model = self.reranker_config.model
+        response = self.client.generate(
+            prompt,
+            response_mime_type="application/json",
+            response_schema=list[float],
+            generation_profile=model.generation_profile if model else None,
+        )
+        scores: Any = response.parsed
+        if scores is None:
+            scores = json.loads(response.text)
+        if not isinstance(scores, list) or len(scores) != len(documents):
+            msg = f"Expected {len(documents)} scores, got: {response.text!r}"
+            raise ValueError(msg)
+        return [float(score) for score in scores]
+
+
+class CrossEncoderReranker(BaseReranker):
+    def __init__(self, reranker_config: RerankerConfig) -> None:
+        """
+        Initialize a local cross-encoder (requires `sentence-transformers`).
+
+        :param reranker_config: The reranker configuration; `cross_encoder_model`
+            names the model to load.
+        """
+        try:
+            from sentence_transformers import CrossEncoder  # noqa: PLC0415
+        except ImportError as e:
+            msg = "The cross-encoder reranker requires 'sentence-transformers'"
+            raise ImportError(msg) from e
+        self.reranker_config = reranker_config
+        self.model = CrossEncoder(
+            reranker_config.cross_encoder_model
+            or "cross-encoder/ms-marco-MiniLM-L-6-v2"
+        )
+
+    @override
+    def score(self, query: str, documents: list[str]) -> list[float]:
+        """Score all query/document pairs in one batched forward pass."""
+        max_chars = self.reranker_config.max_chars
+        pairs = [(query, text[:max_chars]) for text in documents]
+        return [float(score) for score in self.model.predict(pairs)]
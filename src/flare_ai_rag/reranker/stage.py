@@ -0,0 +1,166 @@
+"""
+Rerank Stage
+
+This module runs a reranker over over-fetched retrieval candidates within a
+latency budget. If the budget is already spent when the stage starts, if
+recent reranks were slower than the budget, or if the scorer misses its
+deadline or fails, the stage falls back to the vector-search order, so
+reranking can only improve the top-K, never block the answer. A scorer call
+that misses its deadline is cancelled if it has not started yet; one already
+running cannot be interrupted and finishes in the background, occupying one
+of the stage's worker threads.
+"""
+
+import contextvars
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any
+
+import structlog
+
+from flare_ai_rag.reranker.base import BaseReranker
+from flare_ai_rag.retriever.hits import SearchHit
+
+logger = structlog.get_logger(__name__)
+
+# Fills in the text of hits returned without it (see `QdrantRetriever.fetch_text`).
+TextFetcher = Callable[[list[SearchHit]], list[SearchHit]]
+
+
+def _with_text(
+    hits: list[SearchHit], fetch_text: TextFetcher | None
+) -> list[SearchHit]:
+    return fetch_text(hits) if fetch_text is not None else hits
+
+
+# Weight of the latest measurement in the moving average of rerank latency.
+LATENCY_SMOOTHING = 0.2
+
+
+class RerankStage:
+    """
+    Reranks search hits with a latency budget.
+
+    Attributes:
+        reranker (BaseReranker): The relevance scorer
+        candidates (int): Number of hits to over-fetch for reranking
+        top_k (int): Number of hits passed on after reranking
+        budget (float): Seconds the retrieval plus rerank may take
+        reranked (int): Number of successful reranks
+        skipped (int): Number of reranks skipped or abandoned
+    """
+
+    def __init__(
+        self, reranker: BaseReranker, candidates: int, top_k: int, budget: float
+    ) -> None:
+        self.reranker = reranker
+        self.candidates = candidates
+        self.top_k = top_k
+        self.budget = budget
+        self.reranked = 0
+        self.skipped = 0
+        self.expected_latency = 0.0
+        # Requests rerank concurrently; guards the counters and the estimate.
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rerank")
+
+    def _skip(
+        self, hits: list[SearchHit], reason: str, fetch_text: TextFetcher | None
+    ) -> list[SearchHit]:
+        with self._lock:
+            self.skipped += 1
+        logger.info("rerank_skipped", reason=reason)
+        return _with_text(hits[: self.top_k], fetch_text)
+
+    def _remaining(self, started: float | None) -> float:
+        elapsed = time.perf_counter() - started if started is not None else 0.0
+        return self.budget - elapsed
+
+    def _skip_reason(self, remaining: float) -> str | None:
+        """Why to skip reranking with `remaining` seconds left, if at all."""
+        if remaining <= 0:
+            return "budget_spent"
+        with self._lock:
+            if self.expected_latency > remaining:
+                # Decay the estimate so the scorer is probed again eventually.
+                self.expected_latency *= 1 - LATENCY_SMOOTHING
+                return "expected_too_slow"
+        return None
+
+    def rerank(
+        self,
+        query: str,
+        hits: list[SearchHit],
+        started: float | None = None,
+        fetch_text: TextFetcher | None = None,
+    ) -> list[SearchHit]:
+        """
+        Return the best `top_k` hits, reranked if the budget allows.
+
+        :param query: The user query.
+        :param hits: Candidates in vector-search order.
+        :param started: `time.perf_counter()` when the request's retrieval
+            began; the time already spent counts against the budget.
+        :param fetch_text: Fills in the text of hits without it. It is called
+            on all candidates only if they are scored, and otherwise on the
+            returned hits alone; without it, the hits must have their text.
+        :return: At most `top_k` hits.
+        """
+        if len(hits) <= 1:
+            return _with_text(hits[: self.top_k], fetch_text)
+        reason = self._skip_reason(self._remaining(started))
+        if reason is not None:
+            return self._skip(hits, reason, fetch_text)
+
+        hits = _with_text(hits, fetch_text)
+        # Fetching the text took part of the budget.
+        remaining = self._remaining(started)
+        if remaining <= 0:
+            return self._skip(hits, "budget_spent", fetch_text)
+        start = time.perf_counter()
+        # Run in the request's context so the scorer's model call is traced.
+        future = self._executor.submit(
+            contextvars.copy_context().run,
+            self.reranker.score,
+            query,
+            [hit.text or "" for hit in hits],
+        )
+        try:
+            scores = future.result(timeout=remaining)
+        except FutureTimeoutError:
+            # Drop the call if it is still queued; a running one carries on.
+            future.cancel()
+            # Count the miss so later requests skip until the scorer speeds up.
+            self._observe(remaining)
+            return self._skip(hits, "timeout", fetch_text)
+        except Exception as e:  # noqa: BLE001
+            logger.warning("rerank_failed", error=str(e))
+            return self._skip(hits, "error", fetch_text)
+        self._observe(time.perf_counter() - start, reranked=True)
+
+        order = sorted(range(len(hits)), key=lambda idx: scores[idx], reverse=True)
+        return [hits[idx] for idx in order[: self.top_k]]
+
+    def _observe(self, latency: float, *, reranked: bool = False) -> None:
+        with self._lock:
+            if not self.expected_latency:
+                self.expected_latency = latency
+            else:
+                self.expected_latency += LATENCY_SMOOTHING * (
+                    latency - self.expected_latency
+                )
+            if reranked:
+                self.reranked += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return rerank counters and the expected rerank latency."""
+        with self._lock:
+            return {
+                "reranked": self.reranked,
+                "skipped": self.skipped,
+                "expected_latency": self.expected_latency,
+                "budget": self.budget,
+            }
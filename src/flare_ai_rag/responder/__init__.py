@@ -1,7 +1,12 @@
-from .base import BaseResponder
-from .config import ResponderConfig
-from .prompts import RESPONDER_INSTRUCTION, RESPONDER_PROMPT
-from .responder import GeminiResponder, OpenRouterResponder
+from typing import TYPE_CHECKING
+
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .base import BaseResponder
+    from .config import ResponderConfig
+    from .prompts import RESPONDER_INSTRUCTION, RESPONDER_PROMPT
+    from .responder import GeminiResponder, OpenRouterResponder
 
 __all__ = [
     "RESPONDER_INSTRUCTION",
@@ -11,3 +16,15 @@ __all__ = [
     "OpenRouterResponder",
     "ResponderConfig",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "BaseResponder": ".base",
+        "ResponderConfig": ".config",
+        "RESPONDER_INSTRUCTION": ".prompts",
+        "RESPONDER_PROMPT": ".prompts",
+        "GeminiResponder": ".responder",
+        "OpenRouterResponder": ".responder",
+    },
+)
@@ -14,11 +14,7 @@ class ResponderConfig:
     @staticmethod
     def load(model_config: dict[str, Any]) -> "ResponderConfig":
         """Loads the Responder config."""
-        model = Model(
-            model_id=model_config["id"],
-            max_tokens=model_config.get("max_tokens"),
-            temperature=model_config.get("temperature"),
-        )
+        model = Model.load(model_config)
 
         return ResponderConfig(
             model=model,
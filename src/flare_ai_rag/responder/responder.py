@@ -1,16 +1,17 @@
 from typing import Any, override
 
-from flare_ai_rag.ai import GeminiProvider, OpenRouterClient
+from flare_ai_rag.ai import BaseAIProvider, OpenRouterClient
 from flare_ai_rag.responder import BaseResponder, ResponderConfig
-from flare_ai_rag.utils import parse_chat_response
+from flare_ai_rag.telemetry import model_call
+from flare_ai_rag.utils import parse_chat_response, parse_chat_usage
 
 
 class GeminiResponder(BaseResponder):
     def __init__(
-        self, client: GeminiProvider, responder_config: ResponderConfig
+        self, client: BaseAIProvider, responder_config: ResponderConfig
     ) -> None:
         """
-        Initialize the responder with a GeminiProvider.
+        Initialize the responder with a GeminiProvider (or a ProviderPool).
 
         :param client: An instance of OpenRouterClient.
         :param model: The model identifier to be used by the API.
@@ -42,6 +43,7 @@ class GeminiResponder(BaseResponder):
             prompt,
             response_mime_type=None,
             response_schema=None,
+            generation_profile=self.responder_config.model.generation_profile,
         )
 
         return response.text
@@ -94,6 +96,8 @@ class OpenRouterResponder(BaseResponder):
             payload["temperature"] = self.responder_config.model.temperature
 
         # Send the prompt to the OpenRouter API.
-        response = self.client.send_chat_completion(payload)
+        with model_call(self.responder_config.model.model_id) as call:
+            response = self.client.send_chat_completion(payload)
+            call.set_usage(parse_chat_usage(response))
 
         return parse_chat_response(response)
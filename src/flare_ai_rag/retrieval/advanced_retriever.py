@@ -8,8 +8,9 @@ import asyncio
 
 import numpy as np
 from qdrant_client import QdrantClient
+from flare_ai_rag.ai.registry import gemini_registry
 from flare_ai_rag.embeddings.gemini_embeddings import GeminiEmbeddings
-import google.generativeai as genai
+from flare_ai_rag.retriever.diversity import NearDuplicateDetector, simhash
 
 logger = logging.getLogger(__name__)
 
@@ -29,17 +30,19 @@ class AdvancedRetriever:
         collection_name: str = "flare_knowledge_base",
         embedding_model: Any | None = None,
         gemini_api_key: str | None = None,
+        near_duplicate_distance: int = 3,
     ):
         """Initialize the retriever."""
         self.client = qdrant_client
         self.collection_name = collection_name
+        self.near_duplicate_distance = near_duplicate_distance
         self.embedding_model = embedding_model or GeminiEmbeddings()
         
         # Initialize Gemini
         if not gemini_api_key:
             raise ValueError("GEMINI_API_KEY must be provided")
-        genai.configure(api_key=gemini_api_key)
-        self.llm = genai.GenerativeModel('gemini-pro')
+        gemini_registry.configure(gemini_api_key)
+        self.llm = gemini_registry.get_model('gemini-pro')
 
     async def expand_query(self, query: str) -> list[str]:
         """Expand query using Gemini to improve search coverage."""
@@ -92,14 +95,16 @@ class AdvancedRetriever:
         self,
         results: list[SearchResult]
     ) -> list[SearchResult]:
-        """Remove duplicate results based on content similarity."""
-        seen_contents = set()
+        """Remove near-duplicate results, keeping the best-scored copy."""
+        detector = NearDuplicateDetector(self.near_duplicate_distance)
         unique_results = []
         
-        for result in results:
-            content_hash = hash(result.content)
-            if content_hash not in seen_contents:
-                seen_contents.add(content_hash)
+        for idx, result in enumerate(
+            sorted(results, key=lambda x: x.score, reverse=True)
+        ):
+            fingerprint = simhash(result.content)
+            if detector.find(fingerprint) is None:
+                detector.add(fingerprint, idx)
                 unique_results.append(result)
         
         return unique_results
@@ -1,6 +1,118 @@
-from .base import BaseRetriever
-from .config import RetrieverConfig
-from .qdrant_collection import generate_collection
-from .qdrant_retriever import QdrantRetriever
+from typing import TYPE_CHECKING
 
-__all__ = ["BaseRetriever", "QdrantRetriever", "RetrieverConfig", "generate_collection"]
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .base import BaseRetriever
+    from .client import create_qdrant_client, qdrant_client_kwargs
+    from .collection_router import (
+        CollectionRoute,
+        CollectionRouter,
+        MultiCollectionRetriever,
+        reciprocal_rank_fusion,
+    )
+    from .config import RetrieverConfig
+    from .cutoff import AdaptiveCutoff, CutoffConfig, CutoffDecision
+    from .diversity import (
+        DedupReport,
+        NearDuplicateDetector,
+        hamming_distance,
+        mmr,
+        simhash,
+    )
+    from .documents import (
+        CsvDocumentSource,
+        DocumentRecord,
+        DocumentSource,
+        JsonlDocumentSource,
+        ParquetDocumentSource,
+        open_document_source,
+    )
+    from .hits import SearchHit
+    from .metadata import DocumentMetadata, build_filter, parse_metadata
+    from .parents import ParentSection, ParentStore
+    from .qdrant_collection import generate_collection
+    from .qdrant_retriever import QdrantRetriever
+    from .snapshot import (
+        IndexManifest,
+        SnapshotError,
+        build_snapshot,
+        restore_snapshot,
+    )
+
+__all__ = [
+    "AdaptiveCutoff",
+    "BaseRetriever",
+    "CollectionRoute",
+    "CollectionRouter",
+    "CsvDocumentSource",
+    "CutoffConfig",
+    "CutoffDecision",
+    "DedupReport",
+    "DocumentMetadata",
+    "DocumentRecord",
+    "DocumentSource",
+    "IndexManifest",
+    "JsonlDocumentSource",
+    "MultiCollectionRetriever",
+    "NearDuplicateDetector",
+    "ParentSection",
+    "ParentStore",
+    "ParquetDocumentSource",
+    "QdrantRetriever",
+    "RetrieverConfig",
+    "SearchHit",
+    "SnapshotError",
+    "build_filter",
+    "build_snapshot",
+    "create_qdrant_client",
+    "generate_collection",
+    "hamming_distance",
+    "mmr",
+    "open_document_source",
+    "parse_metadata",
+    "qdrant_client_kwargs",
+    "reciprocal_rank_fusion",
+    "restore_snapshot",
+    "simhash",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "BaseRetriever": ".base",
+        "create_qdrant_client": ".client",
+        "qdrant_client_kwargs": ".client",
+        "CollectionRoute": ".collection_router",
+        "CollectionRouter": ".collection_router",
+        "MultiCollectionRetriever": ".collection_router",
+        "reciprocal_rank_fusion": ".collection_router",
+        "RetrieverConfig": ".config",
+        "AdaptiveCutoff": ".cutoff",
+        "CutoffConfig": ".cutoff",
+        "CutoffDecision": ".cutoff",
+        "DedupReport": ".diversity",
+        "NearDuplicateDetector": ".diversity",
+        "hamming_distance": ".diversity",
+        "mmr": ".diversity",
+        "simhash": ".diversity",
+        "CsvDocumentSource": ".documents",
+        "DocumentRecord": ".documents",
+        "DocumentSource": ".documents",
+        "JsonlDocumentSource": ".documents",
+        "ParquetDocumentSource": ".documents",
+        "open_document_source": ".documents",
+        "SearchHit": ".hits",
+        "DocumentMetadata": ".metadata",
+        "build_filter": ".metadata",
+        "parse_metadata": ".metadata",
+        "ParentSection": ".parents",
+        "ParentStore": ".parents",
+        "generate_collection": ".qdrant_collection",
+        "QdrantRetriever": ".qdrant_retriever",
+        "IndexManifest": ".snapshot",
+        "SnapshotError": ".snapshot",
+        "build_snapshot": ".snapshot",
+        "restore_snapshot": ".snapshot",
+    },
+)
@@ -1,7 +1,15 @@
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from typing import Any
 
 
 class BaseRetriever(ABC):
     @abstractmethod
-    def semantic_search(self, query: str, top_k: int = 5) -> list[dict]:
+    def semantic_search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Mapping[str, Any] | None = None,
+        score_threshold: float | None = None,
+    ) -> list[dict]:
         """Perform semantic search using vector embeddings."""
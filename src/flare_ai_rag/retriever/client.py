@@ -0,0 +1,63 @@
+"""
+Qdrant Client Factory
+
+This module builds the `QdrantClient` described by a `RetrieverConfig`, so
+the API, the demo and the benchmarks connect to Qdrant the same way:
+
+- over REST (default) or gRPC (`prefer_grpc`, usually faster for search and
+  bulk upserts of 768-dimensional vectors)
+- to a local server through a unix socket (`unix_socket`, REST only)
+- to an embedded, in-process Qdrant (`path`, a directory or ":memory:")
+"""
+
+from typing import Any
+
+import httpx
+from qdrant_client import QdrantClient
+
+from flare_ai_rag.retriever.config import RetrieverConfig
+
+
+def qdrant_client_kwargs(retriever_config: RetrieverConfig) -> dict[str, Any]:
+    """
+    Return the `QdrantClient` arguments for the settings of a retriever config.
+
+    :param retriever_config: Host, ports, transport and pool settings.
+    :raises ValueError: If gRPC is combined with a unix socket.
+    """
+    config = retriever_config
+    if config.path is not None:
+        if config.path == ":memory:":
+            return {"location": ":memory:"}
+        return {"path": config.path}
+
+    if config.unix_socket is not None:
+        if config.prefer_grpc:
+            msg = "Qdrant over a unix socket only supports REST, not gRPC"
+            raise ValueError(msg)
+        return {
+            "url": "http://localhost",
+            "port": None,
+            "timeout": config.timeout,
+            "pool_size": config.pool_size,
+            "transport": httpx.HTTPTransport(uds=config.unix_socket),
+        }
+
+    return {
+        "host": config.host,
+        "port": config.port,
+        "grpc_port": config.grpc_port,
+        "prefer_grpc": config.prefer_grpc,
+        "timeout": config.timeout,
+        "pool_size": config.pool_size,
+    }
+
+
+def create_qdrant_client(retriever_config: RetrieverConfig) -> QdrantClient:
+    """
+    Create a Qdrant client from the connection settings of a retriever config.
+
+    :param retriever_config: Host, ports, transport and pool settings.
+    :raises ValueError: If gRPC is combined with a unix socket.
+    """
+    return QdrantClient(**qdrant_client_kwargs(retriever_config))
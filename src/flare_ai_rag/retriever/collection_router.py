@@ -0,0 +1,231 @@
+"""
+Collection Routing
+
+This module searches several Qdrant collections (e.g. docs, `go-flare` code,
+blogs), each with its own retriever configuration and vector size. A
+`CollectionRouter` picks the collections for a query from keyword routes, the
+chosen collections are searched concurrently through one shared client, and
+their rankings are merged with reciprocal rank fusion (RRF).
+
+Fused hits keep the similarity score of their own collection; only their order
+comes from RRF, since scores of different collections are not comparable.
+"""
+
+import re
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, override
+
+import structlog
+from qdrant_client.http.models import Filter
+
+from flare_ai_rag.retriever.base import BaseRetriever
+from flare_ai_rag.retriever.config import RetrieverConfig
+from flare_ai_rag.retriever.hits import SearchHit
+from flare_ai_rag.retriever.qdrant_retriever import QdrantRetriever
+
+logger = structlog.get_logger(__name__)
+
+# RRF rank offset; 60 is the value from the original RRF paper.
+RRF_K = 60
+
+_WORD = re.compile(r"[\w-]+")
+
+
+@dataclass(frozen=True)
+class CollectionRoute:
+    """
+    A collection that queries can be routed to.
+
+    Attributes:
+        name (str): Route name, e.g. "code"
+        retriever_config (RetrieverConfig): Collection and embedding settings
+        keywords (tuple[str, ...]): Query words routing to this collection
+        default (bool): Whether every query searches this collection
+        weight (float): Weight of the collection's ranking in the fusion
+        documents (str | None): Documents file indexed into the collection
+    """
+
+    name: str
+    retriever_config: RetrieverConfig
+    keywords: tuple[str, ...] = ()
+    default: bool = False
+    weight: float = 1.0
+    documents: str | None = None
+
+    @staticmethod
+    def load(
+        route_config: dict[str, Any], base_config: dict[str, Any]
+    ) -> "CollectionRoute":
+        """
+        Loads a route; its `retriever_config` overrides the base retriever
+        config, with a separate parent store for every other collection.
+        """
+        overrides = route_config.get("retriever_config", {})
+        retriever_config = {**base_config, **overrides}
+        if retriever_config["collection_name"] != base_config["collection_name"]:
+            retriever_config["parent_store"] = overrides.get(
+                "parent_store", f"parents_{route_config['name']}.sqlite3"
+            )
+        return CollectionRoute(
+            name=route_config["name"],
+            retriever_config=RetrieverConfig.load(retriever_config),
+            keywords=tuple(k.casefold() for k in route_config.get("keywords", [])),
+            default=route_config.get("default", False),
+            weight=route_config.get("weight", 1.0),
+            documents=route_config.get("documents"),
+        )
+
+
+class CollectionRouter:
+    """Picks the collections searched for a query."""
+
+    def __init__(self, routes: Sequence[CollectionRoute]) -> None:
+        self.routes = {route.name: route for route in routes}
+
+    def select(self, query: str) -> list[str]:
+        """
+        Return the default routes plus those with a keyword in the query.
+
+        Keywords of several words match as a phrase. If nothing matches and
+        no route is a default, every route is searched.
+        """
+        text = query.casefold()
+        words = set(_WORD.findall(text))
+        selected = [
+            route.name
+            for route in self.routes.values()
+            if route.default
+            or any(
+                keyword in words if " " not in keyword else keyword in text
+                for keyword in route.keywords
+            )
+        ]
+        return selected or list(self.routes)
+
+
+def reciprocal_rank_fusion(
+    rankings: Mapping[str, Sequence[SearchHit]],
+    weights: Mapping[str, float] | None = None,
+    k: int = RRF_K,
+) -> list[SearchHit]:
+    """
+    Merge per-collection rankings by weighted reciprocal rank.
+
+    :param rankings: Hits of each collection, best first.
+    :param weights: Weight of each collection's ranking (default 1).
+    :param k: Rank offset damping the influence of top ranks.
+    :return: All hits, ordered by fused score.
+    """
+    scores: dict[tuple[str, int | str], float] = {}
+    hits: dict[tuple[str, int | str], SearchHit] = {}
+    for name, ranking in rankings.items():
+        weight = weights.get(name, 1.0) if weights else 1.0
+        for rank, hit in enumerate(ranking, start=1):
+            key = (name, hit.id)
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+            hits.setdefault(key, hit)
+    return [hits[key] for key in sorted(scores, key=scores.__getitem__, reverse=True)]
+
+
+class MultiCollectionRetriever(BaseRetriever):
+    """
+    Searches the routed collections concurrently and fuses their hits.
+
+    All retrievers share one Qdrant client; a query is embedded once per
+    embedding model.
+    """
+
+    def __init__(
+        self,
+        retrievers: Mapping[str, QdrantRetriever],
+        router: CollectionRouter,
+        max_workers: int = 4,
+    ) -> None:
+        self.retrievers = dict(retrievers)
+        self.router = router
+        self._by_collection = {
+            r.retriever_config.collection_name: r for r in self.retrievers.values()
+        }
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="collections"
+        )
+
+    def search(  # noqa: PLR0913
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Mapping[str, Any] | Filter | None = None,
+        *,
+        with_text: bool = True,
+        score_threshold: float | None = None,
+        collections: Sequence[str] | None = None,
+    ) -> list[SearchHit]:
+        """
+        Search the routed collections and fuse their rankings.
+
+        Collections whose search fails are left out of the fusion; the error
+        is only raised if every collection failed.
+
+        :param collections: Route names to search instead of routing.
+        :return: The best `top_k` fused hits.
+        """
+        names = list(collections) if collections else self.router.select(query)
+        vectors: dict[str, list[float]] = {}
+        for name in names:
+            retriever = self.retrievers[name]
+            model = retriever.retriever_config.embedding_model
+            if model not in vectors:
+                vectors[model] = retriever.embed_query(query)
+
+        futures = {
+            name: self._executor.submit(
+                self.retrievers[name].search,
+                query,
+                top_k,
+                filters,
+                with_text=with_text,
+                score_threshold=score_threshold,
+                query_vector=vectors[
+                    self.retrievers[name].retriever_config.embedding_model
+                ],
+            )
+            for name in names
+        }
+        rankings: dict[str, list[SearchHit]] = {}
+        errors: list[Exception] = []
+        for name, future in futures.items():
+            try:
+                rankings[name] = future.result()
+            except Exception as e:  # noqa: BLE001
+                logger.warning("collection_search_failed", route=name, error=str(e))
+                errors.append(e)
+        if errors and not rankings:
+            raise errors[0]
+
+        weights = {name: self.router.routes[name].weight for name in rankings}
+        return reciprocal_rank_fusion(rankings, weights)[:top_k]
+
+    def fetch_text(self, hits: list[SearchHit]) -> list[SearchHit]:
+        """Fill in the text of hits, one request per collection."""
+        by_collection: dict[str | None, list[SearchHit]] = {}
+        for hit in hits:
+            by_collection.setdefault(hit.collection, []).append(hit)
+        for collection, group in by_collection.items():
+            retriever = self._by_collection.get(collection or "")
+            if retriever is not None:
+                retriever.fetch_text(group)
+        return hits
+
+    @override
+    def semantic_search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Mapping[str, Any] | None = None,
+        score_threshold: float | None = None,
+    ) -> list[dict]:
+        """Search the routed collections, returning document dicts."""
+        hits = self.search(query, top_k, filters, score_threshold=score_threshold)
+        return [{**hit.to_dict(), "collection": hit.collection} for hit in hits]
@@ -11,6 +11,32 @@ class RetrieverConfig:
     vector_size: int
     host: str
     port: int
+    # Use gRPC (on `grpc_port`) instead of REST for Qdrant requests.
+    prefer_grpc: bool = False
+    grpc_port: int = 6334
+    # Request timeout in seconds; the client default if None.
+    timeout: int | None = None
+    # Parallel connections (REST) or channels (gRPC) to Qdrant.
+    pool_size: int | None = None
+    # Embedded Qdrant: a storage directory, or ":memory:"; overrides the host.
+    path: str | None = None
+    # Unix socket of a local Qdrant server's REST API; overrides the host.
+    unix_socket: str | None = None
+    # Payload fields returned with search hits (besides the text); all if None.
+    payload_fields: tuple[str, ...] | None = None
+    # MMR relevance/diversity trade-off (1 = relevance only); off if None.
+    mmr_lambda: float | None = None
+    # Candidates fetched with their vectors for MMR to choose from.
+    mmr_candidates: int = 20
+    # Max SimHash Hamming distance of near-duplicates; no dedup if None.
+    near_duplicate_distance: int | None = None
+    # Characters per embedded child chunk; whole documents are embedded if None.
+    child_chunk_size: int | None = None
+    child_chunk_overlap: int = 64
+    # Maximum characters of a parent section returned for its children.
+    parent_max_chars: int = 6000
+    # File (in the data directory) storing the parent sections.
+    parent_store: str = "parents.sqlite3"
 
     @staticmethod
     def load(retriever_config: dict[str, Any]) -> "RetrieverConfig":
@@ -20,4 +46,22 @@ class RetrieverConfig:
             vector_size=retriever_config["vector_size"],
             host=retriever_config["host"],
             port=retriever_config["port"],
+            prefer_grpc=retriever_config.get("prefer_grpc", False),
+            grpc_port=retriever_config.get("grpc_port", 6334),
+            timeout=retriever_config.get("timeout"),
+            pool_size=retriever_config.get("pool_size"),
+            path=retriever_config.get("path"),
+            unix_socket=retriever_config.get("unix_socket"),
+            payload_fields=(
+                tuple(retriever_config["payload_fields"])
+                if "payload_fields" in retriever_config
+                else None
+            ),
+            mmr_lambda=retriever_config.get("mmr_lambda"),
+            mmr_candidates=retriever_config.get("mmr_candidates", 20),
+            near_duplicate_distance=retriever_config.get("near_duplicate_distance"),
+            child_chunk_size=retriever_config.get("child_chunk_size"),
+            child_chunk_overlap=retriever_config.get("child_chunk_overlap", 64),
+            parent_max_chars=retriever_config.get("parent_max_chars", 6000),
+            parent_store=retriever_config.get("parent_store", "parents.sqlite3"),
         )
@@ -0,0 +1,161 @@
+"""
+Adaptive Cutoff
+
+This module decides how many retrieved documents reach the responder instead
+of always passing a fixed top-K. Hits are searched up to `max_k`, and the
+list is cut:
+
+- below an absolute score (`min_score`, applied by Qdrant as the search's
+  `score_threshold`)
+- below a fraction of the best hit's score (`relative_threshold`)
+- after the largest drop between consecutive scores, if that "elbow" is at
+  least `elbow_gap`
+- once the documents' estimated tokens exceed `max_context_tokens`
+
+At least `min_k` hits are always kept. The resulting `CutoffDecision` is
+returned in the chat response metadata.
+"""
+
+import math
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from flare_ai_rag.retriever.hits import SearchHit
+
+# Rough characters per token of English documentation, for the token cap.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text without a tokenizer."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass(frozen=True)
+class CutoffConfig:
+    max_k: int = 5
+    min_k: int = 1
+    min_score: float | None = None
+    relative_threshold: float | None = None
+    elbow_gap: float | None = None
+    max_context_tokens: int | None = None
+
+    @staticmethod
+    def load(cutoff_config: dict[str, Any]) -> "CutoffConfig":
+        """Loads the cutoff config."""
+        return CutoffConfig(
+            max_k=cutoff_config.get("max_k", 5),
+            min_k=cutoff_config.get("min_k", 1),
+            min_score=cutoff_config.get("min_score"),
+            relative_threshold=cutoff_config.get("relative_threshold"),
+            elbow_gap=cutoff_config.get("elbow_gap"),
+            max_context_tokens=cutoff_config.get("max_context_tokens"),
+        )
+
+
+@dataclass(slots=True)
+class CutoffDecision:
+    """
+    Where and why a list of hits was cut.
+
+    Attributes:
+        candidates (int): Hits returned by the search
+        kept (int): Hits passed to the responder
+        reason (str): Rule that ended the list: "max_k", "min_score",
+            "relative_threshold", "elbow", "max_context_tokens", or
+            "exhausted" if the search returned fewer than `max_k` hits
+        last_score (float | None): Score of the last kept hit
+        context_tokens (int): Estimated tokens of the kept documents
+    """
+
+    candidates: int
+    kept: int
+    reason: str
+    last_score: float | None = None
+    context_tokens: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the decision for the response metadata."""
+        return asdict(self)
+
+
+class AdaptiveCutoff:
+    """
+    Cuts retrieved hits by score and by context size.
+
+    Attributes:
+        config (CutoffConfig): Thresholds of the cutoff policy
+    """
+
+    def __init__(self, config: CutoffConfig) -> None:
+        self.config = config
+
+    def by_score(
+        self, hits: list[SearchHit], limit: int | None = None
+    ) -> tuple[list[SearchHit], CutoffDecision]:
+        """
+        Cut hits (best first) by relative score and score elbow.
+
+        Scores below `min_score` are expected to be filtered by the search.
+
+        :param hits: Hits in search order.
+        :param limit: Number of hits that were searched for; `max_k` if None
+            (a rerank stage searches for more candidates).
+        """
+        config = self.config
+        limit = config.max_k if limit is None else limit
+        if len(hits) >= limit:
+            reason = "max_k"
+        else:
+            reason = "min_score" if config.min_score is not None else "exhausted"
+        kept = hits[:limit]
+
+        if config.relative_threshold is not None and kept:
+            floor = kept[0].score * config.relative_threshold
+            above = [hit for hit in kept if hit.score >= floor]
+            if len(above) < len(kept):
+                kept, reason = above, "relative_threshold"
+
+        if config.elbow_gap is not None and len(kept) > config.min_k:
+            gaps = [
+                kept[idx - 1].score - kept[idx].score
+                for idx in range(config.min_k, len(kept))
+            ]
+            largest = max(range(len(gaps)), key=gaps.__getitem__)
+            if gaps[largest] >= config.elbow_gap:
+                kept, reason = kept[: config.min_k + largest], "elbow"
+
+        kept = kept if len(kept) >= config.min_k else hits[: config.min_k]
+        return kept, CutoffDecision(
+            candidates=len(hits),
+            kept=len(kept),
+            reason=reason,
+            last_score=kept[-1].score if kept else None,
+        )
+
+    def by_tokens(
+        self, hits: list[SearchHit], decision: CutoffDecision
+    ) -> list[SearchHit]:
+        """
+        Keep hits (with their text set) until the context token cap is reached.
+
+        :param hits: Hits in the order they are passed to the responder.
+        :param decision: Decision of `by_score`, updated in place.
+        """
+        kept: list[SearchHit] = []
+        tokens = 0
+        for hit in hits:
+            hit_tokens = estimate_tokens(hit.text or "")
+            if (
+                self.config.max_context_tokens is not None
+                and len(kept) >= self.config.min_k
+                and tokens + hit_tokens > self.config.max_context_tokens
+            ):
+                decision.reason = "max_context_tokens"
+                break
+            kept.append(hit)
+            tokens += hit_tokens
+        decision.kept = len(kept)
+        decision.last_score = kept[-1].score if kept else None
+        decision.context_tokens = tokens
+        return kept
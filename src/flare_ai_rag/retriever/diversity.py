@@ -0,0 +1,200 @@
+"""
+Result Diversity
+
+This module keeps redundant documents out of the responder's context:
+
+- `simhash` fingerprints a text so near-identical pages (versioned docs,
+  copied READMEs) can be detected by the Hamming distance of two 64-bit
+  integers. Fingerprints are computed at ingest and stored in the payload, so
+  query-time detection needs neither the text nor another request.
+- `NearDuplicateDetector` is an LSH index over fingerprints used to collapse
+  near-duplicates during ingestion, reporting the outcome in a `DedupReport`.
+- `mmr` selects a relevant but diverse subset of candidates with maximal
+  marginal relevance, vectorized over the candidate vectors.
+"""
+
+import hashlib
+import itertools
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+SIMHASH_BITS = 64
+# Number of consecutive words hashed together as one SimHash feature.
+SHINGLE_SIZE = 3
+
+_WORD = re.compile(r"\w+")
+_BIT_POSITIONS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+
+def _shingle_hashes(text: str) -> npt.NDArray[np.uint64]:
+    words = _WORD.findall(text.casefold())
+    if len(words) < SHINGLE_SIZE:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [
+            " ".join(words[idx : idx + SHINGLE_SIZE])
+            for idx in range(len(words) - SHINGLE_SIZE + 1)
+        ]
+    return np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest())
+            for s in shingles
+        ),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+
+
+def simhash(text: str) -> int:
+    """
+    Return the 64-bit SimHash of a text as a signed integer.
+
+    The value is signed so it fits Qdrant's integer payload type; compare
+    fingerprints with `hamming_distance`.
+    """
+    hashes = _shingle_hashes(text)
+    bits = (hashes[:, None] >> _BIT_POSITIONS) & np.uint64(1)
+    votes = 2 * bits.sum(axis=0, dtype=np.int64) - len(hashes)
+    fingerprint = int(
+        np.bitwise_or.reduce(
+            np.left_shift(np.uint64(1), _BIT_POSITIONS[votes > 0]),
+            initial=np.uint64(0),
+        )
+    )
+    return fingerprint - (1 << SIMHASH_BITS) if fingerprint >= 1 << 63 else fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two SimHash fingerprints."""
+    return ((a ^ b) & ((1 << SIMHASH_BITS) - 1)).bit_count()
+
+
+class NearDuplicateDetector:
+    """
+    Remembers fingerprints and flags texts close to one already seen.
+
+    Fingerprints are split into `max_distance + 1` bands and bucketed by each
+    band. Two fingerprints within `max_distance` bits must agree on at least
+    one band, so only fingerprints sharing a bucket are compared and lookups
+    stay fast on large corpora.
+
+    Attributes:
+        max_distance (int): Maximum Hamming distance of near-duplicates
+    """
+
+    def __init__(self, max_distance: int = 3) -> None:
+        self.max_distance = max_distance
+        bands = min(max_distance + 1, SIMHASH_BITS)
+        bounds = [SIMHASH_BITS * band // bands for band in range(bands + 1)]
+        self._bands = [
+            (start, (1 << (end - start)) - 1)
+            for start, end in itertools.pairwise(bounds)
+        ]
+        self._buckets: list[dict[int, list[tuple[int, Any]]]] = [
+            {} for _ in self._bands
+        ]
+
+    def _band_values(self, fingerprint: int) -> list[int]:
+        return [(fingerprint >> start) & mask for start, mask in self._bands]
+
+    def find(self, fingerprint: int) -> Any | None:
+        """Return the key of a previously added near-duplicate, if any."""
+        for buckets, value in zip(
+            self._buckets, self._band_values(fingerprint), strict=True
+        ):
+            for seen, key in buckets.get(value, ()):
+                if hamming_distance(fingerprint, seen) <= self.max_distance:
+                    return key
+        return None
+
+    def add(self, fingerprint: int, key: Any) -> None:
+        """Remember a fingerprint under a key (e.g. a point ID)."""
+        for buckets, value in zip(
+            self._buckets, self._band_values(fingerprint), strict=True
+        ):
+            buckets.setdefault(value, []).append((fingerprint, key))
+
+
+@dataclass(slots=True)
+class DedupReport:
+    """
+    Outcome of collapsing near-duplicates during an ingestion run.
+
+    Attributes:
+        documents (int): Documents (or chunks) seen
+        duplicates (int): Near-duplicates merged into an earlier point
+        merged (dict): Point ID to all source references, for the points
+            that absorbed duplicates
+    """
+
+    documents: int = 0
+    duplicates: int = 0
+    merged: dict[Any, list[str]] = field(default_factory=dict)
+
+    @property
+    def ratio(self) -> float:
+        """Fraction of documents collapsed into another point."""
+        return self.duplicates / self.documents if self.documents else 0.0
+
+    def merge(self, point_id: Any, kept_source: str, source: str) -> None:
+        """Record `source` as another reference of the point `point_id`."""
+        self.duplicates += 1
+        self.merged.setdefault(point_id, [kept_source]).append(source)
+
+    def summary(self) -> dict[str, int | float]:
+        """Return the counts for logging."""
+        return {
+            "documents": self.documents,
+            "unique": self.documents - self.duplicates,
+            "duplicates": self.duplicates,
+            "dedup_ratio": round(self.ratio, 4),
+        }
+
+
+def mmr(
+    query_vector: npt.ArrayLike,
+    candidate_vectors: npt.ArrayLike,
+    k: int,
+    lambda_mult: float = 0.5,
+) -> list[int]:
+    """
+    Select `k` candidates by maximal marginal relevance.
+
+    Each step picks the candidate maximizing
+    `lambda_mult * sim(query, c) - (1 - lambda_mult) * max sim(c, selected)`
+    using cosine similarity, so `lambda_mult=1` is plain relevance ranking and
+    lower values trade relevance for diversity.
+
+    :param query_vector: The query embedding.
+    :param candidate_vectors: One embedding per candidate (rows).
+    :param k: Number of candidates to select.
+    :param lambda_mult: Relevance/diversity trade-off in [0, 1].
+    :return: Indices of the selected candidates, in selection order.
+    """
+    candidates = np.asarray(candidate_vectors, dtype=np.float32)
+    if candidates.size == 0 or k <= 0:
+        return []
+    query = np.asarray(query_vector, dtype=np.float32)
+    candidates /= np.linalg.norm(candidates, axis=1, keepdims=True) + 1e-12
+    query /= np.linalg.norm(query) + 1e-12
+
+    relevance = candidates @ query
+    similarity = candidates @ candidates.T
+    selected = [int(np.argmax(relevance))]
+    # Highest similarity of each candidate to anything selected so far.
+    redundancy = similarity[selected[0]].copy()
+    available = np.ones(len(candidates), dtype=bool)
+    available[selected[0]] = False
+
+    while len(selected) < min(k, len(candidates)):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, similarity[best], out=redundancy)
+    return selected
@@ -0,0 +1,124 @@
+"""
+Document Sources
+
+This module streams the documents to index from disk. A `DocumentSource`
+yields lightweight `DocumentRecord`s one row at a time, so ingestion never
+materializes the whole corpus (or a DataFrame) in memory. CSV and JSONL are
+read with the standard library; Parquet needs the optional `pyarrow` package.
+"""
+
+import csv
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, override
+
+# Rows are read in batches of this size from Parquet files.
+PARQUET_BATCH_SIZE = 256
+# Largest CSV field accepted. Document bodies easily exceed the csv module's
+# default limit; the limit is a C long, which is 32 bits on Windows, so
+# sys.maxsize would overflow there.
+CSV_FIELD_SIZE_LIMIT = 2**31 - 1
+
+
+@dataclass(slots=True, frozen=True)
+class DocumentRecord:
+    """A single document row as stored in the docs files."""
+
+    file_name: str
+    meta_data: str
+    content: str | None
+    last_updated: str | None = None
+
+    @staticmethod
+    def from_row(row: Mapping[str, Any]) -> "DocumentRecord":
+        """Build a record from a row, treating empty content as missing."""
+        content = row.get("content")
+        last_updated = row.get("last_updated")
+        return DocumentRecord(
+            file_name=str(row["file_name"]),
+            meta_data=str(row.get("meta_data") or ""),
+            content=content if isinstance(content, str) and content else None,
+            last_updated=str(last_updated) if last_updated else None,
+        )
+
+
+class DocumentSource(ABC):
+    """A file of documents that can be streamed record by record."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[DocumentRecord]:
+        """Yield the documents in file order."""
+
+    def fingerprint(self) -> str:
+        """Return the SHA-256 of the underlying file, read in chunks."""
+        digest = hashlib.sha256()
+        with self.path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+
+class CsvDocumentSource(DocumentSource):
+    """Streams documents from a CSV file with a header row."""
+
+    @override
+    def __iter__(self) -> Iterator[DocumentRecord]:
+        csv.field_size_limit(CSV_FIELD_SIZE_LIMIT)
+        with self.path.open(newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                yield DocumentRecord.from_row(row)
+
+
+class JsonlDocumentSource(DocumentSource):
+    """Streams documents from a file with one JSON object per line."""
+
+    @override
+    def __iter__(self) -> Iterator[DocumentRecord]:
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield DocumentRecord.from_row(json.loads(line))
+
+
+class ParquetDocumentSource(DocumentSource):
+    """Streams documents from a Parquet file in record batches."""
+
+    @override
+    def __iter__(self) -> Iterator[DocumentRecord]:
+        try:
+            import pyarrow.parquet as pq  # noqa: PLC0415
+        except ImportError as e:
+            msg = "Reading Parquet documents requires the 'pyarrow' package"
+            raise ImportError(msg) from e
+        parquet_file = pq.ParquetFile(self.path)
+        for batch in parquet_file.iter_batches(batch_size=PARQUET_BATCH_SIZE):
+            for row in batch.to_pylist():
+                yield DocumentRecord.from_row(row)
+
+
+_SOURCES: dict[str, type[DocumentSource]] = {
+    ".csv": CsvDocumentSource,
+    ".jsonl": JsonlDocumentSource,
+    ".parquet": ParquetDocumentSource,
+}
+
+
+def open_document_source(path: Path) -> DocumentSource:
+    """
+    Return the document source for a file, chosen by its extension.
+
+    :param path: Path to a .csv, .jsonl or .parquet file.
+    :raises ValueError: If the file type is not supported.
+    """
+    source_cls = _SOURCES.get(path.suffix.lower())
+    if source_cls is None:
+        msg = f"Unsupported document file type: {path.suffix!r}"
+        raise ValueError(msg)
+    return source_cls(path)
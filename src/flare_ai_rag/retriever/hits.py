@@ -0,0 +1,55 @@
+"""
+Search Hits
+
+This module defines the lightweight result type returned by the retriever. A
+hit carries only the projected payload fields; its text can be left unset and
+fetched later for the hits the responder actually uses.
+"""
+
+from dataclasses import dataclass
+from typing import Any, cast
+
+from qdrant_client.http.models import ScoredPoint
+
+
+@dataclass(slots=True)
+class SearchHit:
+    """A retrieved document: point ID, score, metadata and (optional) text."""
+
+    id: int | str
+    score: float
+    metadata: dict[str, Any]
+    text: str | None = None
+    # SimHash fingerprint of the text, used to drop near-duplicate hits.
+    simhash: int | None = None
+    # Embedding of the document, only set when searched `with_vectors`.
+    vector: list[float] | None = None
+    # Parent section of a child chunk, whose text replaces the chunk's.
+    parent_id: str | None = None
+    # Collection the hit was found in.
+    collection: str | None = None
+
+    @staticmethod
+    def from_point(point: ScoredPoint) -> "SearchHit":
+        """Build a hit from a Qdrant point, splitting the text from the rest."""
+        payload = dict(point.payload or {})
+        text = payload.pop("text", None)
+        vector = None
+        if isinstance(point.vector, list):
+            # Collections are searched with one dense vector per point.
+            vector = cast("list[float]", point.vector)
+        # Qdrant may type UUID point IDs as `UUID`; hits carry them as strings.
+        point_id = point.id if isinstance(point.id, int) else str(point.id)
+        return SearchHit(
+            id=point_id,
+            score=point.score,
+            metadata=payload,
+            text=text,
+            simhash=payload.pop("simhash", None),
+            vector=vector,
+            parent_id=payload.pop("parent_id", None),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the hit in the document dict format used by the responders."""
+        return {"text": self.text or "", "score": self.score, "metadata": self.metadata}
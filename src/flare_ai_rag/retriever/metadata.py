@@ -0,0 +1,187 @@
+"""
+Document Metadata
+
+This module parses the Docusaurus-style frontmatter stored in the `meta_data`
+column of the docs files into typed fields, and turns filter expressions into
+Qdrant filters over those fields. The fields are stored as top-level payload
+keys with payload indexes, so filtered searches are resolved by Qdrant
+instead of post-filtering results in Python.
+
+Filter expressions map a payload field to:
+
+- a value, matched exactly (`{"slug": "intro"}`); for `title` the value is
+  matched as full text
+- a list of values, matching any of them (`{"keywords": ["ftso", "fdc"]}`)
+- a dict with `gt`/`gte`/`lt`/`lte` bounds, for `last_updated` and
+  `sidebar_position` (`{"last_updated": {"gte": "2025-01-01"}}`)
+"""
+
+import re
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from pydantic import ValidationError
+from qdrant_client.http.models import (
+    Condition,
+    DatetimeRange,
+    FieldCondition,
+    Filter,
+    MatchAny,
+    MatchText,
+    MatchValue,
+    PayloadSchemaType,
+    Range,
+)
+
+# Indexed payload fields and their Qdrant index types.
+PAYLOAD_INDEXES: dict[str, PayloadSchemaType] = {
+    "title": PayloadSchemaType.TEXT,
+    "slug": PayloadSchemaType.KEYWORD,
+    "keywords": PayloadSchemaType.KEYWORD,
+    "tags": PayloadSchemaType.KEYWORD,
+    "category": PayloadSchemaType.KEYWORD,
+    "last_updated": PayloadSchemaType.DATETIME,
+    "sidebar_position": PayloadSchemaType.INTEGER,
+    "document_id": PayloadSchemaType.INTEGER,
+}
+
+_KEY_LINE = re.compile(r"^([A-Za-z_][\w-]*):\s*(.*)$")
+_RANGE_KEYS = frozenset({"gt", "gte", "lt", "lte"})
+_RANGE_INDEXES = frozenset({PayloadSchemaType.DATETIME, PayloadSchemaType.INTEGER})
+# Tags describing the reader's level rather than the topic of a document.
+_LEVEL_TAGS = frozenset({"beginner", "intermediate", "advanced"})
+
+
+@dataclass(slots=True, frozen=True)
+class DocumentMetadata:
+    """Typed fields parsed from a document's frontmatter."""
+
+    title: str | None = None
+    slug: str | None = None
+    description: str | None = None
+    keywords: tuple[str, ...] = ()
+    tags: tuple[str, ...] = ()
+    category: str | None = None
+    sidebar_position: int | None = None
+    last_updated: str | None = None
+
+    def payload(self) -> dict[str, Any]:
+        """Return the fields to store in the point payload (unset ones omitted)."""
+        return {
+            key: list(value) if isinstance(value, tuple) else value
+            for key, value in asdict(self).items()
+            if value not in (None, ())
+        }
+
+
+def _parse_list(value: str) -> tuple[str, ...]:
+    items = (item.strip().strip("\"'") for item in value.strip("[]").split(","))
+    return tuple(item for item in items if item)
+
+
+def _is_open_list(value: str) -> bool:
+    """Whether a value is empty or an unterminated `[...]` list."""
+    return not value or (value.startswith("[") and "]" not in value)
+
+
+def _parse_frontmatter(meta_data: str) -> dict[str, str]:
+    """Split frontmatter into raw values, joining multi-line `[...]` lists."""
+    fields: dict[str, str] = {}
+    key: str | None = None
+    for line in meta_data.splitlines():
+        match = _KEY_LINE.match(line)
+        if match:
+            key, value = match.groups("")
+            fields[key] = value.strip()
+        elif key is not None and line.strip() and _is_open_list(fields[key]):
+            fields[key] = f"{fields[key]} {line.strip()}".strip()
+    return fields
+
+
+def _parse_timestamp(value: str | None) -> str | None:
+    """Normalize a timestamp to RFC 3339 (UTC) for the datetime index."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.isoformat()
+
+
+def parse_metadata(meta_data: str, last_updated: str | None = None) -> DocumentMetadata:
+    """
+    Parse a document's frontmatter into typed metadata.
+
+    The category is the frontmatter `category` if present and otherwise the
+    document's first topical tag (skipping level tags such as "intermediate").
+
+    :param meta_data: Raw frontmatter from the `meta_data` column.
+    :param last_updated: Value of the `last_updated` column, if any.
+    :return: The parsed metadata; missing or malformed fields are left unset.
+    """
+    fields = _parse_frontmatter(meta_data)
+    tags = _parse_list(fields.get("tags", ""))
+    topics = [tag for tag in tags if tag not in _LEVEL_TAGS]
+    position = fields.get("sidebar_position", "")
+    return DocumentMetadata(
+        title=fields.get("title") or None,
+        slug=fields.get("slug") or None,
+        description=fields.get("description") or None,
+        keywords=_parse_list(fields.get("keywords", "")),
+        tags=tags,
+        category=fields.get("category") or (topics[0] if topics else None),
+        sidebar_position=int(position) if position.isdigit() else None,
+        last_updated=_parse_timestamp(last_updated),
+    )
+
+
+def _condition(field: str, value: Any) -> FieldCondition:
+    index = PAYLOAD_INDEXES[field]
+    if isinstance(value, Mapping):
+        if index not in _RANGE_INDEXES:
+            msg = f"Cannot filter {field!r} on a range"
+            raise ValueError(msg)
+        unknown = set(value) - _RANGE_KEYS
+        if unknown:
+            msg = f"Unknown range operators filtering {field!r}: {sorted(unknown)}"
+            raise ValueError(msg)
+        if index == PayloadSchemaType.DATETIME:
+            return FieldCondition(key=field, range=DatetimeRange(**value))
+        return FieldCondition(key=field, range=Range(**value))
+    if isinstance(value, list | tuple | set):
+        return FieldCondition(key=field, match=MatchAny(any=list(value)))
+    if index == PayloadSchemaType.TEXT:
+        return FieldCondition(key=field, match=MatchText(text=value))
+    return FieldCondition(key=field, match=MatchValue(value=value))
+
+
+def build_filter(filters: Mapping[str, Any] | Filter | None) -> Filter | None:
+    """
+    Convert a filter expression into a Qdrant filter (all conditions must hold).
+
+    :param filters: A mapping of payload field to expression, or a ready-made
+        Qdrant `Filter`, which is passed through unchanged.
+    :raises ValueError: If a field is not an indexed payload field, or its
+        expression is not one the field supports.
+    """
+    if filters is None or isinstance(filters, Filter):
+        return filters
+    unknown = set(filters) - PAYLOAD_INDEXES.keys()
+    if unknown:
+        msg = f"Cannot filter on unindexed fields: {sorted(unknown)}"
+        raise ValueError(msg)
+    try:
+        conditions: list[Condition] = [
+            _condition(field, value) for field, value in filters.items()
+        ]
+    except ValidationError as e:
+        # Report malformed values as plain errors, not as model validation.
+        details = "; ".join(error["msg"] for error in e.errors())
+        msg = f"Invalid filter values: {details}"
+        raise ValueError(msg) from None
+    return Filter(must=conditions)
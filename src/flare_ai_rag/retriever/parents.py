@@ -0,0 +1,154 @@
+"""
+Parent Documents
+
+This module implements small-to-big retrieval. Each document is split into
+parent sections at its Markdown headings, and each section into small,
+overlapping child chunks. Only the children are embedded and searched; every
+child's payload points to its parent section, whose text lives in a local
+`ParentStore` instead of the vector payloads. Search hits are then expanded
+to their (deduplicated) parent sections before they reach the responder.
+"""
+
+import re
+import sqlite3
+import threading
+import zlib
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+_HEADING = re.compile(r"^#{1,3} ", re.MULTILINE)
+
+
+@dataclass(slots=True, frozen=True)
+class ParentSection:
+    """A section of a document, the unit passed to the responder."""
+
+    id: str
+    file_name: str
+    text: str
+
+
+def split_sections(text: str, max_chars: int) -> list[str]:
+    """
+    Split a Markdown document at its level 1-3 headings.
+
+    Sections longer than `max_chars` are split further at paragraph breaks
+    (or hard-wrapped if a single paragraph is longer).
+    """
+    starts = [0, *(m.start() for m in _HEADING.finditer(text) if m.start())]
+    sections = [
+        text[start:end].strip()
+        for start, end in zip(starts, [*starts[1:], len(text)], strict=True)
+    ]
+    parts: list[str] = []
+    for section in filter(None, sections):
+        current = ""
+        for paragraph in section.split("\n\n"):
+            if current and len(current) + len(paragraph) + 2 > max_chars:
+                parts.append(current)
+                current = ""
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+            while len(current) > max_chars:
+                parts.append(current[:max_chars])
+                current = current[max_chars:]
+        if current:
+            parts.append(current)
+    return parts
+
+
+def split_chunks(text: str, size: int, overlap: int) -> Iterator[str]:
+    """
+    Split text into chunks of about `size` characters overlapping by `overlap`.
+
+    Chunks end at whitespace when there is any in their second half.
+    """
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            space = text.rfind(" ", start + size // 2, end)
+            end = space if space > start else end
+        chunk = text[start:end].strip()
+        if chunk:
+            yield chunk
+        if end == len(text):
+            return
+        start = max(end - overlap, start + 1)
+
+
+class ParentStore:
+    """
+    SQLite store of parent sections, with zlib-compressed text.
+
+    The store is written once while indexing and read on every search, from
+    any worker process.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS parents ("
+                "id TEXT PRIMARY KEY, file_name TEXT NOT NULL, text BLOB NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def put_many(self, sections: Iterable[ParentSection]) -> None:
+        """Insert or replace parent sections."""
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO parents VALUES (?, ?, ?)",
+                ((s.id, s.file_name, zlib.compress(s.text.encode())) for s in sections),
+            )
+
+    def get_many(self, ids: Iterable[str]) -> dict[str, ParentSection]:
+        """Return the stored sections among `ids`, keyed by ID."""
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return {}
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT id, file_name, text FROM parents "  # noqa: S608
+                f"WHERE id IN ({', '.join('?' * len(ids))})",
+                ids,
+            )
+            .fetchall()
+        )
+        return {
+            row[0]: ParentSection(row[0], row[1], zlib.decompress(row[2]).decode())
+            for row in rows
+        }
+
+    def clear(self) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM parents")
+
+    def copy_from(self, path: Path) -> None:
+        """Replace the contents of the store with another store file."""
+        source = sqlite3.connect(path)
+        try:
+            source.backup(self._connection())
+        finally:
+            source.close()
+
+    def close(self) -> None:
+        """Checkpoint the write-ahead log and close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.close()
+            self._local.conn = None
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM parents").fetchone()[0]
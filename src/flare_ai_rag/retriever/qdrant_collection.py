@@ -1,16 +1,42 @@
+import itertools
+from collections.abc import Iterable, Iterator
+from typing import Any
+
 import google.api_core.exceptions
-import pandas as pd
 import structlog
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, PointStruct, VectorParams
+from qdrant_client.http.models import (
+    Distance,
+    FieldCondition,
+    Filter,
+    MatchValue,
+    PointStruct,
+    VectorParams,
+)
 
 from flare_ai_rag.ai import EmbeddingTaskType, GeminiEmbedding
 from flare_ai_rag.retriever.config import RetrieverConfig
+from flare_ai_rag.retriever.diversity import (
+    DedupReport,
+    NearDuplicateDetector,
+    simhash,
+)
+from flare_ai_rag.retriever.documents import DocumentRecord
+from flare_ai_rag.retriever.metadata import PAYLOAD_INDEXES, parse_metadata
+from flare_ai_rag.retriever.parents import (
+    ParentSection,
+    ParentStore,
+    split_chunks,
+    split_sections,
+)
 
 logger = structlog.get_logger(__name__)
 
+# Points are upserted in batches so the whole corpus is never held in memory.
+UPSERT_BATCH_SIZE = 256
+
 
-def _create_collection(
+def create_collection(
     client: QdrantClient, collection_name: str, vector_size: int
 ) -> None:
     """
@@ -24,85 +50,249 @@ def _create_collection(
     )
 
 
-def generate_collection(
-    df_docs: pd.DataFrame,
-    qdrant_client: QdrantClient,
+def create_payload_indexes(client: QdrantClient, collection_name: str) -> None:
+    """
+    Creates the payload indexes used by filtered searches.
+    :param collection_name: Name of the collection.
+    """
+    for field_name, field_schema in PAYLOAD_INDEXES.items():
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=field_schema,
+        )
+
+
+def upsert_points(
+    client: QdrantClient, collection_name: str, points: Iterable[PointStruct]
+) -> int:
+    """
+    Upserts points into a collection in batches.
+    :param collection_name: Name of the collection.
+    :param points: Points to insert, consumed lazily.
+    :return: Number of points inserted.
+    """
+    num_points = 0
+    for batch in itertools.batched(points, UPSERT_BATCH_SIZE):
+        client.upsert(collection_name=collection_name, points=list(batch))
+        num_points += len(batch)
+    return num_points
+
+
+def _embed(
+    text: str,
+    file_name: str,
     retriever_config: RetrieverConfig,
     embedding_client: GeminiEmbedding,
-) -> None:
-    """Routine for generating a Qdrant collection for a specific CSV file type."""
-    _create_collection(
-        qdrant_client, retriever_config.collection_name, retriever_config.vector_size
-    )
-    logger.info(
-        "Created the collection.", collection_name=retriever_config.collection_name
-    )
+) -> list[float] | None:
+    """Embed a document (or chunk), returning None if it cannot be encoded."""
+    try:
+        return embedding_client.embed_content(
+            embedding_model=retriever_config.embedding_model,
+            task_type=EmbeddingTaskType.RETRIEVAL_DOCUMENT,
+            contents=text,
+            title=file_name,
+        )
+    except google.api_core.exceptions.InvalidArgument as e:
+        # Check if it's the known "Request payload size exceeds the limit" error
+        # If so, downgrade it to a warning
+        if "400 Request payload size exceeds the limit" in str(e):
+            logger.warning(
+                "Skipping document due to size limit.",
+                filename=file_name,
+            )
+            return None
+        # Log the full traceback for other InvalidArgument errors
+        logger.exception(
+            "Error encoding document (InvalidArgument).",
+            filename=file_name,
+        )
+        return None
+    except Exception:
+        # Log the full traceback for any other errors
+        logger.exception(
+            "Error encoding document (general).",
+            filename=file_name,
+        )
+        return None
+
 
-    points = []
-    for idx, (_, row) in enumerate(
-        df_docs.iterrows(), start=1
-    ):  # Using _ for unused variable
-        content = row["content"]
+def _child_points(
+    sections: list[ParentSection],
+    payload: dict[str, Any],
+    retriever_config: RetrieverConfig,
+    embedding_client: GeminiEmbedding,
+) -> Iterator[tuple[list[float], dict[str, Any]]]:
+    """Embed the child chunks of a document's parent sections."""
+    for section in sections:
+        for chunk in split_chunks(
+            section.text,
+            retriever_config.child_chunk_size or len(section.text),
+            retriever_config.child_chunk_overlap,
+        ):
+            embedding = _embed(
+                chunk, section.file_name, retriever_config, embedding_client
+            )
+            if embedding is not None:
+                yield (
+                    embedding,
+                    {
+                        **payload,
+                        "text": chunk,
+                        "simhash": simhash(chunk),
+                        "parent_id": section.id,
+                    },
+                )
+
+
+def embed_documents(
+    documents: Iterable[DocumentRecord],
+    retriever_config: RetrieverConfig,
+    embedding_client: GeminiEmbedding,
+    report: DedupReport | None = None,
+    parent_store: ParentStore | None = None,
+) -> Iterator[PointStruct]:
+    """
+    Embed documents one by one, skipping those that cannot be encoded.
 
-        if not isinstance(content, str):
+    With `near_duplicate_distance` set, documents whose SimHash is within that
+    distance of an already embedded one are not embedded again; they are
+    recorded in `report` as another source of the earlier point instead.
+
+    With `child_chunk_size` set, each document's sections are written to
+    `parent_store` and their small child chunks are embedded as the points.
+    """
+    if retriever_config.child_chunk_size is not None and parent_store is None:
+        msg = "Embedding child chunks requires a parent store"
+        raise ValueError(msg)
+    report = report if report is not None else DedupReport()
+    max_distance = retriever_config.near_duplicate_distance
+    detector = NearDuplicateDetector(max_distance) if max_distance is not None else None
+    file_names: dict[int, str] = {}
+    point_ids = itertools.count(1)
+    for idx, doc in enumerate(documents, start=1):
+        content = doc.content
+
+        if content is None:
             logger.warning(
                 "Skipping document due to missing or invalid content.",
-                filename=row["file_name"],
+                filename=doc.file_name,
             )
             continue
 
-        try:
-            embedding = embedding_client.embed_content(
-                embedding_model=retriever_config.embedding_model,
-                task_type=EmbeddingTaskType.RETRIEVAL_DOCUMENT,
-                contents=content,
-                title=str(row["file_name"]),
-            )
-        except google.api_core.exceptions.InvalidArgument as e:
-            # Check if it's the known "Request payload size exceeds the limit" error
-            # If so, downgrade it to a warning
-            if "400 Request payload size exceeds the limit" in str(e):
-                logger.warning(
-                    "Skipping document due to size limit.",
-                    filename=row["file_name"],
+        report.documents += 1
+        fingerprint = simhash(content)
+        if detector is not None:
+            duplicate_of = detector.find(fingerprint)
+            if duplicate_of is not None:
+                report.merge(duplicate_of, file_names[duplicate_of], doc.file_name)
+                logger.debug(
+                    "Merged near-duplicate document.",
+                    filename=doc.file_name,
+                    duplicate_of=file_names[duplicate_of],
                 )
                 continue
-            # Log the full traceback for other InvalidArgument errors
-            logger.exception(
-                "Error encoding document (InvalidArgument).",
-                filename=row["file_name"],
-            )
-            continue
-        except Exception:
-            # Log the full traceback for any other errors
-            logger.exception(
-                "Error encoding document (general).",
-                filename=row["file_name"],
-            )
-            continue
 
         payload = {
-            "filename": row["file_name"],
-            "metadata": row["meta_data"],
-            "text": content,
+            "filename": doc.file_name,
+            "metadata": doc.meta_data,
+            "document_id": idx,
+            "sources": [doc.file_name],
+            **parse_metadata(doc.meta_data, doc.last_updated).payload(),
         }
+        if parent_store is None or retriever_config.child_chunk_size is None:
+            embedding = _embed(
+                content, doc.file_name, retriever_config, embedding_client
+            )
+            if embedding is None:
+                continue
+            points = [
+                PointStruct(
+                    id=idx,  # Using integer ID starting from 1
+                    vector=embedding,
+                    payload={**payload, "text": content, "simhash": fingerprint},
+                )
+            ]
+        else:
+            sections = [
+                ParentSection(f"{idx}-{number}", doc.file_name, text)
+                for number, text in enumerate(
+                    split_sections(content, retriever_config.parent_max_chars)
+                )
+            ]
+            parent_store.put_many(sections)
+            points = [
+                PointStruct(id=next(point_ids), vector=vector, payload=child_payload)
+                for vector, child_payload in _child_points(
+                    sections, payload, retriever_config, embedding_client
+                )
+            ]
+            if not points:
+                continue
 
-        point = PointStruct(
-            id=idx,  # Using integer ID starting from 1
-            vector=embedding,
-            payload=payload,
-        )
-        points.append(point)
+        if detector is not None:
+            detector.add(fingerprint, idx)
+            file_names[idx] = doc.file_name
+        yield from points
 
-    if points:
-        qdrant_client.upsert(
-            collection_name=retriever_config.collection_name,
-            points=points,
+
+def set_sources(
+    client: QdrantClient, collection_name: str, report: DedupReport
+) -> None:
+    """
+    Stores the source references of documents that absorbed near-duplicates.
+    :param collection_name: Name of the collection.
+    :param report: Report of the ingestion run that merged the duplicates.
+    """
+    for document_id, sources in report.merged.items():
+        client.set_payload(
+            collection_name=collection_name,
+            payload={"sources": sources},
+            points=Filter(
+                must=[
+                    FieldCondition(
+                        key="document_id", match=MatchValue(value=document_id)
+                    )
+                ]
+            ),
         )
+
+
+def generate_collection(
+    documents: Iterable[DocumentRecord],
+    qdrant_client: QdrantClient,
+    retriever_config: RetrieverConfig,
+    embedding_client: GeminiEmbedding,
+    parent_store: ParentStore | None = None,
+) -> DedupReport:
+    """Routine for generating a Qdrant collection from streamed documents."""
+    if parent_store is not None:
+        parent_store.clear()
+    create_collection(
+        qdrant_client, retriever_config.collection_name, retriever_config.vector_size
+    )
+    create_payload_indexes(qdrant_client, retriever_config.collection_name)
+    logger.info(
+        "Created the collection.", collection_name=retriever_config.collection_name
+    )
+
+    report = DedupReport()
+    num_points = upsert_points(
+        qdrant_client,
+        retriever_config.collection_name,
+        embed_documents(
+            documents, retriever_config, embedding_client, report, parent_store
+        ),
+    )
+    set_sources(qdrant_client, retriever_config.collection_name, report)
+    logger.info("Deduplicated documents.", **report.summary())
+
+    if num_points:
         logger.info(
             "Collection generated and documents inserted into Qdrant successfully.",
             collection_name=retriever_config.collection_name,
-            num_points=len(points),
+            num_points=num_points,
         )
     else:
         logger.warning("No valid documents found to insert.")
+    return report
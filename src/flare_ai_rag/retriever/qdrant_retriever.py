@@ -1,10 +1,21 @@
-from typing import override
+from collections.abc import Mapping
+from typing import Any, override
 
 from qdrant_client import QdrantClient
+from qdrant_client.http.models import Filter, PayloadSelectorExclude
 
 from flare_ai_rag.ai import EmbeddingTaskType, GeminiEmbedding
 from flare_ai_rag.retriever.base import BaseRetriever
 from flare_ai_rag.retriever.config import RetrieverConfig
+from flare_ai_rag.retriever.diversity import NearDuplicateDetector, mmr
+from flare_ai_rag.retriever.hits import SearchHit
+from flare_ai_rag.retriever.metadata import build_filter
+from flare_ai_rag.retriever.parents import ParentStore
+from flare_ai_rag.telemetry.pipeline import stage
+
+# Child chunks fetched per requested parent, as several children of one
+# parent are often among the best matches.
+CHILDREN_PER_PARENT = 3
 
 
 class QdrantRetriever(BaseRetriever):
@@ -13,48 +24,202 @@ class QdrantRetriever(BaseRetriever):
         client: QdrantClient,
         retriever_config: RetrieverConfig,
         embedding_client: GeminiEmbedding,
+        parent_store: ParentStore | None = None,
     ) -> None:
-        """Initialize the QdrantRetriever."""
+        """
+        Initialize the QdrantRetriever.
+
+        With a parent store, the collection holds child chunks and search
+        hits are expanded to their parent sections.
+        """
         self.client = client
         self.retriever_config = retriever_config
         self.embedding_client = embedding_client
+        self.parent_store = parent_store
 
-    @override
-    def semantic_search(self, query: str, top_k: int = 5) -> list[dict]:
+    def _payload_selector(
+        self, *, with_text: bool
+    ) -> list[str] | PayloadSelectorExclude | bool:
+        """Select the payload fields to return for each hit."""
+        fields = self.retriever_config.payload_fields
+        if self.parent_store is not None:
+            # The text of parents is read from the parent store instead.
+            with_text = False
+        if fields is not None:
+            if self.retriever_config.near_duplicate_distance is not None:
+                fields = (*fields, "simhash")
+            if self.parent_store is not None:
+                fields = (*fields, "parent_id")
+            return [*fields, "text"] if with_text else list(fields)
+        return True if with_text else PayloadSelectorExclude(exclude=["text"])
+
+    def embed_query(self, query: str) -> list[float]:
+        """Convert the query into a vector embedding using Gemini."""
+        with stage("embedding"):
+            return self.embedding_client.embed_content(
+                embedding_model=self.retriever_config.embedding_model,
+                contents=query,
+                task_type=EmbeddingTaskType.RETRIEVAL_QUERY,
+            )
+
+    def search(  # noqa: PLR0913
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Mapping[str, Any] | Filter | None = None,
+        *,
+        with_text: bool = True,
+        mmr_lambda: float | None = None,
+        score_threshold: float | None = None,
+        query_vector: list[float] | None = None,
+    ) -> list[SearchHit]:
         """
-        Perform semantic search by converting the query into a vector
-        and searching in Qdrant.
+        Search Qdrant, returning only the projected payload fields.
+
+        When MMR or near-duplicate removal is configured, `mmr_candidates`
+        hits are fetched (with their vectors for MMR), near-duplicates of
+        better hits are dropped and MMR picks a diverse top-K among the rest.
+        With a parent store, child chunks are searched and the hits collapse
+        to the top-K distinct parent sections, best child first.
 
         :param query: The input query.
         :param top_k: Number of top results to return.
-        :return: A list of dictionaries, each representing a retrieved document.
+        :param filters: Payload filter expression (see `retriever.metadata`)
+            or a Qdrant `Filter`, applied by Qdrant on the payload indexes.
+        :param with_text: Whether to fetch the document text with the hits.
+            Without it, call `fetch_text` on the hits that are actually used.
+        :param mmr_lambda: Overrides the configured MMR trade-off.
+        :param score_threshold: Minimum similarity score of returned hits.
+        :param query_vector: The query embedded with `embed_query`, if it was
+            already embedded (e.g. for another collection).
+        :return: The hits, best first.
         """
-        # Convert the query into a vector embedding using Gemini
-        query_vector = self.embedding_client.embed_content(
-            embedding_model="models/text-embedding-004",
-            contents=query,
-            task_type=EmbeddingTaskType.RETRIEVAL_QUERY,
-        )
+        config = self.retriever_config
+        if mmr_lambda is None:
+            mmr_lambda = config.mmr_lambda
+        diversify = mmr_lambda is not None or config.near_duplicate_distance is not None
+        limit = top_k
+        if self.parent_store is not None:
+            limit *= CHILDREN_PER_PARENT
+        if diversify:
+            limit = max(limit, config.mmr_candidates)
+
+        if query_vector is None:
+            query_vector = self.embed_query(query)
 
         # Search Qdrant for similar vectors.
-        results = self.client.search(
-            collection_name=self.retriever_config.collection_name,
-            query_vector=query_vector,
-            limit=top_k,
+        with stage("vector_search"):
+            results = self.client.query_points(
+                collection_name=self.retriever_config.collection_name,
+                query=query_vector,
+                query_filter=build_filter(filters),
+                limit=limit,
+                with_payload=self._payload_selector(with_text=with_text),
+                with_vectors=mmr_lambda is not None,
+                score_threshold=score_threshold,
+            ).points
+        hits = [SearchHit.from_point(point) for point in results]
+        for hit in hits:
+            hit.collection = config.collection_name
+
+        if config.near_duplicate_distance is not None:
+            hits = self._drop_near_duplicates(hits, config.near_duplicate_distance)
+        if mmr_lambda is not None:
+            k = len(hits) if self.parent_store is not None else top_k
+            hits = self._select_diverse(hits, query_vector, k, mmr_lambda)
+        if self.parent_store is not None:
+            hits = self._collapse_to_parents(hits)
+            if with_text:
+                self.fetch_text(hits[:top_k])
+        return hits[:top_k]
+
+    @staticmethod
+    def _collapse_to_parents(hits: list[SearchHit]) -> list[SearchHit]:
+        """Keep the best-ranked child hit of each parent section."""
+        parents: dict[str, SearchHit] = {}
+        for hit in hits:
+            key = hit.parent_id if hit.parent_id is not None else str(hit.id)
+            if key not in parents:
+                hit.text = None
+                parents[key] = hit
+        return list(parents.values())
+
+    @staticmethod
+    def _select_diverse(
+        hits: list[SearchHit], query_vector: list[float], k: int, mmr_lambda: float
+    ) -> list[SearchHit]:
+        """Pick `k` relevant yet diverse hits by MMR over their vectors."""
+        # Points stored without a vector cannot be ranked by MMR.
+        candidates = [(hit, hit.vector) for hit in hits if hit.vector is not None]
+        if not candidates:
+            return []
+        selected = mmr(
+            query_vector, [vector for _, vector in candidates], k, mmr_lambda
         )
+        return [candidates[idx][0] for idx in selected]
 
-        # Process and return results.
-        output = []
-        for hit in results:
-            if hit.payload:
-                text = hit.payload.get("text", "")
-                metadata = {
-                    field: value
-                    for field, value in hit.payload.items()
-                    if field != "text"
-                }
-            else:
-                text = ""
-                metadata = ""
-            output.append({"text": text, "score": hit.score, "metadata": metadata})
-        return output
+    @staticmethod
+    def _drop_near_duplicates(
+        hits: list[SearchHit], max_distance: int
+    ) -> list[SearchHit]:
+        """Keep only the best-scored hit of each group of near-duplicates."""
+        detector = NearDuplicateDetector(max_distance)
+        unique = []
+        for hit in hits:
+            if hit.simhash is not None:
+                if detector.find(hit.simhash) is not None:
+                    continue
+                detector.add(hit.simhash, hit.id)
+            unique.append(hit)
+        return unique
+
+    def fetch_text(self, hits: list[SearchHit]) -> list[SearchHit]:
+        """
+        Fill in the text of hits returned without it, in one request.
+
+        The text of a child chunk hit is that of its parent section.
+
+        :param hits: Hits from `search`; hits that already have text are kept.
+        :return: The same hits, with their text set.
+        """
+        children = [hit for hit in hits if hit.text is None and hit.parent_id]
+        if children and self.parent_store is not None:
+            sections = self.parent_store.get_many(
+                hit.parent_id for hit in children if hit.parent_id
+            )
+            for hit in children:
+                section = sections.get(hit.parent_id or "")
+                hit.text = section.text if section else ""
+        missing = {hit.id: hit for hit in hits if hit.text is None}
+        if missing:
+            points = self.client.retrieve(
+                collection_name=self.retriever_config.collection_name,
+                ids=list(missing),
+                with_payload=["text"],
+            )
+            for point in points:
+                point_id = point.id if isinstance(point.id, int) else str(point.id)
+                missing[point_id].text = (point.payload or {}).get("text", "")
+        return hits
+
+    @override
+    def semantic_search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Mapping[str, Any] | Filter | None = None,
+        score_threshold: float | None = None,
+    ) -> list[dict]:
+        """
+        Perform semantic search by converting the query into a vector
+        and searching in Qdrant.
+
+        :param query: The input query.
+        :param top_k: Number of top results to return.
+        :param filters: Payload filter expression (see `retriever.metadata`)
+            or a Qdrant `Filter`, applied by Qdrant on the payload indexes.
+        :param score_threshold: Minimum similarity score of returned documents.
+        :return: A list of dictionaries, each representing a retrieved document.
+        """
+        hits = self.search(query, top_k, filters, score_threshold=score_threshold)
+        return [hit.to_dict() for hit in hits]
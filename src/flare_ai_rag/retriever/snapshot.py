@@ -0,0 +1,288 @@
+"""
+Index Snapshots
+
+This module builds the document embeddings offline into a versioned snapshot
+directory and restores it into Qdrant at startup, so booting does not depend
+on the embedding API. A snapshot contains:
+
+- `vectors.npy`: the float32 embedding matrix, memory-mapped on restore
+- `payloads.jsonl`: the point ID and payload of every row of the matrix
+- `parents.sqlite3`: the parent sections, when child chunks are embedded
+- `manifest.json`: the snapshot format version, embedding model, vector size,
+  the hash of the source documents file and a hash per indexed document
+
+A snapshot is only restored when its manifest matches the current documents
+and retriever configuration; otherwise the collection is rebuilt.
+"""
+
+import hashlib
+import json
+import time
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, cast
+
+import numpy as np
+import structlog
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import PointStruct
+
+from flare_ai_rag.ai import GeminiEmbedding
+from flare_ai_rag.retriever.config import RetrieverConfig
+from flare_ai_rag.retriever.diversity import DedupReport
+from flare_ai_rag.retriever.documents import DocumentRecord, DocumentSource
+from flare_ai_rag.retriever.parents import ParentStore
+from flare_ai_rag.retriever.qdrant_collection import (
+    create_collection,
+    create_payload_indexes,
+    embed_documents,
+    upsert_points,
+)
+
+logger = structlog.get_logger(__name__)
+
+# Bumped whenever the layout of the snapshot or of its point payloads changes.
+SNAPSHOT_FORMAT_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.npy"
+PAYLOADS_FILE = "payloads.jsonl"
+PARENTS_FILE = "parents.sqlite3"
+
+
+class SnapshotError(RuntimeError):
+    """Raised when a snapshot directory is missing files or inconsistent."""
+
+
+@dataclass(frozen=True)
+class IndexManifest:
+    """Describes what a snapshot was built from."""
+
+    version: int
+    embedding_model: str
+    vector_size: int
+    source_sha256: str
+    num_points: int
+    documents: list[dict[str, Any]]
+    created_at: float
+    # Ingest-time near-duplicate threshold the snapshot was built with.
+    near_duplicate_distance: int | None = None
+    # Child chunk size, overlap and parent section size, if chunked.
+    chunking: list[int] | None = None
+
+    @staticmethod
+    def load(path: Path) -> "IndexManifest | None":
+        """
+        Read the manifest of a snapshot directory, if there is a usable one.
+
+        A manifest of another format version, or one that cannot be read,
+        counts as no snapshot.
+        """
+        manifest_path = path / MANIFEST_FILE
+        if not manifest_path.exists():
+            return None
+        try:
+            data = json.loads(manifest_path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning("Unreadable index snapshot manifest.", error=str(e))
+            return None
+        version = data.get("version") if isinstance(data, dict) else None
+        if version != SNAPSHOT_FORMAT_VERSION:
+            logger.warning("Index snapshot has another format.", version=version)
+            return None
+        known = {field.name for field in fields(IndexManifest)}
+        try:
+            return IndexManifest(**{k: v for k, v in data.items() if k in known})
+        except TypeError as e:
+            logger.warning("Incomplete index snapshot manifest.", error=str(e))
+            return None
+
+    def matches(self, documents: DocumentSource, config: RetrieverConfig) -> bool:
+        """Whether the snapshot was built from these documents and settings."""
+        return (
+            self.version == SNAPSHOT_FORMAT_VERSION
+            and self.embedding_model == config.embedding_model
+            and self.vector_size == config.vector_size
+            and self.near_duplicate_distance == config.near_duplicate_distance
+            and self.chunking == _chunking(config)
+            and self.source_sha256 == documents.fingerprint()
+        )
+
+
+def _chunking(config: RetrieverConfig) -> list[int] | None:
+    if config.child_chunk_size is None:
+        return None
+    return [
+        config.child_chunk_size,
+        config.child_chunk_overlap,
+        config.parent_max_chars,
+    ]
+
+
+def _content_hash(doc: DocumentRecord) -> str:
+    return hashlib.sha256((doc.content or "").encode()).hexdigest()
+
+
+def build_snapshot(
+    documents: DocumentSource,
+    retriever_config: RetrieverConfig,
+    embedding_client: GeminiEmbedding,
+    output_path: Path,
+) -> IndexManifest:
+    """
+    Embed every document and write the snapshot to `output_path`.
+
+    :param documents: The documents to index.
+    :param retriever_config: Embedding model and vector size to use.
+    :param embedding_client: Client used to embed the documents.
+    :param output_path: Snapshot directory, created if missing. With child
+        chunks, the parent sections are written to its parent store.
+    :return: The manifest of the written snapshot.
+    """
+    output_path.mkdir(parents=True, exist_ok=True)
+    # Drop the previous manifest first, so an interrupted rebuild never leaves
+    # it describing half-written files.
+    manifest_path = output_path / MANIFEST_FILE
+    manifest_path.unlink(missing_ok=True)
+    parent_store = None
+    if retriever_config.child_chunk_size is not None:
+        parent_store = ParentStore(output_path / PARENTS_FILE)
+        parent_store.clear()
+    hashes: dict[int, dict[str, Any]] = {}
+
+    def _tracked() -> Iterator[DocumentRecord]:
+        for idx, doc in enumerate(documents, start=1):
+            hashes[idx] = {"file_name": doc.file_name, "sha256": _content_hash(doc)}
+            yield doc
+
+    vectors: list[list[float]] = []
+    document_ids: dict[int, None] = {}
+    report = DedupReport()
+    points = embed_documents(
+        _tracked(), retriever_config, embedding_client, report, parent_store
+    )
+    with (output_path / PAYLOADS_FILE).open("w", encoding="utf-8") as f:
+        for point in points:
+            # `embed_documents` builds one dense vector per point.
+            vectors.append(cast("list[float]", point.vector))
+            payload = point.payload or {}
+            document_ids[payload["document_id"]] = None
+            f.write(json.dumps({"id": point.id, "payload": payload}) + "\n")
+    if parent_store is not None:
+        parent_store.close()
+    if report.merged:
+        _merge_sources(output_path, report)
+    logger.info("Deduplicated documents.", **report.summary())
+
+    matrix = np.asarray(vectors, dtype=np.float32).reshape(
+        -1, retriever_config.vector_size
+    )
+    np.save(output_path / VECTORS_FILE, matrix)
+
+    manifest = IndexManifest(
+        version=SNAPSHOT_FORMAT_VERSION,
+        embedding_model=retriever_config.embedding_model,
+        vector_size=retriever_config.vector_size,
+        source_sha256=documents.fingerprint(),
+        num_points=len(vectors),
+        documents=[{"id": idx, **hashes[idx]} for idx in document_ids],
+        created_at=time.time(),
+        near_duplicate_distance=retriever_config.near_duplicate_distance,
+        chunking=_chunking(retriever_config),
+    )
+    # The manifest is written last, atomically: a snapshot without one is
+    # never restored.
+    tmp_path = output_path / f"{MANIFEST_FILE}.tmp"
+    tmp_path.write_text(json.dumps(asdict(manifest), indent=2))
+    tmp_path.replace(manifest_path)
+    logger.info(
+        "Index snapshot written.", path=str(output_path), points=manifest.num_points
+    )
+    return manifest
+
+
+def _read_payloads(path: Path) -> Iterator[dict[str, Any]]:
+    with (path / PAYLOADS_FILE).open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                msg = f"Snapshot has a corrupt payload: {e}"
+                raise SnapshotError(msg) from e
+
+
+def _merge_sources(path: Path, report: DedupReport) -> None:
+    """Rewrite the payloads with the sources of merged near-duplicates."""
+    tmp_path = path / f"{PAYLOADS_FILE}.tmp"
+    with tmp_path.open("w", encoding="utf-8") as f:
+        for record in _read_payloads(path):
+            document_id = record["payload"]["document_id"]
+            if document_id in report.merged:
+                record["payload"]["sources"] = report.merged[document_id]
+            f.write(json.dumps(record) + "\n")
+    tmp_path.replace(path / PAYLOADS_FILE)
+
+
+def restore_snapshot(
+    snapshot_path: Path,
+    qdrant_client: QdrantClient,
+    retriever_config: RetrieverConfig,
+    parent_store: ParentStore | None = None,
+) -> int:
+    """
+    Recreate the collection from a snapshot without calling the embedding API.
+
+    :param snapshot_path: Snapshot directory written by `build_snapshot`.
+    :param qdrant_client: Client of the Qdrant server to restore into.
+    :param retriever_config: Collection name and vector size.
+    :param parent_store: Store receiving the snapshot's parent sections.
+    :return: Number of restored points.
+    :raises SnapshotError: If the vectors or payloads are unreadable or do
+        not line up, or the parent sections of a chunked snapshot are missing.
+    """
+    try:
+        vectors = np.load(snapshot_path / VECTORS_FILE, mmap_mode="r")
+    except (OSError, ValueError) as e:
+        msg = f"Snapshot vectors cannot be read: {e}"
+        raise SnapshotError(msg) from e
+    if vectors.shape[1:] != (retriever_config.vector_size,):
+        msg = f"Snapshot vectors have shape {vectors.shape}"
+        raise SnapshotError(msg)
+
+    def _points() -> Iterator[PointStruct]:
+        for row, record in enumerate(_read_payloads(snapshot_path)):
+            if row >= len(vectors):
+                msg = "Snapshot has more payloads than vectors"
+                raise SnapshotError(msg)
+            try:
+                point_id, payload = record["id"], record["payload"]
+            except (KeyError, TypeError) as e:
+                msg = f"Snapshot payload {row} is malformed"
+                raise SnapshotError(msg) from e
+            yield PointStruct(
+                id=point_id, vector=vectors[row].tolist(), payload=payload
+            )
+
+    if retriever_config.child_chunk_size is not None:
+        if parent_store is None or not (snapshot_path / PARENTS_FILE).exists():
+            msg = "Restoring child chunks requires the snapshot's parent sections"
+            raise SnapshotError(msg)
+        parent_store.copy_from(snapshot_path / PARENTS_FILE)
+
+    create_collection(
+        qdrant_client, retriever_config.collection_name, retriever_config.vector_size
+    )
+    create_payload_indexes(qdrant_client, retriever_config.collection_name)
+    num_points = upsert_points(
+        qdrant_client, retriever_config.collection_name, _points()
+    )
+    if num_points != len(vectors):
+        msg = f"Snapshot has {len(vectors)} vectors but {num_points} payloads"
+        raise SnapshotError(msg)
+    logger.info(
+        "Index snapshot restored.",
+        collection_name=retriever_config.collection_name,
+        points=num_points,
+    )
+    return num_points
@@ -1,13 +1,42 @@
-from .base import BaseQueryRouter
-from .config import RouterConfig
-from .prompts import ROUTER_INSTRUCTION, ROUTER_PROMPT
-from .router import GeminiRouter, QueryRouter
+from typing import TYPE_CHECKING
+
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .base import BaseQueryRouter, FallbackClassification
+    from .cache import CachedQueryRouter, RouterDecisionCache
+    from .classifier import FastPathClassifier, NearestCentroidClassifier
+    from .config import RouterConfig
+    from .prompts import ROUTER_INSTRUCTION, ROUTER_PROMPT
+    from .router import GeminiRouter, QueryRouter
 
 __all__ = [
     "ROUTER_INSTRUCTION",
     "ROUTER_PROMPT",
     "BaseQueryRouter",
+    "CachedQueryRouter",
+    "FallbackClassification",
+    "FastPathClassifier",
     "GeminiRouter",
+    "NearestCentroidClassifier",
     "QueryRouter",
     "RouterConfig",
+    "RouterDecisionCache",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "BaseQueryRouter": ".base",
+        "FallbackClassification": ".base",
+        "CachedQueryRouter": ".cache",
+        "RouterDecisionCache": ".cache",
+        "FastPathClassifier": ".classifier",
+        "NearestCentroidClassifier": ".classifier",
+        "RouterConfig": ".config",
+        "ROUTER_INSTRUCTION": ".prompts",
+        "ROUTER_PROMPT": ".prompts",
+        "GeminiRouter": ".router",
+        "QueryRouter": ".router",
+    },
+)
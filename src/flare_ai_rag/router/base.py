@@ -2,6 +2,17 @@ from abc import ABC, abstractmethod
 from typing import Any
 
 
+class FallbackClassification(str):
+    """
+    A classification substituted for invalid model output.
+
+    It compares equal to the plain option, so callers treat it as such;
+    callers memoizing decisions check for it and do not store it.
+    """
+
+    __slots__ = ()
+
+
 class BaseQueryRouter(ABC):
     """
     An abstract base class defining the interface for query routings.
@@ -13,7 +24,12 @@ class BaseQueryRouter(ABC):
         prompt: str,
         response_mime_type: str | None = None,
         response_schema: Any | None = None,
+        *,
+        user_input: str | None = None,
     ) -> str:
         """
         Determine the type of the query: ANSWER, CLARIFY, or REJECT.
+
+        `user_input` is the user's query `prompt` was formatted from, if
+        known; routers memoizing decisions key them on it.
         """
@@ -0,0 +1,247 @@
+"""
+Router Decision Cache
+
+This module memoizes routing decisions so repeated (FAQ-style) questions do
+not pay for an LLM classification call twice. Decisions are keyed by the
+router model ID and the normalized user query (or prompt), bounded by an LRU
+size limit and expired after a TTL. Hit/miss counters are kept for monitoring.
+
+When the API runs several worker processes, the in-memory LRU can be backed by
+a shared SQLite file so a decision made by one worker is reused by the others.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, override
+
+import structlog
+
+from flare_ai_rag.router.base import BaseQueryRouter, FallbackClassification
+
+logger = structlog.get_logger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = " \t\n.,;:!?\"'`"
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize text for cache lookups.
+
+    Case-folds, collapses runs of whitespace and strips surrounding
+    whitespace and punctuation, so "What is Flare?" and "what is  flare"
+    share a cache entry.
+    """
+    return _WHITESPACE.sub(" ", text.casefold()).strip(_EDGE_PUNCTUATION)
+
+
+class SharedDecisionStore:
+    """
+    SQLite-backed decision store shared between worker processes.
+
+    Expiry uses wall-clock time since monotonic clocks are not comparable
+    across processes. Entries are pruned lazily on write.
+    """
+
+    def __init__(self, path: Path, ttl: float) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS decisions ("
+                "model_id TEXT NOT NULL, digest TEXT NOT NULL, "
+                "decision TEXT NOT NULL, expires_at REAL NOT NULL, "
+                "PRIMARY KEY (model_id, digest))"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: tuple[str, str]) -> str | None:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT decision FROM decisions "
+                "WHERE model_id = ? AND digest = ? AND expires_at > ?",
+                (*key, time.time()),
+            )
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def set(self, key: tuple[str, str], decision: str) -> None:
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO decisions VALUES (?, ?, ?, ?)",
+                (*key, decision, now + self.ttl),
+            )
+            conn.execute("DELETE FROM decisions WHERE expires_at <= ?", (now,))
+
+    def clear(self) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM decisions")
+
+
+class RouterDecisionCache:
+    """
+    Thread-safe LRU cache with TTL for routing decisions.
+
+    Attributes:
+        max_size (int): Maximum number of cached decisions
+        ttl (float): Seconds a decision stays valid
+        hits (int): Number of lookups served from the cache
+        misses (int): Number of lookups not found or expired
+        evictions (int): Number of entries dropped by the LRU bound
+        shared (SharedDecisionStore | None): Cross-process store consulted on
+            local misses, if configured
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 3600.0,
+        shared_path: Path | None = None,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.shared = (
+            SharedDecisionStore(shared_path, ttl) if shared_path is not None else None
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model_id: str, text: str) -> tuple[str, str]:
+        """Build the cache key for a model ID and (un-normalized) prompt."""
+        digest = hashlib.blake2b(
+            normalize_query(text).encode(), digest_size=16
+        ).hexdigest()
+        return model_id, digest
+
+    def get(self, model_id: str, text: str) -> str | None:
+        """Return the cached decision, or None on a miss or expired entry."""
+        key = self.make_key(model_id, text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] >= time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+
+        decision = self.shared.get(key) if self.shared is not None else None
+        with self._lock:
+            if decision is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, decision)
+        return decision
+
+    def set(self, model_id: str, text: str, decision: str) -> None:
+        """Store a decision, evicting the least recently used entry if full."""
+        key = self.make_key(model_id, text)
+        with self._lock:
+            self._store(key, decision)
+        if self.shared is not None:
+            self.shared.set(key, decision)
+
+    def _store(self, key: tuple[str, str], decision: str) -> None:
+        self._entries[key] = (decision, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached decision (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        """Return cache size and hit-rate metrics."""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+            "shared": self.shared is not None,
+        }
+
+
+class CachedQueryRouter(BaseQueryRouter):
+    """
+    A BaseQueryRouter decorator that memoizes the wrapped router's decisions.
+
+    Decisions are keyed on the user's query when the caller passes it (the
+    formatted prompt only differs by it), or else on the prompt. Fallback
+    classifications for invalid model output are not memoized.
+    """
+
+    def __init__(
+        self, router: BaseQueryRouter, cache: RouterDecisionCache, model_id: str
+    ) -> None:
+        """
+        Initialize the cached router.
+
+        Args:
+            router: The router whose decisions are cached.
+            cache: The decision cache (may be shared between routers).
+            model_id: ID of the model behind `router`, part of the cache key.
+        """
+        self.router = router
+        self.cache = cache
+        self.model_id = model_id
+
+    @override
+    def route_query(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+        *,
+        user_input: str | None = None,
+    ) -> str:
+        """Return the cached classification or classify and cache it."""
+        key = prompt if user_input is None else user_input
+        cached = self.cache.get(self.model_id, key)
+        if cached is not None:
+            logger.debug("router_cache_hit", hit_rate=self.cache.hit_rate)
+            return cached
+        classification = self.router.route_query(
+            prompt,
+            response_mime_type=response_mime_type,
+            response_schema=response_schema,
+            user_input=user_input,
+        )
+        if not isinstance(classification, FallbackClassification):
+            self.cache.set(self.model_id, key, classification)
+        return classification
@@ -0,0 +1,266 @@
+"""
+Local Fast-Path Query Classifier
+
+This module implements a small nearest-centroid classifier that runs locally
+in front of the LLM-based routers. Queries are featurized with a hashed
+bag of word unigrams/bigrams and character trigrams, compared against one
+centroid per label, and answered locally when the classifier is confident.
+Low-confidence queries fall back to the LLM router.
+
+Running the module trains on the labeled example file and prints a
+leave-one-out confusion matrix for each routing stage:
+
+    python -m flare_ai_rag.router.classifier
+"""
+
+import json
+import re
+import zlib
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from itertools import pairwise
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_DIMENSION = 2**12
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def hashed_features(text: str, dimension: int = DEFAULT_DIMENSION) -> np.ndarray:
+    """
+    Featurize text into an L2-normalized hashed term-frequency vector.
+
+    Word unigrams, word bigrams and character trigrams are hashed with a
+    stable hash (crc32) so vectors are reproducible across processes.
+    """
+    lowered = text.lower()
+    tokens = _TOKEN_PATTERN.findall(lowered)
+    terms = tokens + [f"{a} {b}" for a, b in pairwise(tokens)]
+    compact = " ".join(tokens)
+    terms += [f"#{compact[i : i + 3]}" for i in range(len(compact) - 2)]
+
+    vector = np.zeros(dimension, dtype=np.float32)
+    for term in terms:
+        vector[zlib.crc32(term.encode()) % dimension] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class Prediction(NamedTuple):
+    """A predicted label and the classifier's confidence in it."""
+
+    label: str
+    confidence: float
+
+
+class NearestCentroidClassifier:
+    """
+    Nearest-centroid classifier over normalized query vectors.
+
+    Confidence is the cosine-similarity margin between the best and the
+    second-best centroid, so it is 0 for a tie and grows as the query moves
+    clearly towards one label.
+    """
+
+    def __init__(
+        self, featurizer: Callable[[str], np.ndarray] = hashed_features
+    ) -> None:
+        self.featurizer = featurizer
+        self.labels: list[str] = []
+        self.centroids: np.ndarray | None = None
+
+    def fit(
+        self, texts: Sequence[str], labels: Sequence[str]
+    ) -> "NearestCentroidClassifier":
+        """Compute one normalized centroid per label."""
+        if len(texts) != len(labels) or not texts:
+            msg = "texts and labels must be non-empty and of equal length"
+            raise ValueError(msg)
+        vectors = np.stack([self.featurizer(text) for text in texts])
+        self.labels = sorted(set(labels))
+        label_array = np.asarray(labels)
+        centroids = np.stack(
+            [vectors[label_array == label].mean(axis=0) for label in self.labels]
+        )
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        self.centroids = centroids / np.where(norms == 0, 1, norms)
+        return self
+
+    def predict(self, text: str) -> Prediction:
+        """Predict the label of `text` together with its confidence margin."""
+        if self.centroids is None:
+            msg = "Classifier has not been fitted"
+            raise RuntimeError(msg)
+        similarities = self.centroids @ self.featurizer(text)
+        if len(self.labels) == 1:
+            return Prediction(self.labels[0], float(similarities[0]))
+        second, best = np.argsort(similarities)[-2:]
+        margin = float(similarities[best] - similarities[second])
+        return Prediction(self.labels[best], margin)
+
+
+@dataclass
+class FastPathClassifier:
+    """
+    A trained classifier plus the confidence threshold above which its
+    prediction is trusted instead of calling the LLM router.
+    """
+
+    classifier: NearestCentroidClassifier
+    threshold: float
+
+    def classify(self, text: str) -> str | None:
+        """Return the local label, or None if the LLM router should decide."""
+        prediction = self.classifier.predict(text)
+        if prediction.confidence >= self.threshold:
+            return prediction.label
+        return None
+
+
+@dataclass
+class ConfusionReport:
+    """Confusion matrix and fast-path coverage of a classifier on labeled data."""
+
+    labels: list[str]
+    matrix: dict[str, dict[str, int]]
+    threshold: float
+    coverage: float
+    accuracy: float
+    covered_accuracy: float
+
+    def format(self) -> str:
+        """Render the report as a plain-text table."""
+        corner = "actual \\ predicted"
+        first = max(len(corner), *(len(label) for label in self.labels)) + 2
+        width = max(len(label) for label in self.labels) + 2
+        header = corner.ljust(first) + "".join(
+            label.rjust(width) for label in self.labels
+        )
+        rows = [
+            actual.ljust(first)
+            + "".join(
+                str(self.matrix[actual][predicted]).rjust(width)
+                for predicted in self.labels
+            )
+            for actual in self.labels
+        ]
+        summary = (
+            f"accuracy={self.accuracy:.3f} "
+            f"coverage@{self.threshold}={self.coverage:.3f} "
+            f"covered_accuracy={self.covered_accuracy:.3f}"
+        )
+        return "\n".join([header, *rows, summary])
+
+
+def confusion_report(
+    classifier: NearestCentroidClassifier,
+    texts: Sequence[str],
+    labels: Sequence[str],
+    threshold: float,
+) -> ConfusionReport:
+    """
+    Evaluate a fitted classifier on labeled data.
+
+    Coverage is the fraction of queries that would be answered locally at the
+    given threshold, and covered accuracy the accuracy on that fraction.
+    """
+    predictions = [classifier.predict(text) for text in texts]
+    return _build_report(predictions, labels, threshold)
+
+
+def leave_one_out_report(
+    texts: Sequence[str], labels: Sequence[str], threshold: float
+) -> ConfusionReport:
+    """Confusion report where each example is predicted by a model trained
+    on all other examples."""
+    predictions = []
+    for idx, text in enumerate(texts):
+        rest = [i for i in range(len(texts)) if i != idx]
+        classifier = NearestCentroidClassifier().fit(
+            [texts[i] for i in rest], [labels[i] for i in rest]
+        )
+        predictions.append(classifier.predict(text))
+    return _build_report(predictions, labels, threshold)
+
+
+def _build_report(
+    predictions: Sequence[Prediction], labels: Sequence[str], threshold: float
+) -> ConfusionReport:
+    all_labels = sorted({*labels, *(p.label for p in predictions)})
+    matrix = {actual: dict.fromkeys(all_labels, 0) for actual in all_labels}
+    correct = covered = covered_correct = 0
+    for prediction, actual in zip(predictions, labels, strict=True):
+        matrix[actual][prediction.label] += 1
+        hit = prediction.label == actual
+        correct += hit
+        if prediction.confidence >= threshold:
+            covered += 1
+            covered_correct += hit
+    total = len(labels) or 1
+    return ConfusionReport(
+        labels=all_labels,
+        matrix=matrix,
+        threshold=threshold,
+        coverage=covered / total,
+        accuracy=correct / total,
+        covered_accuracy=covered_correct / covered if covered else 0.0,
+    )
+
+
+def load_labeled_queries(path: Path) -> list[dict[str, str]]:
+    """Load labeled queries (one JSON object per line) from a JSONL file."""
+    with path.open() as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def labeled_examples(
+    records: Iterable[dict[str, str]], field: str
+) -> tuple[list[str], list[str]]:
+    """Split labeled records into the texts and labels of one routing stage."""
+    pairs = [(r["query"], r[field]) for r in records if r.get(field)]
+    return [query for query, _ in pairs], [label for _, label in pairs]
+
+
+def build_fast_path(
+    records: Sequence[dict[str, str]], field: str, threshold: float
+) -> FastPathClassifier | None:
+    """
+    Train a fast-path classifier for one routing stage.
+
+    :param records: Labeled queries with a "query" key and one key per stage.
+    :param field: The stage label key, e.g. "semantic" or "rag".
+    :param threshold: Minimum confidence for answering locally.
+    :return: The fast-path classifier, or None if there is not enough data.
+    """
+    texts, labels = labeled_examples(records, field)
+    if len(set(labels)) < 2:  # noqa: PLR2004
+        logger.warning("fast_path_disabled", stage=field, reason="too few labels")
+        return None
+    classifier = NearestCentroidClassifier().fit(texts, labels)
+    logger.info(
+        "fast_path_trained", stage=field, examples=len(texts), labels=classifier.labels
+    )
+    return FastPathClassifier(classifier=classifier, threshold=threshold)
+
+
+if __name__ == "__main__":
+    from flare_ai_rag.settings import settings
+    from flare_ai_rag.utils import load_json
+
+    fast_path_config = load_json(settings.input_path / "input_parameters.json")[
+        "fast_path"
+    ]
+    examples = load_labeled_queries(
+        settings.data_path / fast_path_config["training_data"]
+    )
+    for stage in ("semantic", "rag"):
+        stage_texts, stage_labels = labeled_examples(examples, stage)
+        report = leave_one_out_report(
+            stage_texts, stage_labels, fast_path_config[f"{stage}_threshold"]
+        )
+        print(f"[{stage}]\n{report.format()}\n")  # noqa: T201
@@ -17,11 +17,7 @@ class RouterConfig:
     @staticmethod
     def load(model_config: dict[str, Any]) -> "RouterConfig":
         """Loads the router config."""
-        model = Model(
-            model_id=model_config["id"],
-            max_tokens=model_config.get("max_tokens"),
-            temperature=model_config.get("temperature"),
-        )
+        model = Model.load(model_config)
 
         return RouterConfig(
             system_prompt=ROUTER_INSTRUCTION,
@@ -1,27 +1,44 @@
+from enum import Enum
 from typing import Any, override
 
 import structlog
 
-from flare_ai_rag.ai import GeminiProvider, OpenRouterClient
+from flare_ai_rag.ai import BaseAIProvider, OpenRouterClient
 from flare_ai_rag.router import BaseQueryRouter
+from flare_ai_rag.router.base import FallbackClassification
 from flare_ai_rag.router.config import RouterConfig
+from flare_ai_rag.telemetry import model_call
 from flare_ai_rag.utils import (
-    parse_chat_response_as_json,
+    parse_chat_response,
+    parse_chat_usage,
     parse_gemini_response_as_json,
+    parse_structured_output,
 )
 
 logger = structlog.get_logger(__name__)
 
 
+def structured_classification(parsed: Any) -> str | None:
+    """
+    The classification in structured router output: the value of an enum
+    member, or the "classification" field of a JSON object (None otherwise).
+    """
+    if isinstance(parsed, Enum):
+        return str(parsed.value)
+    if isinstance(parsed, dict):
+        return str(parsed.get("classification", "")).upper()
+    return None
+
+
 class GeminiRouter(BaseQueryRouter):
     """
     A simple query router that uses GCloud's Gemini
     to classify a query as ANSWER, CLARIFY, or REJECT.
     """
 
-    def __init__(self, client: GeminiProvider, config: RouterConfig) -> None:
+    def __init__(self, client: BaseAIProvider, config: RouterConfig) -> None:
         """
-        Initialize the router with a GeminiProvider instance.
+        Initialize the router with a GeminiProvider (or a ProviderPool) instance.
         """
         self.router_config = config
         self.client = client
@@ -32,6 +49,8 @@ class GeminiRouter(BaseQueryRouter):
         prompt: str,
         response_mime_type: str | None = None,
         response_schema: Any | None = None,
+        *,
+        user_input: str | None = None,
     ) -> str:
         """
         Analyze the query using the configured prompt and classify it.
@@ -42,13 +61,20 @@ class GeminiRouter(BaseQueryRouter):
             prompt=prompt,
             response_mime_type=response_mime_type,
             response_schema=response_schema,
+            generation_profile=self.router_config.model.generation_profile,
         )
-        # Parse the response to extract classification.
-        classification = (
-            parse_gemini_response_as_json(response.raw_response)
-            .get("classification", "")
-            .upper()
-        )
+        # Read the structured output directly; only fall back to parsing the
+        # text for providers that returned unconstrained output.
+        classification = structured_classification(response.parsed)
+        if classification is None:
+            try:
+                classification = (
+                    parse_gemini_response_as_json(response)
+                    .get("classification", "")
+                    .upper()
+                )
+            except ValueError:
+                classification = response.text.strip().upper()
         # Validate the classification.
         valid_options = {
             self.router_config.answer_option,
@@ -56,7 +82,8 @@ class GeminiRouter(BaseQueryRouter):
             self.router_config.reject_option,
         }
         if classification not in valid_options:
-            classification = self.router_config.clarify_option
+            logger.warning("invalid_router_output", classification=classification)
+            classification = FallbackClassification(self.router_config.clarify_option)
 
         return classification
 
@@ -83,6 +110,8 @@ class QueryRouter(BaseQueryRouter):
         prompt: str,
         response_mime_type: str | None = None,
         response_schema: Any | None = None,
+        *,
+        user_input: str | None = None,
     ) -> str:
         """
         Analyze the query using the configured prompt and classify it.
@@ -105,10 +134,17 @@ class QueryRouter(BaseQueryRouter):
             payload["temperature"] = self.router_config.model.temperature
 
         # Get response
-        response = self.client.send_chat_completion(payload)
-        classification = (
-            parse_chat_response_as_json(response).get("classification", "").upper()
-        )
+        with model_call(self.router_config.model.model_id) as call:
+            response = self.client.send_chat_completion(payload)
+            call.set_usage(parse_chat_usage(response))
+        # Read the reply as the requested structured output (the bare enum
+        # value of the rag_router prompt), falling back to a JSON object or
+        # the bare text for prompts that do not constrain the output.
+        text = parse_chat_response(response)
+        parsed = parse_structured_output(text, response_mime_type, response_schema)
+        if parsed is None:
+            parsed = parse_structured_output(text, "application/json", None)
+        classification = structured_classification(parsed) or text.strip().upper()
 
         # Validate the classification.
         valid_options = {
@@ -117,6 +153,7 @@ class QueryRouter(BaseQueryRouter):
             self.router_config.reject_option,
         }
         if classification not in valid_options:
-            classification = self.router_config.clarify_option
+            logger.warning("invalid_router_output", classification=classification)
+            classification = FallbackClassification(self.router_config.clarify_option)
 
         return classification
@@ -32,9 +32,15 @@ class Settings(BaseSettings):
     # Restrict backend listener to specific IPs
     cors_origins: list[str] = ["*"]
 
+    # Number of API server worker processes (1 with an embedded Qdrant, which
+    # only one process can open or, in memory, share)
+    api_workers: int = 1
+
     # Path Settings
     data_path: Path = create_path("data")
     input_path: Path = create_path("flare_ai_rag")
+    # Prebuilt index snapshot restored at startup (see build_index.py)
+    index_snapshot_path: Path = create_path("data") / "index_snapshot"
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -124,4 +130,5 @@ logger.debug(
     "settings",
     settings=settings.model_dump(
         exclude={"x_api_key_secret", "x_access_token_secret", "telegram_api_token"}
-    ),)
+    ),
+)
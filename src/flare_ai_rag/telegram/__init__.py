@@ -1,3 +1,17 @@
-from .service import TelegramBot
+from typing import TYPE_CHECKING
 
-__all__ = ["TelegramBot"]
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .service import TelegramBot
+
+__all__ = [
+    "TelegramBot",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TelegramBot": ".service",
+    },
+)
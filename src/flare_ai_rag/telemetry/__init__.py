@@ -0,0 +1,74 @@
+from typing import TYPE_CHECKING
+
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .metrics import (
+        PipelineMetrics,
+        enable_multiprocess,
+        pipeline_metrics,
+        render_metrics,
+    )
+    from .pipeline import (
+        PipelineTrace,
+        current_trace,
+        model_call,
+        pipeline_trace,
+        stage,
+        token_usage,
+    )
+    from .provider import InstrumentedProvider
+    from .usage import (
+        Admission,
+        LimitStore,
+        LocalLimitStore,
+        SharedLimitStore,
+        UsageAccountant,
+        UsageConfig,
+        UsageLimitError,
+    )
+
+__all__ = [
+    "Admission",
+    "InstrumentedProvider",
+    "LimitStore",
+    "LocalLimitStore",
+    "PipelineMetrics",
+    "PipelineTrace",
+    "SharedLimitStore",
+    "UsageAccountant",
+    "UsageConfig",
+    "UsageLimitError",
+    "current_trace",
+    "enable_multiprocess",
+    "model_call",
+    "pipeline_metrics",
+    "pipeline_trace",
+    "render_metrics",
+    "stage",
+    "token_usage",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "PipelineMetrics": ".metrics",
+        "enable_multiprocess": ".metrics",
+        "pipeline_metrics": ".metrics",
+        "render_metrics": ".metrics",
+        "PipelineTrace": ".pipeline",
+        "current_trace": ".pipeline",
+        "model_call": ".pipeline",
+        "pipeline_trace": ".pipeline",
+        "stage": ".pipeline",
+        "token_usage": ".pipeline",
+        "InstrumentedProvider": ".provider",
+        "Admission": ".usage",
+        "LimitStore": ".usage",
+        "LocalLimitStore": ".usage",
+        "SharedLimitStore": ".usage",
+        "UsageAccountant": ".usage",
+        "UsageConfig": ".usage",
+        "UsageLimitError": ".usage",
+    },
+)
@@ -0,0 +1,171 @@
+"""
+Pipeline Metrics
+
+Prometheus instruments of the RAG pipeline: a latency histogram per stage,
+a latency histogram per stage and model for model calls, token counters per
+stage, model and kind (prompt or completion), and the cost (USD) per route
+and model and the requests rejected by usage limits, from the usage
+accountant.
+
+They need the optional `prometheus-client` package (the `metrics` extra).
+Without it `pipeline_metrics` returns None, observations are skipped and the
+`/metrics` endpoint answers 404.
+
+With several API workers, each process keeps its own instruments, so any
+worker's `/metrics` would only count its share of the requests. The server
+then enables prometheus_client's multiprocess mode (`enable_multiprocess`):
+workers write their samples to files in a shared directory, and the endpoint
+serves their sum.
+"""
+
+import os
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+# Directory of the per-process sample files in multiprocess mode. It must be
+# set before the first instrument is created, so before the workers start.
+MULTIPROCESS_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Upper bounds (seconds) of the latency buckets, from local fast paths and
+# cache hits up to slow generations.
+LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class PipelineMetrics:
+    """
+    Prometheus instruments of the pipeline stages and model calls.
+
+    Attributes:
+        stage_latency: Seconds spent in each stage, labeled by `stage`
+        model_latency: Seconds per model call, labeled by `stage` and `model`
+        model_tokens: Tokens used by model calls, labeled by `stage`, `model`
+            and `kind` ("prompt" or "completion")
+        usage_cost: Cost in USD of model calls, labeled by `route` and `model`
+        usage_rejections: Requests rejected by a usage limit, labeled by
+            `limit`
+    """
+
+    def __init__(self, registry: Any | None = None) -> None:
+        """
+        Create the instruments (requires `prometheus-client`).
+
+        Args:
+            registry: Collector registry to register with; the default
+                process-wide registry if None.
+        """
+        from prometheus_client import REGISTRY, Counter, Histogram  # noqa: PLC0415
+
+        registry = registry or REGISTRY
+        self.stage_latency = Histogram(
+            "rag_stage_duration_seconds",
+            "Time spent in each stage of the RAG pipeline.",
+            ["stage"],
+            buckets=LATENCY_BUCKETS,
+            registry=registry,
+        )
+        self.model_latency = Histogram(
+            "rag_model_call_duration_seconds",
+            "Duration of model calls per pipeline stage and model.",
+            ["stage", "model"],
+            buckets=LATENCY_BUCKETS,
+            registry=registry,
+        )
+        self.model_tokens = Counter(
+            "rag_model_tokens",
+            "Tokens used by model calls per pipeline stage and model.",
+            ["stage", "model", "kind"],
+            registry=registry,
+        )
+        self.usage_cost = Counter(
+            "rag_usage_cost_usd",
+            "Cost in USD of model calls per chat route and model.",
+            ["route", "model"],
+            registry=registry,
+        )
+        self.usage_rejections = Counter(
+            "rag_usage_rejections",
+            "Chat requests rejected by a budget or rate limit.",
+            ["limit"],
+            registry=registry,
+        )
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        self.stage_latency.labels(stage).observe(seconds)
+
+    def observe_model_call(
+        self, stage: str, model: str, seconds: float, usage: dict[str, int]
+    ) -> None:
+        self.model_latency.labels(stage, model).observe(seconds)
+        for kind in ("prompt", "completion"):
+            tokens = usage.get(f"{kind}_tokens")
+            if tokens:
+                self.model_tokens.labels(stage, model, kind).inc(tokens)
+
+    def observe_cost(self, route: str, model: str, cost: float) -> None:
+        self.usage_cost.labels(route, model).inc(cost)
+
+    def observe_rejection(self, limit: str) -> None:
+        self.usage_rejections.labels(limit).inc()
+
+
+@cache
+def pipeline_metrics() -> PipelineMetrics | None:
+    """The process-wide instruments, or None without `prometheus-client`."""
+    try:
+        return PipelineMetrics()
+    except ImportError:
+        return None
+
+
+def enable_multiprocess(path: Path) -> None:
+    """
+    Collect the metrics of all worker processes through files in `path`.
+
+    Call in the parent process before the workers start; they inherit the
+    setting. Sample files of an earlier run are removed.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    for samples in path.glob("*.db"):
+        samples.unlink()
+    os.environ[MULTIPROCESS_ENV] = str(path)
+
+
+def render_metrics() -> tuple[bytes, str] | None:
+    """
+    The metrics in the Prometheus exposition format.
+
+    In multiprocess mode, these are the metrics summed over all workers.
+
+    Returns:
+        The body and its content type, or None without `prometheus-client`.
+    """
+    if pipeline_metrics() is None:
+        return None
+    from prometheus_client import (  # noqa: PLC0415
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        generate_latest,
+        multiprocess,
+    )
+
+    registry = REGISTRY
+    if MULTIPROCESS_ENV in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
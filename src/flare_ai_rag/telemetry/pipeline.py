@@ -0,0 +1,251 @@
+"""
+Pipeline Tracing
+
+Per-request timing of the RAG pipeline stages (semantic routing, RAG
+classification, embedding, vector search, reranking, generation, ...) and of
+the model calls made within them, with their token usage and reported cost.
+
+`pipeline_trace` opens the trace of a request, `stage` times a block of work
+and `model_call` times one provider call. Each stage and model call becomes
+an OpenTelemetry span (with the optional `opentelemetry-api` package) and is
+observed by the Prometheus instruments of `telemetry.metrics`. The current
+trace and stage live in context variables, so components can mark their
+stages without being handed the trace; work submitted to a thread pool must
+run in a copy of the caller's context (`contextvars.copy_context`) to be
+attributed to the request.
+"""
+
+import time
+from collections.abc import Generator, Mapping
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import cache
+from threading import Lock
+from typing import Any
+
+from flare_ai_rag.telemetry.metrics import pipeline_metrics
+
+# Token counts in `ModelResponse.metadata["usage"]`.
+USAGE_KEYS = ("prompt_tokens", "completion_tokens", "total_tokens")
+# OpenTelemetry GenAI semantic convention attributes of the token counts.
+SPAN_USAGE_ATTRIBUTES = {
+    "prompt_tokens": "gen_ai.usage.input_tokens",
+    "completion_tokens": "gen_ai.usage.output_tokens",
+}
+
+
+@cache
+def _tracer() -> Any | None:
+    try:
+        from opentelemetry import trace  # noqa: PLC0415
+    except ImportError:
+        return None
+    return trace.get_tracer("flare_ai_rag")
+
+
+def _span(name: str, attributes: Mapping[str, Any] | None = None) -> Any:
+    tracer = _tracer()
+    if tracer is None:
+        return nullcontext(None)
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+def token_usage(metadata: Mapping[str, Any]) -> dict[str, int]:
+    """The token counts a provider reported in a response's metadata."""
+    usage = metadata.get("usage") or {}
+    return {key: int(usage[key]) for key in USAGE_KEYS if usage.get(key) is not None}
+
+
+@dataclass
+class ModelUsage:
+    """
+    Calls and token usage of one model within one stage.
+
+    `cost` sums the costs reported by the provider; it stays None if the
+    provider reports none, leaving pricing to the usage accountant.
+    """
+
+    calls: int = 0
+    seconds: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    cost: float | None = None
+
+    def add(
+        self, seconds: float, usage: Mapping[str, int], cost: float | None = None
+    ) -> None:
+        self.calls += 1
+        self.seconds += seconds
+        if cost is not None:
+            self.cost = (self.cost or 0.0) + cost
+        self.prompt_tokens += usage.get("prompt_tokens", 0)
+        self.completion_tokens += usage.get("completion_tokens", 0)
+        self.total_tokens += usage.get(
+            "total_tokens",
+            usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        usage: dict[str, Any] = {
+            "calls": self.calls,
+            "duration_ms": round(self.seconds * 1000, 2),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+        }
+        if self.cost is not None:
+            usage["cost"] = self.cost
+        return usage
+
+
+@dataclass
+class PipelineTrace:
+    """
+    Stage timings and model usage of one request.
+
+    Attributes:
+        stages (dict[str, float]): Seconds spent in each stage; a stage
+            entered several times (e.g. a search per collection) sums up,
+            and nested stages also count towards their parent
+        usage (dict[str, dict[str, ModelUsage]]): Model usage by stage, then
+            by model
+        route (str | None): Route the request took (e.g. its semantic
+            route), set by the request handler
+    """
+
+    stages: dict[str, float] = field(default_factory=dict)
+    usage: dict[str, dict[str, ModelUsage]] = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+    finished: float | None = None
+    route: str | None = None
+    _lock: Lock = field(default_factory=Lock, repr=False)
+
+    @property
+    def duration(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add_model_call(
+        self,
+        stage: str,
+        model: str,
+        seconds: float,
+        usage: Mapping[str, int],
+        cost: float | None = None,
+    ) -> None:
+        with self._lock:
+            self.usage.setdefault(stage, {}).setdefault(model, ModelUsage()).add(
+                seconds, usage, cost
+            )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Timings in milliseconds and the token usage per stage and model."""
+        with self._lock:
+            return {
+                "route": self.route,
+                "total_ms": round(self.duration * 1000, 2),
+                "stages_ms": {
+                    name: round(seconds * 1000, 2)
+                    for name, seconds in self.stages.items()
+                },
+                "usage": {
+                    stage: {model: usage.to_dict() for model, usage in models.items()}
+                    for stage, models in self.usage.items()
+                },
+            }
+
+
+_current_trace: ContextVar[PipelineTrace | None] = ContextVar(
+    "pipeline_trace", default=None
+)
+_current_stage: ContextVar[str | None] = ContextVar("pipeline_stage", default=None)
+
+
+def current_trace() -> PipelineTrace | None:
+    """The trace of the request being processed, if any."""
+    return _current_trace.get()
+
+
+@contextmanager
+def pipeline_trace(name: str = "rag.request") -> Generator[PipelineTrace]:
+    """Open the trace (and root span) of a request."""
+    trace = PipelineTrace()
+    token = _current_trace.set(trace)
+    try:
+        with _span(name):
+            yield trace
+    finally:
+        trace.finished = time.perf_counter()
+        _current_trace.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Generator[None]:
+    """
+    Time a pipeline stage.
+
+    The time is added to the current trace (if any), observed by the stage
+    histogram and recorded as a span; model calls made within are
+    attributed to the stage.
+    """
+    token = _current_stage.set(name)
+    start = time.perf_counter()
+    try:
+        with _span(f"rag.{name}"):
+            yield
+    finally:
+        seconds = time.perf_counter() - start
+        _current_stage.reset(token)
+        if (trace := _current_trace.get()) is not None:
+            trace.add_stage(name, seconds)
+        if (metrics := pipeline_metrics()) is not None:
+            metrics.observe_stage(name, seconds)
+
+
+@dataclass
+class ModelCall:
+    """A model call being timed; set its fields from the response."""
+
+    model: str
+    usage: dict[str, int] = field(default_factory=dict)
+    cost: float | None = None
+
+    def set_usage(self, usage: Mapping[str, Any]) -> None:
+        """Set the token counts and (USD) cost from a provider's usage."""
+        self.usage = token_usage({"usage": usage})
+        cost = usage.get("cost")
+        self.cost = float(cost) if cost is not None else None
+
+
+@contextmanager
+def model_call(model: str) -> Generator[ModelCall]:
+    """
+    Time a model call of the current stage and record its token usage.
+
+    Calls made outside any stage are attributed to the "other" stage.
+    """
+    call = ModelCall(model)
+    stage_name = _current_stage.get() or "other"
+    start = time.perf_counter()
+    span: AbstractContextManager[Any] = _span("rag.model_call", {"stage": stage_name})
+    with span as current_span:
+        try:
+            yield call
+        finally:
+            seconds = time.perf_counter() - start
+            if current_span is not None:
+                current_span.set_attribute("gen_ai.request.model", call.model)
+                for key, attribute in SPAN_USAGE_ATTRIBUTES.items():
+                    if key in call.usage:
+                        current_span.set_attribute(attribute, call.usage[key])
+            if (trace := _current_trace.get()) is not None:
+                trace.add_model_call(
+                    stage_name, call.model, seconds, call.usage, call.cost
+                )
+            if (metrics := pipeline_metrics()) is not None:
+                metrics.observe_model_call(stage_name, call.model, seconds, call.usage)
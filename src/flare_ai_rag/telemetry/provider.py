@@ -0,0 +1,83 @@
+"""
+Instrumented Provider
+
+A BaseAIProvider wrapper timing every model call as part of the current
+pipeline stage and recording the token usage the wrapped provider reports in
+`ModelResponse.metadata["usage"]`.
+"""
+
+from typing import Any, override
+
+from flare_ai_rag.ai.base import BaseAIProvider, ModelResponse
+from flare_ai_rag.ai.model import GenerationProfile
+from flare_ai_rag.telemetry.pipeline import model_call
+
+
+def model_name(provider: BaseAIProvider) -> str:
+    """
+    The model label of a provider.
+
+    Gemini providers hold a model object, whose name has a "models/" prefix.
+    """
+    name = str(getattr(provider.model, "model_name", provider.model))
+    return name.removeprefix("models/")
+
+
+class InstrumentedProvider(BaseAIProvider):
+    """
+    Records the latency, token usage and reported cost of provider calls.
+
+    Calls are labeled with the model named in the response metadata (the
+    model an OpenRouter request was served by, or the member of a provider
+    pool that answered), or else the provider's model.
+
+    Attributes:
+        provider (BaseAIProvider): The wrapped provider
+    """
+
+    def __init__(self, provider: BaseAIProvider) -> None:
+        self.provider = provider
+        self.api_key = getattr(provider, "api_key", "")
+        self.model = provider.model
+        self.chat_history = provider.chat_history
+
+    def _call(self, method: str, *args: Any, **kwargs: Any) -> ModelResponse:
+        with model_call(model_name(self.provider)) as call:
+            response: ModelResponse = getattr(self.provider, method)(*args, **kwargs)
+            metadata = response.metadata
+            call.model = str(
+                metadata.get("model") or metadata.get("pool_member") or call.model
+            )
+            call.set_usage(metadata.get("usage") or {})
+        return response
+
+    @override
+    def reset(self) -> None:
+        self.provider.reset()
+        self.chat_history = self.provider.chat_history
+
+    @override
+    def reset_model(self, model: str, **kwargs: str) -> None:
+        self.provider.reset_model(model, **kwargs)
+        self.model = self.provider.model
+        self.chat_history = self.provider.chat_history
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+        generation_profile: GenerationProfile | None = None,
+    ) -> ModelResponse:
+        return self._call(
+            "generate",
+            prompt,
+            response_mime_type=response_mime_type,
+            response_schema=response_schema,
+            generation_profile=generation_profile,
+        )
+
+    @override
+    def send_message(self, msg: str) -> ModelResponse:
+        return self._call("send_message", msg)
@@ -0,0 +1,614 @@
+"""
+Usage Accounting
+
+Aggregates the token usage and cost of the model calls of chat requests by
+route (the semantic route of the request) and model, and enforces the
+configured budgets and rate limits of each user before a request runs:
+
+- daily token and cost budgets per user, and a daily cost budget across all
+  users (days are UTC days)
+- requests and tokens per user in a sliding one-minute window (counting
+  admitted requests, so concurrent requests cannot all slip under the limit)
+
+Users are identified by the server (the API uses the client address), never
+by the request body. Costs are the ones reported by the provider (OpenRouter
+usage accounting) or else computed from the configured per-model prices.
+Budgets are checked against the spend recorded so far, so the request
+crossing a budget still completes and the following ones are rejected.
+
+The daily spend and rate windows the limits are checked against live in a
+`LimitStore`: in process memory by default, or in a SQLite file shared by all
+API workers (`SharedLimitStore`), which the limits need to hold across workers.
+The usage report by route and model covers the process it is served from.
+Per-user state is bounded: the daily spend of at most `max_tracked_users`
+users is kept (the least recently seen are forgotten first), and admissions
+are dropped once they leave the rate window.
+"""
+
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, override
+
+import structlog
+
+from flare_ai_rag.telemetry.metrics import pipeline_metrics
+from flare_ai_rag.telemetry.pipeline import ModelUsage, PipelineTrace
+
+logger = structlog.get_logger(__name__)
+
+# Usage of requests that do not identify their user is pooled under this name.
+ANONYMOUS_USER = "anonymous"
+# Route of requests that failed before they were routed.
+UNROUTED = "unrouted"
+RATE_WINDOW_SECONDS = 60.0
+# Users whose daily spend is tracked by default.
+MAX_TRACKED_USERS = 10_000
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    """Prices of a model in USD per million tokens."""
+
+    prompt: float
+    completion: float
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (prompt_tokens * self.prompt + completion_tokens * self.completion) / 1e6
+
+
+@dataclass(frozen=True)
+class UsageConfig:
+    prices: dict[str, ModelPrice] = field(default_factory=dict)
+    user_daily_tokens: int | None = None
+    user_daily_cost: float | None = None
+    daily_cost: float | None = None
+    user_requests_per_minute: int | None = None
+    user_tokens_per_minute: int | None = None
+    max_tracked_users: int = MAX_TRACKED_USERS
+
+    @staticmethod
+    def load(usage_config: dict[str, Any]) -> "UsageConfig":
+        """Loads the usage accounting config."""
+        return UsageConfig(
+            prices={
+                model: ModelPrice(
+                    prompt=price.get("prompt", 0.0),
+                    completion=price.get("completion", 0.0),
+                )
+                for model, price in usage_config.get("prices", {}).items()
+            },
+            user_daily_tokens=usage_config.get("user_daily_tokens"),
+            user_daily_cost=usage_config.get("user_daily_cost"),
+            daily_cost=usage_config.get("daily_cost"),
+            user_requests_per_minute=usage_config.get("user_requests_per_minute"),
+            user_tokens_per_minute=usage_config.get("user_tokens_per_minute"),
+            max_tracked_users=usage_config.get("max_tracked_users", MAX_TRACKED_USERS),
+        )
+
+
+class UsageLimitError(Exception):
+    """Raised when a request would exceed a budget or rate limit."""
+
+    def __init__(self, limit: str, retry_after: float) -> None:
+        super().__init__(f"Usage limit exceeded: {limit}")
+        self.limit = limit
+        self.retry_after = retry_after
+
+
+@dataclass
+class UsageTotals:
+    """Requests, model calls, tokens and cost (USD) of a slice of usage."""
+
+    requests: int = 0
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    cost: float = 0.0
+
+    def add(self, usage: ModelUsage, cost: float) -> None:
+        self.calls += usage.calls
+        self.prompt_tokens += usage.prompt_tokens
+        self.completion_tokens += usage.completion_tokens
+        self.total_tokens += usage.total_tokens
+        self.cost += cost
+
+    def merge(self, other: "UsageTotals") -> None:
+        self.requests += other.requests
+        self.calls += other.calls
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.total_tokens += other.total_tokens
+        self.cost += other.cost
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "cost": round(self.cost, 6)}
+
+
+@dataclass
+class Admission:
+    """
+    A request admitted by `UsageAccountant.check`, pending its usage.
+
+    It counts towards its user's rate limits from admission on; `record`
+    adds its tokens once the request completes.
+    """
+
+    user: str
+    time: float
+    tokens: int = 0
+    # Row of the admission in a shared limit store.
+    row: int | None = None
+
+
+@dataclass(frozen=True)
+class _LimitUsage:
+    """What a user's request is checked against."""
+
+    spent_today: float
+    user_cost: float
+    user_tokens: int
+    recent_requests: int
+    recent_tokens: int
+    oldest_recent: float | None
+
+
+def _day_start(now: float) -> datetime:
+    moment = datetime.fromtimestamp(now, UTC)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _exceeded_limit(
+    config: UsageConfig, usage: _LimitUsage, now: float
+) -> tuple[str, float] | None:
+    """The first limit a user is over and seconds until it resets."""
+    daily_limits = (
+        ("daily_cost", config.daily_cost, usage.spent_today),
+        ("user_daily_cost", config.user_daily_cost, usage.user_cost),
+        ("user_daily_tokens", config.user_daily_tokens, usage.user_tokens),
+    )
+    rate_limits = (
+        (
+            "user_requests_per_minute",
+            config.user_requests_per_minute,
+            usage.recent_requests,
+        ),
+        ("user_tokens_per_minute", config.user_tokens_per_minute, usage.recent_tokens),
+    )
+    for limit, budget, used in daily_limits:
+        if budget is not None and used >= budget:
+            return limit, (_day_start(now) + timedelta(days=1)).timestamp() - now
+    for limit, budget, used in rate_limits:
+        if budget is not None and used >= budget:
+            # The window frees up when its oldest request leaves it.
+            oldest = now if usage.oldest_recent is None else usage.oldest_recent
+            return limit, oldest + RATE_WINDOW_SECONDS - now
+    return None
+
+
+class LimitStore(ABC):
+    """
+    The daily spend and rate windows the limits of users are checked against.
+
+    Attributes:
+        config (UsageConfig): Budgets, rate limits and the number of users
+            tracked
+    """
+
+    def __init__(
+        self, config: UsageConfig, clock: Callable[[], float] = time.time
+    ) -> None:
+        self.config = config
+        self._clock = clock
+
+    @abstractmethod
+    def admit(self, user: str) -> Admission:
+        """
+        Check a request of a user against the limits and admit it, atomically.
+
+        Raises:
+            UsageLimitError: With the exceeded limit and the seconds after
+                which it resets.
+        """
+
+    @abstractmethod
+    def record(self, admission: Admission, request: UsageTotals) -> None:
+        """Add the usage of an admitted request to today's spend."""
+
+    @abstractmethod
+    def today(self) -> tuple[str, int, UsageTotals]:
+        """Today's UTC date, the number of users tracked and their spend."""
+
+
+class LocalLimitStore(LimitStore):
+    """
+    Limit state in process memory.
+
+    With several API workers, each enforces the limits on its own share of
+    the traffic; use a `SharedLimitStore` there.
+    """
+
+    def __init__(
+        self, config: UsageConfig, clock: Callable[[], float] = time.time
+    ) -> None:
+        super().__init__(config, clock)
+        self._lock = threading.Lock()
+        # Of the current UTC day: in total, and by user, least recently seen
+        # first.
+        self._day = _day_start(clock())
+        self._spent_today = UsageTotals()
+        self._daily: OrderedDict[str, UsageTotals] = OrderedDict()
+        # Requests admitted in the rate window, by user.
+        self._recent: dict[str, deque[Admission]] = {}
+        self._swept = clock()
+
+    def _roll_over(self, now: float) -> None:
+        today = _day_start(now)
+        if today != self._day:
+            self._day = today
+            self._spent_today = UsageTotals()
+            self._daily = OrderedDict()
+
+    def _recent_requests(self, user: str, now: float) -> deque[Admission]:
+        recent = self._recent.setdefault(user, deque())
+        horizon = now - RATE_WINDOW_SECONDS
+        while recent and recent[0].time <= horizon:
+            recent.popleft()
+        return recent
+
+    def _sweep(self, now: float) -> None:
+        """Drop the rate windows of users without recent requests."""
+        if now - self._swept < RATE_WINDOW_SECONDS:
+            return
+        self._swept = now
+        for user in list(self._recent):
+            if not self._recent_requests(user, now):
+                del self._recent[user]
+
+    def _daily_totals(self, user: str) -> UsageTotals:
+        """The user's spend today, forgetting the least recently seen user."""
+        totals = self._daily.get(user)
+        if totals is None:
+            totals = self._daily[user] = UsageTotals()
+            if len(self._daily) > self.config.max_tracked_users:
+                self._daily.popitem(last=False)
+        else:
+            self._daily.move_to_end(user)
+        return totals
+
+    @override
+    def admit(self, user: str) -> Admission:
+        with self._lock:
+            now = self._clock()
+            self._roll_over(now)
+            self._sweep(now)
+            daily = self._daily.get(user, UsageTotals())
+            recent = self._recent_requests(user, now)
+            exceeded = _exceeded_limit(
+                self.config,
+                _LimitUsage(
+                    spent_today=self._spent_today.cost,
+                    user_cost=daily.cost,
+                    user_tokens=daily.total_tokens,
+                    recent_requests=len(recent),
+                    recent_tokens=sum(admission.tokens for admission in recent),
+                    oldest_recent=recent[0].time if recent else None,
+                ),
+                now,
+            )
+            if exceeded is None:
+                admission = Admission(user, now)
+                recent.append(admission)
+                return admission
+        raise UsageLimitError(exceeded[0], max(exceeded[1], 0.0))
+
+    @override
+    def record(self, admission: Admission, request: UsageTotals) -> None:
+        with self._lock:
+            self._roll_over(self._clock())
+            self._spent_today.merge(request)
+            self._daily_totals(admission.user).merge(request)
+            # The admission is still in the user's window, unless it has
+            # already slid out of it.
+            admission.tokens = request.total_tokens
+
+    @override
+    def today(self) -> tuple[str, int, UsageTotals]:
+        with self._lock:
+            self._roll_over(self._clock())
+            spent = UsageTotals()
+            spent.merge(self._spent_today)
+            return self._day.date().isoformat(), len(self._daily), spent
+
+
+class SharedLimitStore(LimitStore):
+    """
+    SQLite-backed limit state shared between worker processes.
+
+    Checks and updates run in write transactions, so the limits hold across
+    all workers. Like `SharedDecisionStore`, it uses wall-clock time since
+    monotonic clocks are not comparable across processes. Admissions that
+    left the rate window and spend of past days are pruned lazily on write.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        config: UsageConfig,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(config, clock)
+        self.path = path
+        self._local = threading.local()
+        with self._transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS spend ("
+                "day TEXT PRIMARY KEY, requests INTEGER NOT NULL, "
+                "calls INTEGER NOT NULL, prompt_tokens INTEGER NOT NULL, "
+                "completion_tokens INTEGER NOT NULL, "
+                "total_tokens INTEGER NOT NULL, cost REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS user_spend ("
+                "day TEXT NOT NULL, user TEXT NOT NULL, "
+                "total_tokens INTEGER NOT NULL, cost REAL NOT NULL, "
+                "seen REAL NOT NULL, PRIMARY KEY (day, user))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS admissions ("
+                "id INTEGER PRIMARY KEY, user TEXT NOT NULL, "
+                "time REAL NOT NULL, tokens INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS admissions_by_user "
+                "ON admissions (user, time)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Transactions are opened explicitly by `_transaction`.
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Generator[sqlite3.Connection]:
+        """A transaction holding the write lock from its first read on."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @override
+    def admit(self, user: str) -> Admission:
+        now = self._clock()
+        day = _day_start(now).date().isoformat()
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM admissions WHERE time <= ?", (now - RATE_WINDOW_SECONDS,)
+            )
+            spent = conn.execute(
+                "SELECT cost FROM spend WHERE day = ?", (day,)
+            ).fetchone()
+            daily = conn.execute(
+                "SELECT cost, total_tokens FROM user_spend WHERE day = ? AND user = ?",
+                (day, user),
+            ).fetchone()
+            requests, tokens, oldest = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tokens), 0), MIN(time) "
+                "FROM admissions WHERE user = ?",
+                (user,),
+            ).fetchone()
+            exceeded = _exceeded_limit(
+                self.config,
+                _LimitUsage(
+                    spent_today=spent[0] if spent else 0.0,
+                    user_cost=daily[0] if daily else 0.0,
+                    user_tokens=daily[1] if daily else 0,
+                    recent_requests=requests,
+                    recent_tokens=tokens,
+                    oldest_recent=oldest,
+                ),
+                now,
+            )
+            if exceeded is None:
+                cursor = conn.execute(
+                    "INSERT INTO admissions (user, time, tokens) VALUES (?, ?, 0)",
+                    (user, now),
+                )
+                return Admission(user, now, row=cursor.lastrowid)
+        raise UsageLimitError(exceeded[0], max(exceeded[1], 0.0))
+
+    @override
+    def record(self, admission: Admission, request: UsageTotals) -> None:
+        now = self._clock()
+        day = _day_start(now).date().isoformat()
+        admission.tokens = request.total_tokens
+        with self._transaction() as conn:
+            if admission.row is not None:
+                conn.execute(
+                    "UPDATE admissions SET tokens = ? WHERE id = ?",
+                    (request.total_tokens, admission.row),
+                )
+            conn.execute(
+                "INSERT INTO spend VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (day) DO UPDATE SET "
+                "requests = requests + excluded.requests, "
+                "calls = calls + excluded.calls, "
+                "prompt_tokens = prompt_tokens + excluded.prompt_tokens, "
+                "completion_tokens = completion_tokens + excluded.completion_tokens, "
+                "total_tokens = total_tokens + excluded.total_tokens, "
+                "cost = cost + excluded.cost",
+                (
+                    day,
+                    request.requests,
+                    request.calls,
+                    request.prompt_tokens,
+                    request.completion_tokens,
+                    request.total_tokens,
+                    request.cost,
+                ),
+            )
+            conn.execute(
+                "INSERT INTO user_spend VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (day, user) DO UPDATE SET "
+                "total_tokens = total_tokens + excluded.total_tokens, "
+                "cost = cost + excluded.cost, seen = excluded.seen",
+                (day, admission.user, request.total_tokens, request.cost, now),
+            )
+            conn.execute("DELETE FROM spend WHERE day != ?", (day,))
+            conn.execute("DELETE FROM user_spend WHERE day != ?", (day,))
+            # Forget the least recently seen users beyond the tracked number.
+            conn.execute(
+                "DELETE FROM user_spend WHERE user IN ("
+                "SELECT user FROM user_spend ORDER BY seen DESC LIMIT -1 OFFSET ?)",
+                (self.config.max_tracked_users,),
+            )
+
+    @override
+    def today(self) -> tuple[str, int, UsageTotals]:
+        day = _day_start(self._clock()).date().isoformat()
+        conn = self._connection()
+        spent = conn.execute(
+            "SELECT requests, calls, prompt_tokens, completion_tokens, "
+            "total_tokens, cost FROM spend WHERE day = ?",
+            (day,),
+        ).fetchone()
+        (users,) = conn.execute(
+            "SELECT COUNT(*) FROM user_spend WHERE day = ?", (day,)
+        ).fetchone()
+        return day, users, UsageTotals(*spent) if spent else UsageTotals()
+
+
+class UsageAccountant:
+    """
+    Token usage and cost by route and model, with per-user budgets and limits.
+
+    Attributes:
+        config (UsageConfig): Prices, budgets, rate limits and the number of
+            users tracked
+        limits (LimitStore): The spend and rate windows the limits are
+            checked against
+        rejected (dict[str, int]): Rejected requests by exceeded limit
+    """
+
+    def __init__(
+        self,
+        config: UsageConfig,
+        clock: Callable[[], float] = time.time,
+        limits: LimitStore | None = None,
+    ) -> None:
+        self.config = config
+        self.limits = limits or LocalLimitStore(config, clock)
+        self.rejected: dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Since startup: model usage by (route, model) and requests by route.
+        self._totals: dict[tuple[str, str], UsageTotals] = {}
+        self._requests: dict[str, int] = {}
+
+    def check(self, user: str | None) -> Admission:
+        """
+        Admit a request of a user, or raise if a limit is exceeded.
+
+        The admitted request counts towards the user's rate limits at once;
+        pass the returned admission to `record` when the request completes.
+
+        Raises:
+            UsageLimitError: With the exceeded limit and the seconds after
+                which it resets.
+        """
+        user = user or ANONYMOUS_USER
+        try:
+            return self.limits.admit(user)
+        except UsageLimitError as error:
+            with self._lock:
+                self.rejected[error.limit] = self.rejected.get(error.limit, 0) + 1
+            logger.warning("usage_limit_exceeded", user=user, limit=error.limit)
+            if (metrics := pipeline_metrics()) is not None:
+                metrics.observe_rejection(error.limit)
+            raise
+
+    def price(self, model: str, usage: ModelUsage) -> float:
+        """The cost of model usage: as reported, or from the model's price."""
+        if usage.cost is not None:
+            return usage.cost
+        price = self.config.prices.get(model)
+        if price is None:
+            return 0.0
+        return price.cost(usage.prompt_tokens, usage.completion_tokens)
+
+    def record(self, trace: PipelineTrace, admission: Admission) -> float:
+        """
+        Record the model usage of an admitted request, under its trace's route.
+
+        Returns:
+            float: The cost of the request in USD
+        """
+        route = trace.route or UNROUTED
+        by_model: dict[str, UsageTotals] = {}
+        for models in trace.usage.values():
+            for model, usage in models.items():
+                totals = by_model.setdefault(model, UsageTotals(requests=1))
+                totals.add(usage, self.price(model, usage))
+        request = UsageTotals()
+        for totals in by_model.values():
+            request.merge(totals)
+        request.requests = 1
+
+        with self._lock:
+            for model, totals in by_model.items():
+                self._totals.setdefault((route, model), UsageTotals()).merge(totals)
+            self._requests[route] = self._requests.get(route, 0) + 1
+        self.limits.record(admission, request)
+
+        if (metrics := pipeline_metrics()) is not None:
+            for model, totals in by_model.items():
+                metrics.observe_cost(route, model, totals.cost)
+        return request.cost
+
+    def spend(self) -> dict[str, Any]:
+        """
+        Usage since startup by route and model, and today's spend.
+
+        Requests are counted once per route, and under each model they
+        called. Spend is not broken down by user, so the report reveals
+        nothing about other clients.
+        """
+        by_route: dict[str, UsageTotals] = {}
+        by_model: dict[str, UsageTotals] = {}
+        with self._lock:
+            for (route, model), totals in self._totals.items():
+                calls = UsageTotals()
+                calls.merge(totals)
+                calls.requests = 0
+                by_route.setdefault(route, UsageTotals()).merge(calls)
+                by_model.setdefault(model, UsageTotals()).merge(totals)
+            for route, requests in self._requests.items():
+                by_route.setdefault(route, UsageTotals()).requests += requests
+            rejected = dict(self.rejected)
+        day, users, spent_today = self.limits.today()
+        total = UsageTotals()
+        for totals in by_route.values():
+            total.merge(totals)
+        return {
+            "total": total.to_dict(),
+            "by_route": {key: totals.to_dict() for key, totals in by_route.items()},
+            "by_model": {key: totals.to_dict() for key, totals in by_model.items()},
+            "today": {"day": day, "users": users, **spent_today.to_dict()},
+            "rejected": rejected,
+        }
@@ -1,3 +1,19 @@
-from .service import TwitterBot, TwitterConfig
+from typing import TYPE_CHECKING
 
-__all__ = ["TwitterBot", "TwitterConfig"]
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .service import TwitterBot, TwitterConfig
+
+__all__ = [
+    "TwitterBot",
+    "TwitterConfig",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "TwitterBot": ".service",
+        "TwitterConfig": ".service",
+    },
+)
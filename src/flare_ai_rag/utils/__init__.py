@@ -1,17 +1,22 @@
-from .file_utils import load_json, load_txt, save_json
+from .file_utils import file_lock, load_json, load_txt, save_json
 from .parser_utils import (
     extract_author,
     parse_chat_response,
     parse_chat_response_as_json,
+    parse_chat_usage,
     parse_gemini_response_as_json,
+    parse_structured_output,
 )
 
 __all__ = [
     "extract_author",
+    "file_lock",
     "load_json",
     "load_txt",
     "parse_chat_response",
     "parse_chat_response_as_json",
+    "parse_chat_usage",
     "parse_gemini_response_as_json",
+    "parse_structured_output",
     "save_json",
 ]
@@ -1,4 +1,7 @@
+import fcntl
 import json
+from collections.abc import Generator
+from contextlib import contextmanager
 from pathlib import Path
 
 import structlog
@@ -24,3 +27,19 @@ def save_json(contents: dict, file_path: Path) -> None:
     with file_path.open("w") as f:
         json.dump(contents, f, indent=4)
     logger.info("Data has been saved.", file_path=file_path)
+
+
+@contextmanager
+def file_lock(lock_path: Path) -> Generator[None]:
+    """
+    Hold an exclusive inter-process lock on `lock_path` for the block.
+
+    Used to make sure work shared by several server worker processes (e.g.
+    building the index) runs in exactly one of them at a time.
+    """
+    with lock_path.open("a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
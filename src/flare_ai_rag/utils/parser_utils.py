@@ -1,5 +1,6 @@
 import json
 import re
+from enum import Enum
 from typing import Any
 
 from flare_ai_rag.ai.base import ModelResponse
@@ -10,6 +11,22 @@ def parse_chat_response(response: dict) -> str:
     return response.get("choices", [])[0].get("message", {}).get("content", "")
 
 
+def parse_chat_usage(response: dict) -> dict[str, Any]:
+    """
+    Parse the token usage of a chat completion response.
+
+    Returns the prompt, completion and total token counts, plus the cost in
+    USD when OpenRouter usage accounting reported one (empty if the response
+    has no usage).
+    """
+    usage = response.get("usage") or {}
+    return {
+        key: usage[key]
+        for key in ("prompt_tokens", "completion_tokens", "total_tokens", "cost")
+        if usage.get(key) is not None
+    }
+
+
 def extract_author(model_id: str) -> tuple[str, str]:
     """
     Extract the author and slug from a model_id.
@@ -42,3 +59,31 @@ def parse_gemini_response_as_json(raw_response: ModelResponse) -> dict[str, Any]
     match = re.search(pattern, text, re.DOTALL)
     json_str = match.group(1) if match else text
     return json.loads(json_str)
+
+
+def parse_structured_output(
+    text: str, response_mime_type: str | None, response_schema: Any | None
+) -> Any | None:
+    """
+    Interpret schema-constrained model output without regex extraction.
+
+    Args:
+        text (str): The response text produced under the schema constraint.
+        response_mime_type (str | None): The requested response MIME type.
+        response_schema (Any | None): The requested response schema.
+
+    Returns:
+        The enum member for "text/x.enum" responses with an Enum schema, the
+        decoded object for "application/json" responses, or None if the
+        response was unconstrained or does not match the schema.
+    """
+    try:
+        if response_mime_type == "text/x.enum":
+            if isinstance(response_schema, type) and issubclass(response_schema, Enum):
+                return response_schema(text.strip())
+            return None
+        if response_mime_type == "application/json":
+            return json.loads(text)
+    except ValueError:
+        return None
+    return None
@@ -0,0 +1,148 @@
+"""
+Compare Qdrant's REST and gRPC transports on our payloads.
+
+Indexes the documents (with random vectors, so no embedding API is needed)
+into a scratch collection over each transport, then times the bulk upsert and
+searches returning the full payload (text included) and only the projected
+payload fields. Requires a running Qdrant server:
+
+    uv run python tests/benchmark_qdrant_transport.py --queries 500
+"""
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import replace
+
+import numpy as np
+import structlog
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import PointStruct
+
+from flare_ai_rag.retriever import (
+    RetrieverConfig,
+    create_qdrant_client,
+    open_document_source,
+    parse_metadata,
+)
+from flare_ai_rag.retriever.qdrant_collection import create_collection, upsert_points
+from flare_ai_rag.settings import settings
+from flare_ai_rag.utils import load_json
+
+logger = structlog.get_logger(__name__)
+
+BENCHMARK_COLLECTION = "transport_benchmark"
+
+
+def build_points(documents: str, vector_size: int, seed: int) -> list[PointStruct]:
+    """Build points with the documents' real payloads and random vectors."""
+    rng = np.random.default_rng(seed)
+    points = []
+    for idx, doc in enumerate(open_document_source(settings.data_path / documents)):
+        if not doc.content:
+            continue
+        vector = rng.standard_normal(vector_size, dtype=np.float32)
+        payload = {
+            "filename": doc.file_name,
+            "text": doc.content,
+            **parse_metadata(doc.meta_data, doc.last_updated).payload(),
+        }
+        points.append(PointStruct(id=idx, vector=vector.tolist(), payload=payload))
+    return points
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """p50/p95/p99 and mean of latencies, in milliseconds."""
+    cuts = statistics.quantiles(samples, n=100)
+    return {
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p95_ms": round(cuts[94] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 2),
+    }
+
+
+def time_calls(call: Callable[[], object], repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def benchmark_transport(
+    client: QdrantClient,
+    points: list[PointStruct],
+    config: RetrieverConfig,
+    args: argparse.Namespace,
+) -> dict[str, object]:
+    """Time the upsert and searches of one client."""
+    create_collection(client, BENCHMARK_COLLECTION, config.vector_size)
+    try:
+        start = time.perf_counter()
+        upsert_points(client, BENCHMARK_COLLECTION, points)
+        upsert_seconds = time.perf_counter() - start
+
+        rng = np.random.default_rng(args.seed + 1)
+        queries = iter(
+            rng.standard_normal((args.queries * 2, config.vector_size)).tolist()
+        )
+        fields = list(config.payload_fields or ())
+
+        def search(*, with_payload: bool | list[str]) -> Callable[[], object]:
+            return lambda: client.query_points(
+                collection_name=BENCHMARK_COLLECTION,
+                query=next(queries),
+                limit=args.limit,
+                with_payload=with_payload,
+            )
+
+        return {
+            "upsert_s": round(upsert_seconds, 3),
+            "upsert_points_per_s": round(len(points) / upsert_seconds, 1),
+            "search_full_payload": percentiles(
+                time_calls(search(with_payload=True), args.queries)
+            ),
+            "search_projected": percentiles(
+                time_calls(search(with_payload=fields), args.queries)
+            ),
+        }
+    finally:
+        client.delete_collection(BENCHMARK_COLLECTION)
+        client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(__doc__ or "").strip().partition("\n")[0]
+    )
+    parser.add_argument("--host", default=None, help="Qdrant host (config default)")
+    parser.add_argument("--documents", default="docs.csv")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    input_config = load_json(settings.input_path / "input_parameters.json")
+    config = RetrieverConfig.load(input_config["retriever_config"])
+    if args.host:
+        config = replace(config, host=args.host)
+    points = build_points(args.documents, config.vector_size, args.seed)
+    payload_bytes = [len(str(point.payload).encode()) for point in points]
+    logger.info(
+        "benchmark documents",
+        points=len(points),
+        median_payload_bytes=int(statistics.median(payload_bytes)),
+        max_payload_bytes=max(payload_bytes),
+    )
+
+    for transport, prefer_grpc in (("rest", False), ("grpc", True)):
+        client = create_qdrant_client(replace(config, prefer_grpc=prefer_grpc))
+        results = benchmark_transport(client, points, config, args)
+        logger.info("transport benchmark", transport=transport, **results)
+
+
+if __name__ == "__main__":
+    main()
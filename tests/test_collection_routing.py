@@ -0,0 +1,122 @@
+from dataclasses import replace
+
+from qdrant_client import QdrantClient
+
+from flare_ai_rag.retriever import (
+    CollectionRoute,
+    CollectionRouter,
+    DocumentRecord,
+    MultiCollectionRetriever,
+    QdrantRetriever,
+    SearchHit,
+    generate_collection,
+    reciprocal_rank_fusion,
+)
+
+BASE = {
+    "embedding_model": "models/test-embedding",
+    "collection_name": "docs",
+    "vector_size": 2,
+    "host": "localhost",
+    "port": 6333,
+}
+ROUTES = [
+    CollectionRoute.load({"name": "docs", "default": True}, BASE),
+    CollectionRoute.load(
+        {
+            "name": "code",
+            "keywords": ["go-flare", "solidity", "smart contract"],
+            "retriever_config": {"collection_name": "code", "vector_size": 3},
+        },
+        BASE,
+    ),
+    CollectionRoute.load(
+        {
+            "name": "blogs",
+            "keywords": ["announcement"],
+            "retriever_config": {"collection_name": "blogs"},
+        },
+        BASE,
+    ),
+]
+
+
+class FakeEmbedding:
+    def __init__(self) -> None:
+        self.queries = 0
+
+    def embed_content(self, **kwargs: str) -> list[float]:
+        if "title" not in kwargs:
+            self.queries += 1
+        size = 3 if kwargs["embedding_model"].endswith("code") else 2
+        return [1.0, float(len(kwargs["contents"]) % 5), 0.5][:size]
+
+
+def _hits(*ids: int) -> list[SearchHit]:
+    return [SearchHit(id=i, score=0.5, metadata={}) for i in ids]
+
+
+def test_router_selects_default_and_keyword_routes() -> None:
+    router = CollectionRouter(ROUTES)
+
+    assert router.select("What is the FTSO?") == ["docs"]
+    assert router.select("Deploy a smart contract from go-flare") == ["docs", "code"]
+    assert CollectionRouter(ROUTES[1:]).select("hello") == ["code", "blogs"]
+    assert ROUTES[1].retriever_config.parent_store == "parents_code.sqlite3"
+
+
+def test_reciprocal_rank_fusion_interleaves_rankings() -> None:
+    rankings = {"docs": _hits(1, 2, 3), "code": _hits(1, 4)}
+
+    fused = reciprocal_rank_fusion(rankings)
+    assert [hit.id for hit in fused] == [1, 1, 2, 4, 3]
+    assert fused[1] is rankings["code"][0]
+
+    weighted = reciprocal_rank_fusion(rankings, weights={"code": 0.5})
+    assert [hit.id for hit in weighted] == [1, 2, 3, 1, 4]
+
+
+def test_searches_routed_collections_with_shared_client() -> None:
+    client = QdrantClient(":memory:")
+    embedding = FakeEmbedding()
+    code_config = replace(
+        ROUTES[1].retriever_config, embedding_model="models/test-code"
+    )
+    routes = [ROUTES[0], replace(ROUTES[1], retriever_config=code_config)]
+    for route, docs in (
+        (routes[0], [DocumentRecord("ftso.md", "", "FTSO feeds")]),
+        (routes[1], [DocumentRecord("evm.go", "", "func main() {}")]),
+    ):
+        generate_collection(docs, client, route.retriever_config, embedding)  # type: ignore[arg-type]
+    retriever = MultiCollectionRetriever(
+        {
+            route.name: QdrantRetriever(client, route.retriever_config, embedding)  # type: ignore[arg-type]
+            for route in routes
+        },
+        CollectionRouter(routes),
+    )
+
+    hits = retriever.search("solidity code in go-flare", top_k=5, with_text=False)
+
+    assert embedding.queries == len(routes)  # once per embedding model
+    assert {hit.collection for hit in hits} == {"docs", "code"}
+    retriever.fetch_text(hits)
+    assert {hit.text for hit in hits} == {"FTSO feeds", "func main() {}"}
+
+
+def test_failed_collection_is_left_out() -> None:
+    client = QdrantClient(":memory:")
+    embedding = FakeEmbedding()
+    config = ROUTES[0].retriever_config
+    generate_collection([DocumentRecord("a.md", "", "FTSO")], client, config, embedding)  # type: ignore[arg-type]
+    retriever = MultiCollectionRetriever(
+        {
+            route.name: QdrantRetriever(client, route.retriever_config, embedding)  # type: ignore[arg-type]
+            for route in ROUTES
+        },
+        CollectionRouter(ROUTES),
+    )
+
+    results = retriever.semantic_search("an announcement")
+
+    assert [r["collection"] for r in results] == ["docs"]
@@ -0,0 +1,111 @@
+from dataclasses import replace
+
+import numpy as np
+from qdrant_client import QdrantClient
+
+from flare_ai_rag.retriever import (
+    DocumentRecord,
+    NearDuplicateDetector,
+    QdrantRetriever,
+    RetrieverConfig,
+    generate_collection,
+    hamming_distance,
+    mmr,
+    simhash,
+)
+
+CONFIG = RetrieverConfig(
+    embedding_model="models/test-embedding",
+    collection_name="docs",
+    vector_size=3,
+    host="localhost",
+    port=6333,
+    payload_fields=("filename",),
+)
+
+MAX_DISTANCE = 3
+PAGE = " ".join(f"term{i}" for i in range(300))
+VECTORS = {
+    "ftso": [1.0, 0.1, 0.0],
+    "ftso-v1": [1.0, 0.12, 0.0],
+    "fdc": [0.6, 0.0, 0.8],
+}
+
+
+class FakeEmbedding:
+    def embed_content(self, **kwargs: str) -> list[float]:
+        title = kwargs.get("title")
+        return VECTORS[title] if title else [1.0, 0.0, 0.2]
+
+
+def test_simhash_separates_near_duplicates() -> None:
+    edited = PAGE.replace("term150 ", "edited ")
+    unrelated = "The Flare Data Connector attests to events on other chains."
+
+    assert hamming_distance(simhash(PAGE), simhash(PAGE)) == 0
+    assert hamming_distance(simhash(PAGE), simhash(edited)) <= MAX_DISTANCE
+    assert hamming_distance(simhash(PAGE), simhash(unrelated)) > MAX_DISTANCE
+    assert -(1 << 63) <= simhash(PAGE) < 1 << 63
+
+
+def test_mmr_trades_relevance_for_diversity() -> None:
+    query = np.array([1.0, 0.0])
+    candidates = np.array([[1.0, 0.05], [1.0, 0.06], [0.7, 0.7]])
+
+    assert mmr(query, candidates, k=2, lambda_mult=1.0) == [0, 1]
+    assert mmr(query, candidates, k=2, lambda_mult=0.3) == [0, 2]
+    assert mmr(query, candidates[:0], k=2) == []
+
+
+def test_search_drops_near_duplicates_and_diversifies() -> None:
+    client = QdrantClient(":memory:")
+    documents = [
+        DocumentRecord("ftso", "", PAGE),
+        DocumentRecord("ftso-v1", "", PAGE + " See the reference."),
+        DocumentRecord("fdc", "", "The Flare Data Connector attests to events."),
+    ]
+    generate_collection(documents, client, CONFIG, FakeEmbedding())  # type: ignore[arg-type]
+
+    plain = QdrantRetriever(client, CONFIG, FakeEmbedding())  # type: ignore[arg-type]
+    assert [h.metadata["filename"] for h in plain.search("q", top_k=2)] == [
+        "ftso",
+        "ftso-v1",
+    ]
+
+    config = replace(CONFIG, near_duplicate_distance=MAX_DISTANCE)
+    deduped = QdrantRetriever(client, config, FakeEmbedding())  # type: ignore[arg-type]
+    assert [h.metadata["filename"] for h in deduped.search("q", top_k=2)] == [
+        "ftso",
+        "fdc",
+    ]
+
+    diverse = QdrantRetriever(client, CONFIG, FakeEmbedding())  # type: ignore[arg-type]
+    hits = diverse.search("q", top_k=2, mmr_lambda=0.3)
+    assert [h.metadata["filename"] for h in hits] == ["ftso", "fdc"]
+
+
+def test_detector_finds_fingerprints_within_distance() -> None:
+    detector = NearDuplicateDetector(max_distance=MAX_DISTANCE)
+    fingerprint = simhash(PAGE)
+    detector.add(fingerprint, "ftso")
+
+    # Flip bits spread over several LSH bands.
+    assert detector.find(fingerprint ^ (1 | 1 << 20 | 1 << 40)) == "ftso"
+    assert detector.find(fingerprint ^ (1 | 1 << 20 | 1 << 40 | 1 << 60)) is None
+
+
+def test_ingest_collapses_near_duplicates() -> None:
+    client = QdrantClient(":memory:")
+    config = replace(CONFIG, near_duplicate_distance=MAX_DISTANCE)
+    documents = [
+        DocumentRecord("ftso", "", PAGE),
+        DocumentRecord("fdc", "", "The Flare Data Connector attests to events."),
+        DocumentRecord("ftso-v1", "", PAGE + " See the reference."),
+    ]
+    report = generate_collection(documents, client, config, FakeEmbedding())  # type: ignore[arg-type]
+
+    assert client.count(config.collection_name).count == len(documents) - 1
+    assert report.summary()["dedup_ratio"] == round(1 / 3, 4)
+    (point,) = client.retrieve(config.collection_name, ids=[1])
+    assert point.payload
+    assert point.payload["sources"] == ["ftso", "ftso-v1"]
@@ -0,0 +1,62 @@
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+from flare_ai_rag.retriever import (
+    CsvDocumentSource,
+    DocumentRecord,
+    JsonlDocumentSource,
+    open_document_source,
+)
+
+ROWS = [
+    {
+        "file_name": "intro.mdx",
+        "meta_data": "slug: intro\ntitle: Introduction",
+        "content": 'Flare is the "blockchain for data".\n\nSecond paragraph.',
+        "last_updated": "2025-01-01",
+    },
+    {"file_name": "empty.mdx", "meta_data": "", "content": "", "last_updated": ""},
+]
+
+
+def _write_csv(path: Path) -> None:
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(ROWS[0]))
+        writer.writeheader()
+        writer.writerows(ROWS)
+
+
+def test_csv_source_streams_records(tmp_path: Path) -> None:
+    path = tmp_path / "docs.csv"
+    _write_csv(path)
+
+    records = list(open_document_source(path))
+
+    assert isinstance(open_document_source(path), CsvDocumentSource)
+    assert records[0] == DocumentRecord(**ROWS[0])
+    assert records[1].content is None
+    assert records[1].last_updated is None
+
+
+def test_jsonl_source_matches_csv(tmp_path: Path) -> None:
+    csv_path = tmp_path / "docs.csv"
+    jsonl_path = tmp_path / "docs.jsonl"
+    _write_csv(csv_path)
+    jsonl_path.write_text("\n".join(json.dumps(row) for row in ROWS) + "\n")
+
+    source = open_document_source(jsonl_path)
+
+    assert isinstance(source, JsonlDocumentSource)
+    assert list(source) == list(open_document_source(csv_path))
+
+
+def test_records_use_slots() -> None:
+    assert not hasattr(DocumentRecord(**ROWS[0]), "__dict__")
+
+
+def test_unsupported_file_type(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Unsupported"):
+        open_document_source(tmp_path / "docs.xlsx")
@@ -0,0 +1,83 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from flare_ai_rag import main
+from flare_ai_rag.router.classifier import (
+    FastPathClassifier,
+    NearestCentroidClassifier,
+    confusion_report,
+)
+
+TEXTS = [
+    "What is the FTSO on Flare?",
+    "How do I stake FLR on Flare network?",
+    "How does the Flare Data Connector work?",
+    "Verify the enclave attestation",
+    "Please provide a remote attestation token",
+    "Prove your attestation",
+    "Hello there",
+    "Hi, how are you?",
+    "Thanks, have a good day",
+]
+LABELS = ["RagRouter"] * 3 + ["RequestAttestation"] * 3 + ["Conversational"] * 3
+
+
+def test_predicts_nearest_centroid() -> None:
+    classifier = NearestCentroidClassifier().fit(TEXTS, LABELS)
+
+    prediction = classifier.predict("Can you give me an attestation?")
+
+    assert prediction.label == "RequestAttestation"
+    assert prediction.confidence > 0
+
+
+def test_low_confidence_falls_back() -> None:
+    classifier = NearestCentroidClassifier().fit(TEXTS, LABELS)
+
+    assert FastPathClassifier(classifier, threshold=0.0).classify("Flare FTSO")
+    assert FastPathClassifier(classifier, threshold=2.0).classify("Flare FTSO") is None
+
+
+def test_confusion_report_counts_every_example() -> None:
+    classifier = NearestCentroidClassifier().fit(TEXTS, LABELS)
+
+    report = confusion_report(classifier, TEXTS, LABELS, threshold=0.0)
+
+    assert sum(sum(row.values()) for row in report.matrix.values()) == len(TEXTS)
+    assert report.accuracy == 1.0
+    assert report.coverage == 1.0
+    assert "RagRouter" in report.format()
+
+
+@pytest.mark.parametrize(
+    ("enabled", "expect_classifiers"),
+    [({}, False), ({"enabled": False}, False), ({"enabled": True}, True)],
+)
+def test_fast_path_is_off_unless_enabled(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    enabled: dict[str, bool],
+    *,
+    expect_classifiers: bool,
+) -> None:
+    monkeypatch.setattr(main.settings, "data_path", tmp_path)
+    (tmp_path / "examples.jsonl").write_text(
+        "".join(
+            json.dumps({"query": text, "semantic": label}) + "\n"
+            for text, label in zip(TEXTS, LABELS, strict=True)
+        )
+    )
+    config = {
+        "fast_path": {
+            "training_data": "examples.jsonl",
+            "semantic_threshold": 0.0,
+            "rag_threshold": 0.0,
+            **enabled,
+        }
+    }
+
+    semantic, _ = main.setup_fast_path(config)
+
+    assert (semantic is not None) == expect_classifiers
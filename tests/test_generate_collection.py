@@ -1,9 +1,9 @@
-import pandas as pd
 import structlog
 from qdrant_client import QdrantClient
 
 from flare_ai_rag.ai import GeminiEmbedding
 from flare_ai_rag.retriever.config import RetrieverConfig
+from flare_ai_rag.retriever.documents import open_document_source
 from flare_ai_rag.retriever.qdrant_collection import generate_collection
 from flare_ai_rag.settings import settings
 from flare_ai_rag.utils import load_json
@@ -16,9 +16,9 @@ def main() -> None:
     config_json = load_json(settings.input_path / "input_parameters.json")
     retriever_config = RetrieverConfig.load(config_json["retriever_config"])
 
-    # Load the CSV file.
-    df_docs = pd.read_csv(settings.data_path / "docs.csv", delimiter=",")
-    logger.info("Loaded CSV Data.", num_rows=len(df_docs))
+    # Open the CSV file for streaming.
+    documents = open_document_source(settings.data_path / "docs.csv")
+    logger.info("Opened CSV Data.", path=documents.path)
 
     # Initialize Qdrant client.
     client = QdrantClient(host=retriever_config.host, port=retriever_config.port)
@@ -27,7 +27,7 @@ def main() -> None:
     embedding_client = GeminiEmbedding(api_key=settings.gemini_api_key)
 
     generate_collection(
-        df_docs,
+        documents,
         client,
         retriever_config,
         embedding_client=embedding_client,
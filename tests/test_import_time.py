@@ -0,0 +1,54 @@
+import json
+import subprocess
+import sys
+
+# Dependencies the package must not load until a subsystem is actually used.
+# Import cost is checked through these rather than wall-clock time, which is
+# unreliable on loaded CI runners.
+HEAVY_MODULES = (
+    "cryptography",
+    "google.genai",
+    "google.generativeai",
+    "langchain",
+    "matplotlib",
+    "pandas",
+    "qdrant_client",
+    "seaborn",
+    "sentence_transformers",
+    "telegram",
+    "tweepy",
+)
+
+
+def _heavy_modules_after(statement: str) -> list[str]:
+    """The heavy modules loaded by running `statement` in a fresh interpreter."""
+    code = (
+        "import json, sys\n"
+        f"{statement}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    # The command is this interpreter running the fixed snippet above.
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_package_import_is_cheap() -> None:
+    assert _heavy_modules_after("import flare_ai_rag") == []
+
+
+def test_subpackages_load_only_what_is_used() -> None:
+    heavy = _heavy_modules_after(
+        "import flare_ai_rag.ai, flare_ai_rag.retriever, flare_ai_rag.attestation\n"
+        "from flare_ai_rag.ai import BaseAIProvider, ProviderPool"
+    )
+
+    assert heavy == []
+
+
+def test_lazy_exports_resolve() -> None:
+    import flare_ai_rag.ai  # noqa: PLC0415
+
+    assert flare_ai_rag.ai.GeminiProvider.__name__ == "GeminiProvider"
+    assert "GeminiProvider" in dir(flare_ai_rag.ai)
@@ -0,0 +1,156 @@
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from qdrant_client import QdrantClient
+
+from flare_ai_rag import main
+from flare_ai_rag.retriever import (
+    IndexManifest,
+    QdrantRetriever,
+    RetrieverConfig,
+    SnapshotError,
+    build_snapshot,
+    open_document_source,
+    restore_snapshot,
+)
+
+CONFIG = RetrieverConfig(
+    embedding_model="models/test-embedding",
+    collection_name="docs",
+    vector_size=4,
+    host="localhost",
+    port=6333,
+)
+
+
+class FakeEmbedding:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def embed_content(self, **kwargs: str) -> list[float]:
+        self.calls += 1
+        return [float(len(kwargs["contents"])), 1.0, 0.0, float(self.calls)]
+
+
+def _write_docs(path: Path, *contents: str) -> None:
+    path.write_text(
+        "\n".join(
+            json.dumps({"file_name": f"{i}.md", "meta_data": "", "content": text})
+            for i, text in enumerate(contents)
+        )
+    )
+
+
+def test_snapshot_round_trip(tmp_path: Path) -> None:
+    docs_path = tmp_path / "docs.jsonl"
+    _write_docs(docs_path, "first doc", "", "third doc")
+    documents = open_document_source(docs_path)
+
+    manifest = build_snapshot(
+        documents,
+        CONFIG,
+        FakeEmbedding(),  # pyright: ignore[reportArgumentType]
+        tmp_path / "snapshot",
+    )
+
+    # The empty document is skipped but keeps its position-based ID.
+    assert [doc["id"] for doc in manifest.documents] == [1, 3]
+    assert IndexManifest.load(tmp_path / "snapshot") == manifest
+    assert manifest.matches(documents, CONFIG)
+
+    client = QdrantClient(":memory:")
+    assert restore_snapshot(tmp_path / "snapshot", client, CONFIG) == 2  # noqa: PLR2004
+    point = client.retrieve("docs", [3], with_vectors=True)[0]
+    assert point.payload is not None
+    assert point.payload["text"] == "third doc"
+
+
+def test_manifest_mismatch(tmp_path: Path) -> None:
+    docs_path = tmp_path / "docs.jsonl"
+    _write_docs(docs_path, "first doc")
+    manifest = build_snapshot(
+        open_document_source(docs_path),
+        CONFIG,
+        FakeEmbedding(),  # pyright: ignore[reportArgumentType]
+        tmp_path / "snapshot",
+    )
+
+    _write_docs(docs_path, "first doc, edited")
+    assert not manifest.matches(open_document_source(docs_path), CONFIG)
+    other_model = replace(CONFIG, embedding_model="other")
+    _write_docs(docs_path, "first doc")
+    assert not manifest.matches(open_document_source(docs_path), other_model)
+    assert IndexManifest.load(tmp_path / "missing") is None
+
+
+def _snapshot(tmp_path: Path) -> Path:
+    docs_path = tmp_path / "docs.jsonl"
+    _write_docs(docs_path, "first doc", "second doc")
+    build_snapshot(
+        open_document_source(docs_path),
+        CONFIG,
+        FakeEmbedding(),  # pyright: ignore[reportArgumentType]
+        tmp_path / "snapshot",
+    )
+    return tmp_path / "snapshot"
+
+
+def test_manifest_of_another_format_is_not_usable(tmp_path: Path) -> None:
+    snapshot_path = _snapshot(tmp_path)
+    manifest_path = snapshot_path / "manifest.json"
+    data = json.loads(manifest_path.read_text())
+
+    manifest_path.write_text(json.dumps({**data, "added_later": True}))
+    assert IndexManifest.load(snapshot_path) is not None
+    manifest_path.write_text(json.dumps({**data, "version": 0, "renamed": 1}))
+    assert IndexManifest.load(snapshot_path) is None
+    manifest_path.write_text("{not json")
+    assert IndexManifest.load(snapshot_path) is None
+
+
+def test_interrupted_rebuild_leaves_no_manifest(tmp_path: Path) -> None:
+    snapshot_path = _snapshot(tmp_path)
+
+    class InterruptedEmbedding:
+        def embed_content(self, **kwargs: str) -> list[float]:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        build_snapshot(
+            open_document_source(tmp_path / "docs.jsonl"),
+            CONFIG,
+            InterruptedEmbedding(),  # pyright: ignore[reportArgumentType]
+            snapshot_path,
+        )
+    assert IndexManifest.load(snapshot_path) is None
+
+
+def test_corrupt_payloads_raise_snapshot_error(tmp_path: Path) -> None:
+    snapshot_path = _snapshot(tmp_path)
+    (snapshot_path / "payloads.jsonl").write_text('{"id": 1, "payload"\n')
+
+    with pytest.raises(SnapshotError, match="corrupt"):
+        restore_snapshot(snapshot_path, QdrantClient(":memory:"), CONFIG)
+
+
+def test_damaged_snapshot_falls_back_to_a_rebuild(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(main.settings, "data_path", tmp_path)
+    snapshot_path = _snapshot(tmp_path)
+    (snapshot_path / "vectors.npy").write_bytes(b"not a numpy file")
+    embedding = FakeEmbedding()
+    retriever = QdrantRetriever(
+        QdrantClient(":memory:"),
+        CONFIG,
+        embedding,  # pyright: ignore[reportArgumentType]
+    )
+
+    main.build_index(
+        retriever, open_document_source(tmp_path / "docs.jsonl"), snapshot_path
+    )
+
+    assert retriever.client.count("docs").count == 2  # noqa: PLR2004
+    assert embedding.calls == 2  # noqa: PLR2004
@@ -0,0 +1,107 @@
+import asyncio
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from flare_ai_rag.ai import EmbeddingTaskType
+from flare_ai_rag.load_test import load_test_config
+from flare_ai_rag.loadtest import ChatLoadTest, StubEmbedding, StubProvider
+from flare_ai_rag.main import ServiceClients, create_app
+from flare_ai_rag.prompts import RAGRouterClassification, SemanticRouterResponse
+from flare_ai_rag.settings import settings
+from flare_ai_rag.utils import load_json
+
+
+def fast_provider(
+    model: str = "stub", system_instruction: str | None = None
+) -> StubProvider:
+    """A stub provider answering at once, with a canned conversational reply."""
+    return StubProvider(
+        model=model,
+        latency=0.0,
+        tokens_per_second=1e6,
+        conversational=["Hi there!"],
+        system_instruction=system_instruction,
+    )
+
+
+def test_stub_provider_answers_structured_prompts() -> None:
+    provider = fast_provider()
+
+    route = provider.generate(
+        "Route: Hi there!", response_schema=SemanticRouterResponse
+    )
+    assert route.parsed is SemanticRouterResponse.CONVERSATIONAL
+    route = provider.generate(
+        "Route: What is FTSO?", response_schema=SemanticRouterResponse
+    )
+    assert route.parsed is SemanticRouterResponse.RAG_ROUTER
+
+    answer = provider.generate("Classify", response_schema=RAGRouterClassification)
+    assert answer.parsed is RAGRouterClassification.ANSWER
+
+    scores = provider.generate("[1] a\n\n[2] b\n\n[3] c", response_schema=list[float])
+    assert len(scores.parsed) == 3  # noqa: PLR2004
+
+
+def test_stub_embedding_scores_shared_words() -> None:
+    embedding = StubEmbedding(vector_size=256)
+
+    def embed(text: str) -> np.ndarray:
+        return np.array(
+            embedding.embed_content("stub", text, EmbeddingTaskType.RETRIEVAL_QUERY)
+        )
+
+    query = embed("ftso block latency feeds")
+    assert query @ embed("FTSO block-latency feeds update every block") > 0.5  # noqa: PLR2004
+    assert abs(query @ embed("wallet seed phrase recovery")) < 0.3  # noqa: PLR2004
+
+
+def test_load_test_drives_chat_endpoint(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "data_path", tmp_path)
+    docs_path = tmp_path / "docs.jsonl"
+    docs_path.write_text(
+        "".join(
+            json.dumps(
+                {
+                    "file_name": f"{topic}.md",
+                    "meta_data": f"title: {topic}",
+                    "content": f"# {topic}\n\n{topic} explained in detail. " * 20,
+                }
+            )
+            + "\n"
+            for topic in ("FTSO feeds", "FDC attestations", "Staking rewards")
+        )
+    )
+    input_config = load_test_config(
+        load_json(settings.input_path / "input_parameters.json")
+    )
+    input_config["documents"] = str(docs_path)
+    vector_size = input_config["retriever_config"]["vector_size"]
+    clients = ServiceClients(
+        provider=lambda model_config, **kwargs: fast_provider(
+            model_config["id"], **kwargs
+        ),
+        embedding=lambda: StubEmbedding(vector_size),
+    )
+
+    load_test = ChatLoadTest(
+        create_app(input_config, clients, exit_on_failure=False),
+        workload={"rag": ["How do FTSO feeds work?"], "conversational": ["Hi there!"]},
+        rps=50.0,
+        duration=0.2,
+    )
+    report = asyncio.run(load_test.run(startup_timeout=60.0))
+
+    assert report.requests == 10  # noqa: PLR2004
+    assert report.errors == 0
+    rag, conversational = report.routes["rag"], report.routes["conversational"]
+    assert rag["classifications"].get("ANSWER", 0) == rag["requests"]
+    chats = conversational["requests"]
+    assert conversational["classifications"].get("NONE", 0) == chats
+    assert sum(rag["latency"]["buckets"].values()) == rag["requests"]
+    assert report.event_loop_lag["max_ms"] >= 0
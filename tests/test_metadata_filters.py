@@ -0,0 +1,94 @@
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+from qdrant_client import QdrantClient
+
+from flare_ai_rag.api.routes.chat import ChatMessage
+from flare_ai_rag.retriever import (
+    DocumentRecord,
+    QdrantRetriever,
+    RetrieverConfig,
+    build_filter,
+    generate_collection,
+    parse_metadata,
+)
+
+CONFIG = RetrieverConfig(
+    embedding_model="models/test-embedding",
+    collection_name="docs",
+    vector_size=3,
+    host="localhost",
+    port=6333,
+)
+
+INTRO_META = """sidebar_position: 1
+slug: intro
+title: Introduction
+keywords:
+  [
+    flare-network,
+    blockchain,
+  ]"""
+
+FTSO_META = """title: Build your first FTSOv2 app
+tags: [intermediate, ftso, solidity]
+slug: build-first-app
+keywords: [ftso, oracle]"""
+
+
+class FakeEmbedding:
+    def embed_content(self, **kwargs: str) -> list[float]:
+        return [1.0, float(len(kwargs["contents"])), 0.5]
+
+
+def test_parse_metadata() -> None:
+    intro = parse_metadata(INTRO_META, "2025-03-08 01:27:14")
+    ftso = parse_metadata(FTSO_META)
+
+    assert intro.slug == "intro"
+    assert intro.sidebar_position == 1
+    assert intro.keywords == ("flare-network", "blockchain")
+    assert intro.last_updated == "2025-03-08T01:27:14+00:00"
+    assert ftso.tags == ("intermediate", "ftso", "solidity")
+    assert ftso.category == "ftso"
+    assert "category" not in intro.payload()
+
+
+def test_build_filter_rejects_unindexed_fields() -> None:
+    assert build_filter(None) is None
+    with pytest.raises(ValueError, match="unindexed"):
+        build_filter({"text": "flare"})
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"last_updated": {"after": "2025-01-01"}},
+        {"slug": {"gte": "a"}},
+        {"sidebar_position": {"gte": "first"}},
+        {"slug": {"nested": "object"}},
+        {"title": 1.5},
+    ],
+)
+def test_malformed_filters_are_rejected(filters: dict[str, Any]) -> None:
+    with pytest.raises(ValueError, match="filter"):
+        build_filter(filters)
+    with pytest.raises(ValidationError):
+        ChatMessage(message="Hi", filters=filters)
+
+
+def test_filtered_search() -> None:
+    client = QdrantClient(":memory:")
+    documents = [
+        DocumentRecord("intro.mdx", INTRO_META, "Flare is a blockchain.", None),
+        DocumentRecord("ftso.mdx", FTSO_META, "Build an FTSO app.", None),
+    ]
+    generate_collection(documents, client, CONFIG, FakeEmbedding())  # type: ignore[arg-type]
+    retriever = QdrantRetriever(client, CONFIG, FakeEmbedding())  # type: ignore[arg-type]
+
+    results = retriever.semantic_search("query", filters={"keywords": ["oracle"]})
+    assert [r["metadata"]["filename"] for r in results] == ["ftso.mdx"]
+
+    results = retriever.semantic_search("query", filters={"slug": "intro"})
+    assert [r["metadata"]["filename"] for r in results] == ["intro.mdx"]
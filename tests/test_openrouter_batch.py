@@ -0,0 +1,87 @@
+import asyncio
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from flare_ai_rag.ai import AsyncOpenRouterClient, OpenRouterClient
+
+if TYPE_CHECKING:
+    import requests
+
+
+def _fake_response(payload: dict) -> dict:
+    if payload["model"] == "broken":
+        msg = "Error (500): upstream failure"
+        raise ConnectionError(msg)
+    return {"choices": [{"message": {"content": payload["model"]}}]}
+
+
+PAYLOADS = [{"model": "a"}, {"model": "broken"}, {"model": "c"}]
+MAX_CONCURRENCY = 3
+REPEATS = 4
+
+
+def test_sync_batch_preserves_order_and_isolates_errors(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = OpenRouterClient(api_key="test")
+    monkeypatch.setattr(client, "send_chat_completion", _fake_response)
+
+    result = client.send_chat_completions_batch(PAYLOADS, max_concurrency=2)
+
+    assert [item.index for item in result.items] == list(range(len(PAYLOADS)))
+    assert result.responses[0] == _fake_response({"model": "a"})
+    assert result.responses[1] is None
+    assert isinstance(result.errors[1], ConnectionError)
+    assert result.responses[2] == _fake_response({"model": "c"})
+    assert result.stats.total == len(PAYLOADS)
+    assert result.stats.succeeded == len(PAYLOADS) - 1
+    assert result.stats.failed == 1
+    assert result.stats.throughput > 0
+
+
+def test_sync_batch_workers_use_their_own_sessions(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = OpenRouterClient(api_key="test")
+    barrier = threading.Barrier(MAX_CONCURRENCY)
+    sessions: list[requests.Session] = []
+
+    def fake_send(payload: dict) -> dict:
+        barrier.wait(timeout=5)
+        sessions.append(client.session)
+        return _fake_response({"model": "a"})
+
+    monkeypatch.setattr(client, "send_chat_completion", fake_send)
+    client.send_chat_completions_batch(PAYLOADS, max_concurrency=MAX_CONCURRENCY)
+
+    assert len({id(session) for session in sessions}) == MAX_CONCURRENCY
+    assert client.session not in sessions
+
+
+def test_async_batch_bounds_concurrency(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = AsyncOpenRouterClient(api_key="test")
+    in_flight = 0
+    peak = 0
+
+    async def fake_send(payload: dict) -> dict:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _fake_response(payload)
+
+    monkeypatch.setattr(client, "send_chat_completion", fake_send)
+
+    result = asyncio.run(
+        client.send_chat_completions_batch(
+            PAYLOADS * REPEATS, max_concurrency=MAX_CONCURRENCY
+        )
+    )
+
+    assert peak <= MAX_CONCURRENCY
+    assert result.stats.total == len(PAYLOADS) * REPEATS
+    assert result.stats.failed == REPEATS
+    assert [item.index for item in result.items] == list(range(result.stats.total))
@@ -0,0 +1,100 @@
+import json
+from dataclasses import replace
+from pathlib import Path
+
+from qdrant_client import QdrantClient
+
+from flare_ai_rag.retriever import (
+    DocumentRecord,
+    ParentSection,
+    ParentStore,
+    QdrantRetriever,
+    RetrieverConfig,
+    build_snapshot,
+    generate_collection,
+    open_document_source,
+    restore_snapshot,
+)
+from flare_ai_rag.retriever.parents import split_chunks, split_sections
+
+CONFIG = RetrieverConfig(
+    embedding_model="models/test-embedding",
+    collection_name="docs",
+    vector_size=2,
+    host="localhost",
+    port=6333,
+    child_chunk_size=40,
+    child_chunk_overlap=8,
+    parent_max_chars=500,
+)
+
+DOC = (
+    "# FTSO\nThe FTSO delivers price feeds to smart contracts on Flare.\n\n"
+    "It aggregates estimates from many data providers every round.\n"
+    "## Rewards\nProviders earn rewards for accurate price submissions."
+)
+
+
+class FakeEmbedding:
+    """Embeds texts mentioning rewards close to the query vector."""
+
+    def embed_content(self, **kwargs: str) -> list[float]:
+        return [1.0, 0.0] if "reward" in kwargs["contents"] else [0.0, 1.0]
+
+
+def test_split_sections_and_chunks() -> None:
+    sections = split_sections(DOC, max_chars=500)
+
+    assert [s.splitlines()[0] for s in sections] == ["# FTSO", "## Rewards"]
+    chunks = list(split_chunks(sections[0], size=40, overlap=8))
+    assert all(len(chunk) <= 40 for chunk in chunks)  # noqa: PLR2004
+    assert chunks[0].startswith("# FTSO")
+    assert chunks[-1].endswith("round.")
+
+
+def test_parent_store_round_trip(tmp_path: Path) -> None:
+    store = ParentStore(tmp_path / "parents.sqlite3")
+    store.put_many([ParentSection("1-0", "ftso.md", DOC)])
+
+    assert store.get_many(["1-0", "missing"])["1-0"].text == DOC
+    assert len(store) == 1
+
+
+def test_search_expands_children_to_parents(tmp_path: Path) -> None:
+    client = QdrantClient(":memory:")
+    store = ParentStore(tmp_path / "parents.sqlite3")
+    documents = [DocumentRecord("ftso.md", "", DOC)]
+    generate_collection(documents, client, CONFIG, FakeEmbedding(), store)  # type: ignore[arg-type]
+    retriever = QdrantRetriever(client, CONFIG, FakeEmbedding(), store)  # type: ignore[arg-type]
+
+    assert client.count("docs").count > len(store) == 2  # noqa: PLR2004
+    hits = retriever.search("rewards", top_k=2)
+
+    assert [hit.parent_id for hit in hits] == ["1-1", "1-0"]
+    assert hits[0].text is not None
+    assert hits[0].text.startswith("## Rewards")
+    assert hits[1].text is not None
+    assert hits[1].text.startswith("# FTSO")
+
+
+def test_snapshot_restores_parents(tmp_path: Path) -> None:
+    docs_path = tmp_path / "docs.jsonl"
+    docs_path.write_text(
+        json.dumps({"file_name": "ftso.md", "meta_data": "", "content": DOC})
+    )
+    documents = open_document_source(docs_path)
+    manifest = build_snapshot(
+        documents,
+        CONFIG,
+        FakeEmbedding(),  # type: ignore[arg-type]
+        tmp_path / "snapshot",
+    )
+    assert manifest.matches(documents, CONFIG)
+    assert not manifest.matches(documents, replace(CONFIG, child_chunk_size=80))
+
+    client = QdrantClient(":memory:")
+    store = ParentStore(tmp_path / "parents.sqlite3")
+    restore_snapshot(tmp_path / "snapshot", client, CONFIG, parent_store=store)
+
+    assert client.count("docs").count == manifest.num_points
+    assert len(store) == 2  # noqa: PLR2004
@@ -0,0 +1,100 @@
+import time
+from typing import Any, override
+
+import pytest
+
+from flare_ai_rag.ai import (
+    BaseAIProvider,
+    GenerationProfile,
+    ProviderPool,
+    ProviderPoolError,
+)
+from flare_ai_rag.ai.base import ModelResponse
+
+FAILURE_THRESHOLD = 2
+SLOW_SECONDS = 0.5
+HEDGE_AFTER = 0.05
+
+
+class FakeProvider(BaseAIProvider):
+    def __init__(self, text: str, delay: float = 0.0, *, fail: bool = False) -> None:
+        self.text = text
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.chat_history = []
+
+    @override
+    def reset(self) -> None:
+        self.chat_history = []
+
+    @override
+    def reset_model(self, model: str, **kwargs: str) -> None:
+        self.text = model
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+        generation_profile: GenerationProfile | None = None,
+    ) -> ModelResponse:
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            msg = f"{self.text} unavailable"
+            raise ConnectionError(msg)
+        return ModelResponse(text=self.text, raw_response=None, metadata={})
+
+    @override
+    def send_message(self, msg: str) -> ModelResponse:
+        return self.generate(msg)
+
+
+def test_fails_over_and_opens_circuit() -> None:
+    broken = FakeProvider("broken", fail=True)
+    healthy = FakeProvider("healthy")
+    pool = ProviderPool(
+        [broken, healthy], failure_threshold=FAILURE_THRESHOLD, cooldown=60
+    )
+
+    for _ in range(FAILURE_THRESHOLD + 1):
+        assert pool.generate("hi").text == "healthy"
+
+    # The broken member is skipped once its circuit is open.
+    assert broken.calls == FAILURE_THRESHOLD
+    assert pool.health_snapshot()[0]["circuit_open"]
+
+
+def test_raises_when_every_member_fails() -> None:
+    pool = ProviderPool([FakeProvider("a", fail=True), FakeProvider("b", fail=True)])
+    with pytest.raises(ProviderPoolError):
+        pool.generate("hi")
+
+
+def test_hedges_slow_primary() -> None:
+    slow = FakeProvider("slow", delay=SLOW_SECONDS)
+    fast = FakeProvider("fast", delay=0.01)
+    pool = ProviderPool([slow, fast], hedge=True, hedge_after=HEDGE_AFTER)
+
+    start = time.perf_counter()
+    response = pool.generate("hi")
+
+    assert response.text == "fast"
+    assert response.metadata["pool_member"] == "FakeProvider[1]"
+    assert time.perf_counter() - start < SLOW_SECONDS
+
+
+def test_fails_over_when_primary_fails_fast_under_hedging() -> None:
+    broken = FakeProvider("broken", fail=True)
+    healthy = FakeProvider("healthy")
+    pool = ProviderPool([broken, healthy], hedge=True, hedge_after=1.0)
+
+    start = time.perf_counter()
+    response = pool.generate("hi")
+
+    assert response.text == "healthy"
+    assert (broken.calls, healthy.calls) == (1, 1)
+    # The fallback ran as soon as the primary failed, not at the deadline.
+    assert time.perf_counter() - start < SLOW_SECONDS
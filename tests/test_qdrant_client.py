@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import httpx
+import pytest
+
+from flare_ai_rag import main
+from flare_ai_rag.retriever import (
+    RetrieverConfig,
+    create_qdrant_client,
+    qdrant_client_kwargs,
+)
+from flare_ai_rag.retriever.qdrant_collection import create_collection
+
+BASE_CONFIG = {
+    "embedding_model": "models/text-embedding-004",
+    "collection_name": "docs_collection",
+    "vector_size": 4,
+    "host": "localhost",
+    "port": 6333,
+}
+GRPC_PORT = 7334
+SOCKET = "/tmp/qdrant.sock"  # noqa: S108
+
+
+def test_connection_settings_default_to_rest() -> None:
+    config = RetrieverConfig.load(BASE_CONFIG)
+
+    assert config.prefer_grpc is False
+    assert config.grpc_port == 6334  # noqa: PLR2004
+    assert (config.timeout, config.pool_size, config.path) == (None, None, None)
+
+
+def test_embedded_in_memory_client() -> None:
+    config = RetrieverConfig.load({**BASE_CONFIG, "path": ":memory:"})
+
+    assert qdrant_client_kwargs(config) == {"location": ":memory:"}
+
+
+def test_embedded_client_needs_no_server() -> None:
+    client = create_qdrant_client(
+        RetrieverConfig.load({**BASE_CONFIG, "path": ":memory:"})
+    )
+    create_collection(client, "docs_collection", 4)
+
+    assert client.collection_exists("docs_collection")
+
+
+def test_embedded_client_persists_to_path(tmp_path: Path) -> None:
+    config = RetrieverConfig.load({**BASE_CONFIG, "path": str(tmp_path / "qdrant")})
+    client = create_qdrant_client(config)
+    create_collection(client, "docs_collection", 4)
+    client.close()
+
+    assert create_qdrant_client(config).collection_exists("docs_collection")
+
+
+@pytest.mark.parametrize("path", [":memory:", "qdrant"])
+def test_embedded_client_needs_a_single_worker(
+    monkeypatch: pytest.MonkeyPatch, path: str
+) -> None:
+    monkeypatch.setattr(main.settings, "api_workers", 2)
+    input_config = {"retriever_config": {**BASE_CONFIG, "path": path}}
+
+    with pytest.raises(ValueError, match="2 API workers"):
+        main.setup_qdrant(input_config)
+
+
+def test_grpc_client_uses_grpc_port() -> None:
+    config = RetrieverConfig.load(
+        {**BASE_CONFIG, "prefer_grpc": True, "grpc_port": GRPC_PORT, "pool_size": 2}
+    )
+    kwargs = qdrant_client_kwargs(config)
+
+    assert kwargs["prefer_grpc"] is True
+    assert kwargs["grpc_port"] == GRPC_PORT
+    assert kwargs["pool_size"] == 2  # noqa: PLR2004
+    create_qdrant_client(config).close()
+
+
+def test_unix_socket_client_uses_socket_transport() -> None:
+    config = RetrieverConfig.load({**BASE_CONFIG, "unix_socket": SOCKET})
+    kwargs = qdrant_client_kwargs(config)
+
+    assert isinstance(kwargs["transport"], httpx.HTTPTransport)
+    assert kwargs["port"] is None
+
+
+def test_unix_socket_rejects_grpc() -> None:
+    config = RetrieverConfig.load(
+        {**BASE_CONFIG, "unix_socket": SOCKET, "prefer_grpc": True}
+    )
+
+    with pytest.raises(ValueError, match="unix socket"):
+        create_qdrant_client(config)
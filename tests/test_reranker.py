@@ -0,0 +1,173 @@
+import threading
+import time
+from typing import Any, override
+
+from flare_ai_rag.ai import BaseAIProvider, GenerationProfile
+from flare_ai_rag.ai.base import ModelResponse
+from flare_ai_rag.reranker import BaseReranker, LLMReranker, RerankerConfig, RerankStage
+from flare_ai_rag.retriever import SearchHit
+
+CONCURRENT_REQUESTS = 8
+
+
+class LengthReranker(BaseReranker):
+    def __init__(self, delay: float = 0.0, *, fail: bool = False) -> None:
+        self.delay = delay
+        self.fail = fail
+
+    @override
+    def score(self, query: str, documents: list[str]) -> list[float]:
+        time.sleep(self.delay)
+        if self.fail:
+            msg = "scorer unavailable"
+            raise RuntimeError(msg)
+        return [float(len(text)) for text in documents]
+
+
+class JsonProvider(BaseAIProvider):
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.prompts: list[str] = []
+
+    @override
+    def reset(self) -> None:
+        pass
+
+    @override
+    def reset_model(self, model: str, **kwargs: str) -> None:
+        pass
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+        generation_profile: GenerationProfile | None = None,
+    ) -> ModelResponse:
+        self.prompts.append(prompt)
+        return ModelResponse(text=self.text, raw_response=None, metadata={})
+
+    @override
+    def send_message(self, msg: str) -> ModelResponse:
+        return self.generate(msg)
+
+
+def _hits(*texts: str) -> list[SearchHit]:
+    return [
+        SearchHit(id=idx, score=1.0 - idx / 10, metadata={}, text=text)
+        for idx, text in enumerate(texts)
+    ]
+
+
+def test_reranks_to_top_k() -> None:
+    stage = RerankStage(LengthReranker(), candidates=10, top_k=2, budget=1.0)
+
+    hits = stage.rerank("q", _hits("a", "ccc", "bb"))
+
+    assert [hit.text for hit in hits] == ["ccc", "bb"]
+    assert stage.reranked == 1
+
+
+def test_falls_back_to_vector_order() -> None:
+    slow = RerankStage(LengthReranker(delay=0.3), candidates=10, top_k=2, budget=0.05)
+    broken = RerankStage(LengthReranker(fail=True), candidates=10, top_k=2, budget=1.0)
+    spent = RerankStage(LengthReranker(), candidates=10, top_k=2, budget=0.1)
+
+    for stage, started in (
+        (slow, None),
+        (broken, None),
+        (spent, time.perf_counter() - 1),
+    ):
+        hits = stage.rerank("q", _hits("a", "ccc", "bb"), started=started)
+        assert [hit.text for hit in hits] == ["a", "ccc"]
+        assert stage.skipped == 1
+
+
+def test_fetches_text_only_for_hits_it_scores_or_returns() -> None:
+    stage = RerankStage(LengthReranker(), candidates=10, top_k=2, budget=1.0)
+    fetched: list[list[int | str]] = []
+
+    def fetch_text(hits: list[SearchHit]) -> list[SearchHit]:
+        fetched.append([hit.id for hit in hits])
+        for hit in hits:
+            hit.text = "x" * (len(fetched) + int(hit.id))
+        return hits
+
+    def untexted() -> list[SearchHit]:
+        return [SearchHit(id=idx, score=1.0, metadata={}) for idx in range(3)]
+
+    assert [hit.id for hit in stage.rerank("q", untexted(), None, fetch_text)] == [
+        2,
+        1,
+    ]
+    stage.rerank("q", untexted(), time.perf_counter() - 1, fetch_text)
+
+    assert fetched == [[0, 1, 2], [0, 1]]
+
+
+def test_timeout_cancels_queued_scorer_calls() -> None:
+    release = threading.Event()
+    calls: list[list[str]] = []
+
+    class BlockingReranker(BaseReranker):
+        @override
+        def score(self, query: str, documents: list[str]) -> list[float]:
+            calls.append(documents)
+            release.wait(timeout=5)
+            return [0.0] * len(documents)
+
+    stage = RerankStage(BlockingReranker(), candidates=10, top_k=2, budget=0.2)
+    # More concurrent requests than the stage has worker threads, so the
+    # calls beyond them wait in the queue until they time out.
+    barrier = threading.Barrier(CONCURRENT_REQUESTS)
+    results: list[list[SearchHit]] = []
+
+    def request() -> None:
+        barrier.wait(timeout=5)
+        results.append(stage.rerank("q", _hits("a", "ccc", "bb")))
+
+    threads = [threading.Thread(target=request) for _ in range(CONCURRENT_REQUESTS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    release.set()
+    # Give calls that were wrongly left queued time to start.
+    time.sleep(0.2)
+
+    assert all([hit.text for hit in hits] == ["a", "ccc"] for hits in results)
+    assert stage.skipped == CONCURRENT_REQUESTS
+    assert 0 < len(calls) < CONCURRENT_REQUESTS
+
+
+def test_concurrent_reranks_are_all_counted() -> None:
+    stage = RerankStage(LengthReranker(), candidates=10, top_k=2, budget=1.0)
+    reranks = 50
+
+    def request() -> None:
+        for _ in range(reranks):
+            stage.rerank("q", _hits("a", "ccc", "bb"))
+
+    threads = [threading.Thread(target=request) for _ in range(CONCURRENT_REQUESTS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = stage.stats()
+    assert stats["reranked"] + stats["skipped"] == CONCURRENT_REQUESTS * reranks
+    assert 0 < stats["expected_latency"] < stage.budget
+
+
+def test_llm_reranker_scores_in_one_call() -> None:
+    provider = JsonProvider("[1, 9.5, 3]")
+    config = RerankerConfig.load({"max_chars": 4})
+    reranker = LLMReranker(provider, config)
+
+    scores = reranker.score("what is flare?", ["first doc", "second doc", "third"])
+
+    assert scores == [1.0, 9.5, 3.0]
+    assert len(provider.prompts) == 1
+    assert "[2] seco" in provider.prompts[0]
+    assert "second doc" not in provider.prompts[0]
@@ -0,0 +1,109 @@
+import math
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, override
+
+import pytest
+
+from flare_ai_rag.evaluation import (
+    BenchmarkReport,
+    LabeledQuery,
+    RetrievalBenchmark,
+    build_query_set,
+    load_query_set,
+    ndcg_at_k,
+    recall_at_k,
+    reciprocal_rank,
+    save_query_set,
+)
+from flare_ai_rag.retriever import BaseRetriever, JsonlDocumentSource
+
+
+class FakeRetriever(BaseRetriever):
+    """Returns fixed file names per query."""
+
+    def __init__(self, rankings: dict[str, list[str]]) -> None:
+        self.rankings = rankings
+
+    @override
+    def semantic_search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Mapping[str, Any] | None = None,
+        score_threshold: float | None = None,
+    ) -> list[dict]:
+        if query not in self.rankings:
+            msg = "no such query"
+            raise KeyError(msg)
+        return [
+            {"text": "", "score": 1.0, "metadata": {"filename": name}}
+            for name in self.rankings[query][:top_k]
+        ]
+
+
+def test_ranking_metrics() -> None:
+    ranking = [{"a.md"}, {"b.md", "c.md"}, {"d.md"}]
+    relevant = {"c.md": 1.0, "d.md": 2.0}
+
+    assert recall_at_k(ranking, relevant, 1) == 0.0
+    assert recall_at_k(ranking, relevant, 2) == 0.5  # noqa: PLR2004
+    assert reciprocal_rank(ranking, relevant) == 0.5  # noqa: PLR2004
+
+    dcg = 1 / math.log2(3) + 3 / math.log2(4)
+    idcg = 3 / math.log2(2) + 1 / math.log2(3)
+    assert ndcg_at_k(ranking, relevant, 3) == pytest.approx(dcg / idcg)
+    assert ndcg_at_k([{"d.md"}, {"c.md"}], relevant, 2) == pytest.approx(1.0)
+
+
+def test_benchmark_report_and_regressions(tmp_path: Path) -> None:
+    queries = [
+        LabeledQuery("ftso feeds", {"feeds.md": 1.0}),
+        LabeledQuery("fdc attestation", {"fdc.md": 1.0}),
+        LabeledQuery("broken", {"x.md": 1.0}),
+    ]
+    retriever = FakeRetriever(
+        {"ftso feeds": ["feeds.md", "other.md"], "fdc attestation": ["a.md", "fdc.md"]}
+    )
+
+    report = RetrievalBenchmark(retriever, queries, k_values=(1, 2)).run()
+
+    assert report.queries == len(queries)
+    assert report.errors == 1
+    assert report.metrics["recall@1"] == pytest.approx(1 / 3, abs=1e-4)
+    assert report.metrics["recall@2"] == pytest.approx(2 / 3, abs=1e-4)
+    assert report.metrics["mrr"] == pytest.approx(0.5)
+    assert report.results[1].retrieved == [["a.md"], ["fdc.md"]]
+    assert report.throughput["qps"] > 0
+
+    report.save(tmp_path / "report.json")
+    baseline = BenchmarkReport.load(tmp_path / "report.json")
+    assert baseline.results[0].metrics == report.results[0].metrics
+    assert report.compare(baseline) == []
+
+    worse = RetrievalBenchmark(
+        FakeRetriever({"ftso feeds": ["other.md", "feeds.md"]}), queries, (1, 2)
+    ).run()
+    regressions = worse.compare(baseline)
+    assert any(r.startswith("recall@1") for r in regressions)
+    assert any(r.startswith("mrr") for r in regressions)
+
+
+def test_query_set_from_documents(tmp_path: Path) -> None:
+    docs_path = tmp_path / "docs.jsonl"
+    docs_path.write_text(
+        '{"file_name": "a.md", "meta_data": "title: Intro\\ndescription: What is'
+        ' Flare?", "content": "Flare."}\n'
+        '{"file_name": "b.md", "meta_data": "title: Run a validator node",'
+        ' "content": "Nodes."}\n'
+        '{"file_name": "c.md", "meta_data": "title: FAQ", "content": "FAQ."}\n'
+    )
+
+    queries = build_query_set(JsonlDocumentSource(docs_path))
+
+    assert queries == [
+        LabeledQuery("What is Flare?", {"a.md": 1.0}),
+        LabeledQuery("Run a validator node", {"b.md": 1.0}),
+    ]
+    save_query_set(queries, tmp_path / "queries.jsonl")
+    assert load_query_set(tmp_path / "queries.jsonl") == queries
@@ -0,0 +1,54 @@
+from flare_ai_rag.retriever import AdaptiveCutoff, CutoffConfig, SearchHit
+
+
+def _hits(*scores: float, chars: int = 400) -> list[SearchHit]:
+    return [
+        SearchHit(id=idx, score=score, metadata={}, text="x" * chars)
+        for idx, score in enumerate(scores)
+    ]
+
+
+def test_keeps_max_k_without_thresholds() -> None:
+    cutoff = AdaptiveCutoff(CutoffConfig(max_k=3))
+
+    scores = (0.9, 0.8, 0.7, 0.6)
+
+    hits, decision = cutoff.by_score(_hits(*scores))
+
+    assert len(hits) == cutoff.config.max_k
+    assert decision.reason == "max_k"
+    assert decision.candidates == len(scores)
+
+
+def test_cuts_relative_threshold_and_elbow() -> None:
+    relative = AdaptiveCutoff(CutoffConfig(max_k=5, relative_threshold=0.8))
+    elbow = AdaptiveCutoff(CutoffConfig(max_k=5, elbow_gap=0.1))
+
+    hits, decision = relative.by_score(_hits(0.9, 0.85, 0.7, 0.68))
+    assert [hit.score for hit in hits] == [0.9, 0.85]
+    assert decision.reason == "relative_threshold"
+
+    hits, decision = elbow.by_score(_hits(0.82, 0.8, 0.79, 0.6, 0.58))
+    assert [hit.score for hit in hits] == [0.82, 0.8, 0.79]
+    assert decision.reason == "elbow"
+    assert decision.last_score == 0.79  # noqa: PLR2004
+
+
+def test_keeps_min_k() -> None:
+    cutoff = AdaptiveCutoff(CutoffConfig(max_k=5, min_k=2, relative_threshold=0.9))
+
+    hits, _ = cutoff.by_score(_hits(0.9, 0.5, 0.4))
+
+    assert len(hits) == cutoff.config.min_k
+
+
+def test_caps_context_tokens() -> None:
+    cutoff = AdaptiveCutoff(CutoffConfig(max_k=5, max_context_tokens=250))
+
+    hits, decision = cutoff.by_score(_hits(0.9, 0.8, 0.7))
+    hits = cutoff.by_tokens(hits, decision)
+
+    assert len(hits) == decision.kept == 2  # noqa: PLR2004
+    assert decision.reason == "max_context_tokens"
+    assert decision.context_tokens == 200  # noqa: PLR2004
+    assert decision.to_dict()["kept"] == decision.kept
@@ -0,0 +1,97 @@
+from pathlib import Path
+from typing import Any, override
+
+from flare_ai_rag.router import (
+    BaseQueryRouter,
+    CachedQueryRouter,
+    FallbackClassification,
+    RouterDecisionCache,
+)
+
+
+class CountingRouter(BaseQueryRouter):
+    def __init__(self, classification: str = "ANSWER") -> None:
+        self.classification = classification
+        self.calls = 0
+
+    @override
+    def route_query(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+        *,
+        user_input: str | None = None,
+    ) -> str:
+        self.calls += 1
+        return self.classification
+
+
+def test_normalized_prompts_share_one_classification() -> None:
+    inner = CountingRouter()
+    router = CachedQueryRouter(inner, RouterDecisionCache(), model_id="m")
+
+    assert router.route_query("What is Flare?") == "ANSWER"
+    assert router.route_query("  what is   FLARE ") == "ANSWER"
+
+    assert inner.calls == 1
+    assert router.cache.hits == 1
+    assert router.cache.hit_rate == 1 / 2
+
+
+def test_decisions_are_keyed_on_the_normalized_user_query() -> None:
+    inner = CountingRouter()
+    router = CachedQueryRouter(inner, RouterDecisionCache(), model_id="m")
+
+    for query in ("What is Flare?", "what is flare"):
+        prompt = f"Classify the query.\nQuery: {query}\nAnswer:"
+        assert router.route_query(prompt, user_input=query) == "ANSWER"
+
+    assert inner.calls == 1
+
+
+def test_fallback_decisions_are_not_cached() -> None:
+    inner = CountingRouter(FallbackClassification("CLARIFY"))
+    router = CachedQueryRouter(inner, RouterDecisionCache(), model_id="m")
+
+    attempts = 2
+    for _ in range(attempts):
+        assert router.route_query("prompt", user_input="query") == "CLARIFY"
+
+    assert inner.calls == attempts
+    assert router.cache.stats()["size"] == 0
+
+
+def test_cache_is_keyed_by_model() -> None:
+    cache = RouterDecisionCache()
+    cache.set("model-a", "query", "ANSWER")
+
+    assert cache.get("model-b", "query") is None
+    assert cache.get("model-a", "query") == "ANSWER"
+
+
+def test_lru_bound_and_ttl() -> None:
+    cache = RouterDecisionCache(max_size=2)
+    cache.set("m", "a", "ANSWER")
+    cache.set("m", "b", "CLARIFY")
+    cache.get("m", "a")
+    cache.set("m", "c", "REJECT")
+
+    assert cache.get("m", "b") is None
+    assert cache.get("m", "a") == "ANSWER"
+    assert cache.evictions == 1
+
+    expired = RouterDecisionCache(ttl=-1)
+    expired.set("m", "a", "ANSWER")
+    assert expired.get("m", "a") is None
+
+
+def test_shared_store_serves_other_processes(tmp_path: Path) -> None:
+    path = tmp_path / "router_cache.sqlite3"
+    writer = RouterDecisionCache(shared_path=path)
+    reader = RouterDecisionCache(shared_path=path)
+
+    writer.set("m", "What is Flare?", "ANSWER")
+
+    assert reader.get("m", "what is flare") == "ANSWER"
+    assert reader.hits == 1
@@ -0,0 +1,57 @@
+from dataclasses import replace
+
+from qdrant_client import QdrantClient
+
+from flare_ai_rag.retriever import (
+    DocumentRecord,
+    QdrantRetriever,
+    RetrieverConfig,
+    generate_collection,
+)
+
+CONFIG = RetrieverConfig(
+    embedding_model="models/test-embedding",
+    collection_name="docs",
+    vector_size=3,
+    host="localhost",
+    port=6333,
+    payload_fields=("filename", "title"),
+)
+
+
+class FakeEmbedding:
+    def embed_content(self, **kwargs: str) -> list[float]:
+        return [1.0, float(len(kwargs["contents"])), 0.5]
+
+
+def _retriever(config: RetrieverConfig) -> QdrantRetriever:
+    client = QdrantClient(":memory:")
+    documents = [
+        DocumentRecord("intro.mdx", "title: Introduction\nslug: intro", "Flare.", None),
+        DocumentRecord("ftso.mdx", "title: FTSO\nslug: ftso", "FTSO " * 100, None),
+    ]
+    generate_collection(documents, client, config, FakeEmbedding())  # type: ignore[arg-type]
+    return QdrantRetriever(client, config, FakeEmbedding())  # type: ignore[arg-type]
+
+
+def test_projection_and_lazy_text() -> None:
+    retriever = _retriever(CONFIG)
+
+    hits = retriever.search("query", top_k=2, with_text=False)
+
+    assert all(hit.text is None for hit in hits)
+    assert all(set(hit.metadata) == {"filename", "title"} for hit in hits)
+
+    retriever.fetch_text(hits[:1])
+    assert hits[0].text
+    assert hits[1].text is None
+
+
+def test_semantic_search_keeps_document_dicts() -> None:
+    retriever = _retriever(replace(CONFIG, payload_fields=None))
+
+    results = retriever.semantic_search("query", top_k=2)
+
+    assert {r["text"] for r in results} == {"Flare.", "FTSO " * 100}
+    assert "slug" in results[0]["metadata"]
+    assert "text" not in results[0]["metadata"]
@@ -0,0 +1,30 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from flare_ai_rag import main
+from flare_ai_rag.main import create_app
+
+STARTUP_TIMEOUT = 10.0
+
+
+def test_chat_answers_503_until_ready_and_failure_is_reported(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(main, "STARTUP_ATTEMPTS", 2)
+    monkeypatch.setattr(main, "STARTUP_RETRY_SECONDS", 0.0)
+    # The configuration lacks every section, so each attempt fails.
+    app = create_app({}, exit_on_failure=False)
+
+    with TestClient(app) as client:
+        tracker = app.state.startup
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while not tracker.failed and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert client.get("/ready").json()["status"] == "failed"
+        response = client.post("/api/routes/chat/", json={"message": "Hi"})
+        assert response.status_code == 503  # noqa: PLR2004
+        assert "Retry-After" in response.headers
+        assert client.get("/health").status_code == 200  # noqa: PLR2004
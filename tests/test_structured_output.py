@@ -0,0 +1,86 @@
+from typing import Any, override
+
+import pytest
+
+from flare_ai_rag.ai import BaseAIProvider, GenerationProfile, OpenRouterClient
+from flare_ai_rag.ai.base import ModelResponse
+from flare_ai_rag.prompts import PromptService, RAGRouterClassification
+from flare_ai_rag.router import GeminiRouter, QueryRouter, RouterConfig
+from flare_ai_rag.utils import parse_structured_output
+
+
+class EnumProvider(BaseAIProvider):
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    @override
+    def reset(self) -> None:
+        pass
+
+    @override
+    def reset_model(self, model: str, **kwargs: str) -> None:
+        pass
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+        generation_profile: GenerationProfile | None = None,
+    ) -> ModelResponse:
+        return ModelResponse(
+            text=self.text,
+            raw_response=None,
+            metadata={},
+            parsed=parse_structured_output(
+                self.text, response_mime_type, response_schema
+            ),
+        )
+
+    @override
+    def send_message(self, msg: str) -> ModelResponse:
+        return self.generate(msg)
+
+
+def test_enum_output_is_parsed_to_member() -> None:
+    parsed = parse_structured_output("REJECT\n", "text/x.enum", RAGRouterClassification)
+    assert parsed is RAGRouterClassification.REJECT
+    assert (
+        parse_structured_output("maybe", "text/x.enum", RAGRouterClassification) is None
+    )
+    assert parse_structured_output('{"a": 1}', "application/json", None) == {"a": 1}
+    assert parse_structured_output("free text", None, None) is None
+
+
+def test_gemini_router_reads_enum_output() -> None:
+    prompt, mime_type, schema = PromptService().get_formatted_prompt(
+        "rag_router", user_input="What is the FTSO?"
+    )
+    router = GeminiRouter(
+        client=EnumProvider("ANSWER"), config=RouterConfig.load({"id": "test"})
+    )
+
+    assert "What is the FTSO?" in prompt
+    assert router.route_query(prompt, mime_type, schema) == "ANSWER"
+
+
+@pytest.mark.parametrize(
+    ("reply", "classification"),
+    [("REJECT\n", "REJECT"), ('{"classification": "answer"}', "ANSWER")],
+)
+def test_query_router_reads_enum_output(
+    monkeypatch: pytest.MonkeyPatch, reply: str, classification: str
+) -> None:
+    prompt, mime_type, schema = PromptService().get_formatted_prompt(
+        "rag_router", user_input="What is the FTSO?"
+    )
+    client = OpenRouterClient(api_key="test")
+    monkeypatch.setattr(
+        client,
+        "send_chat_completion",
+        lambda payload: {"choices": [{"message": {"content": reply}}]},
+    )
+    router = QueryRouter(client=client, config=RouterConfig.load({"id": "test"}))
+
+    assert router.route_query(prompt, mime_type, schema) == classification
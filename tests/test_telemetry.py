@@ -0,0 +1,112 @@
+import contextvars
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from flare_ai_rag.ai.gemini import token_usage
+from flare_ai_rag.loadtest import StubProvider
+from flare_ai_rag.telemetry import (
+    InstrumentedProvider,
+    PipelineMetrics,
+    enable_multiprocess,
+    pipeline_trace,
+    render_metrics,
+    stage,
+)
+
+# Stub provider answering at once.
+fast_stub = partial(StubProvider, latency=0.0, tokens_per_second=1e6)
+
+
+def test_trace_records_stages_and_model_usage() -> None:
+    provider = InstrumentedProvider(fast_stub(model="stub-responder", output_tokens=7))
+
+    with pipeline_trace() as trace:
+        with stage("retrieval"), stage("vector_search"):
+            pass
+        with stage("generation"):
+            provider.generate("two words")
+            provider.generate("three more words")
+        provider.send_message("hi")
+
+    timings = trace.to_dict()
+    assert set(timings["stages_ms"]) == {"retrieval", "vector_search", "generation"}
+    assert timings["stages_ms"]["retrieval"] >= timings["stages_ms"]["vector_search"]
+    generation = timings["usage"]["generation"]["stub-responder"]
+    assert generation["calls"] == 2  # noqa: PLR2004
+    assert generation["prompt_tokens"] == 5  # noqa: PLR2004
+    assert generation["completion_tokens"] == 14  # noqa: PLR2004
+    assert generation["total_tokens"] == 19  # noqa: PLR2004
+    assert timings["usage"]["other"]["stub-responder"]["calls"] == 1
+
+
+def test_model_calls_in_worker_threads_join_the_request_trace() -> None:
+    provider = InstrumentedProvider(fast_stub(model="stub-reranker"))
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with pipeline_trace() as trace, stage("rerank"):
+            executor.submit(
+                contextvars.copy_context().run, provider.generate, "[1] a"
+            ).result()
+        # Outside the trace, calls are not attributed to any request.
+        executor.submit(provider.generate, "[1] a").result()
+
+    assert trace.usage["rerank"]["stub-reranker"].calls == 1
+
+
+def test_gemini_token_usage() -> None:
+    response = SimpleNamespace(
+        usage_metadata=SimpleNamespace(
+            prompt_token_count=120, candidates_token_count=30, total_token_count=150
+        )
+    )
+    assert token_usage(response) == {
+        "prompt_tokens": 120,
+        "completion_tokens": 30,
+        "total_tokens": 150,
+    }
+    assert token_usage(SimpleNamespace()) == {}
+
+
+def test_prometheus_metrics() -> None:
+    prometheus_client = pytest.importorskip("prometheus_client")
+    registry = prometheus_client.CollectorRegistry()
+    metrics = PipelineMetrics(registry)
+
+    metrics.observe_stage("embedding", 0.02)
+    metrics.observe_model_call(
+        "generation", "gemini", 1.5, {"prompt_tokens": 100, "completion_tokens": 20}
+    )
+
+    sample = registry.get_sample_value
+    assert sample("rag_stage_duration_seconds_count", {"stage": "embedding"}) == 1
+    labels = {"stage": "generation", "model": "gemini"}
+    assert sample("rag_model_call_duration_seconds_sum", labels) == 1.5  # noqa: PLR2004
+    assert sample("rag_model_tokens_total", {**labels, "kind": "prompt"}) == 100  # noqa: PLR2004
+    assert sample("rag_model_tokens_total", {**labels, "kind": "completion"}) == 20  # noqa: PLR2004
+
+
+def test_metrics_are_summed_over_workers(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    pytest.importorskip("prometheus_client")
+    # Restored after the test, undoing `enable_multiprocess`.
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", "")
+    enable_multiprocess(tmp_path)
+    worker = (
+        "from flare_ai_rag.telemetry import pipeline_metrics\n"
+        "pipeline_metrics().observe_stage('embedding', 0.02)\n"
+    )
+
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", worker], check=True)  # noqa: S603
+
+    rendered = render_metrics()
+    assert rendered is not None
+    body = rendered[0].decode()
+    assert 'rag_stage_duration_seconds_count{stage="embedding"} 2.0' in body
@@ -0,0 +1,260 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi import Request
+
+from flare_ai_rag import main
+from flare_ai_rag.ai import OpenRouterProvider
+from flare_ai_rag.api.routes.chat import ChatMessage, client_identity
+from flare_ai_rag.telemetry import (
+    InstrumentedProvider,
+    SharedLimitStore,
+    UsageAccountant,
+    UsageConfig,
+    UsageLimitError,
+    pipeline_trace,
+    stage,
+)
+from flare_ai_rag.telemetry.pipeline import PipelineTrace
+
+DAY = 86400.0
+
+
+class FakeClock:
+    def __init__(self, now: float = 10 * DAY) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def limited(
+    config: UsageConfig, clock: FakeClock, shared_path: Path | None
+) -> UsageAccountant:
+    """An accountant keeping its limit state in memory, or in a shared file."""
+    if shared_path is None:
+        return UsageAccountant(config, clock=clock)
+    return UsageAccountant(
+        config, limits=SharedLimitStore(shared_path / "limits.sqlite3", config, clock)
+    )
+
+
+# Limits kept in memory, and in a file shared between workers.
+stores = pytest.mark.parametrize("shared", [False, True], ids=["local", "shared"])
+
+
+def trace_with(route: str, calls: dict[str, list[dict[str, Any]]]) -> PipelineTrace:
+    """A trace of the given model calls, by stage, of one request."""
+    trace = PipelineTrace(route=route)
+    for stage_name, usages in calls.items():
+        for usage in usages:
+            trace.add_model_call(
+                stage_name,
+                usage["model"],
+                0.1,
+                {
+                    "prompt_tokens": usage["prompt"],
+                    "completion_tokens": usage["completion"],
+                },
+                usage.get("cost"),
+            )
+    return trace
+
+
+def test_openrouter_usage_is_reported_and_traced() -> None:
+    provider = OpenRouterProvider(api_key="", model="openai/gpt-4o-mini")
+    payloads: list[dict] = []
+
+    def send_chat_completion(payload: dict) -> dict:
+        payloads.append(payload)
+        return {
+            "model": "openai/gpt-4o-mini",
+            "choices": [{"message": {"content": "Hello"}}],
+            "usage": {
+                "prompt_tokens": 12,
+                "completion_tokens": 3,
+                "total_tokens": 15,
+                "cost": 0.0002,
+            },
+        }
+
+    provider.client.send_chat_completion = send_chat_completion
+    response = provider.generate("Hi")
+    assert payloads[0]["usage"] == {"include": True}
+    assert response.metadata["usage"]["total_tokens"] == 15  # noqa: PLR2004
+
+    with pipeline_trace() as trace, stage("conversation"):
+        InstrumentedProvider(provider).send_message("Hi")
+    usage = trace.usage["conversation"]["openai/gpt-4o-mini"]
+    assert (usage.prompt_tokens, usage.completion_tokens) == (12, 3)
+    assert usage.cost == pytest.approx(0.0002)
+
+
+def test_accountant_aggregates_by_route_and_model() -> None:
+    config = UsageConfig.load(
+        {"prices": {"gemini-1.5-flash": {"prompt": 0.1, "completion": 0.4}}}
+    )
+    accountant = UsageAccountant(config, clock=FakeClock())
+    rag = trace_with(
+        "RagRouter",
+        {
+            "semantic_route": [
+                {"model": "gemini-1.5-flash", "prompt": 1000, "completion": 0}
+            ],
+            "generation": [
+                {"model": "gemini-1.5-flash", "prompt": 4000, "completion": 1000},
+                {
+                    "model": "openai/gpt-4o",
+                    "prompt": 100,
+                    "completion": 10,
+                    "cost": 0.01,
+                },
+            ],
+        },
+    )
+
+    cost = accountant.record(rag, accountant.check("alice"))
+    accountant.record(PipelineTrace(route="Conversational"), accountant.check(None))
+
+    assert cost == pytest.approx(5000 * 0.1e-6 + 1000 * 0.4e-6 + 0.01)
+    spend = accountant.spend()
+    assert spend["total"]["requests"] == 2  # noqa: PLR2004
+    assert spend["total"]["total_tokens"] == 6110  # noqa: PLR2004
+    assert spend["by_route"]["RagRouter"]["requests"] == 1
+    assert spend["by_model"]["gemini-1.5-flash"]["calls"] == 2  # noqa: PLR2004
+    assert spend["by_model"]["openai/gpt-4o"]["cost"] == pytest.approx(0.01)
+    assert spend["today"]["cost"] == pytest.approx(cost)
+    assert spend["today"]["users"] == 2  # noqa: PLR2004
+    assert "by_user" not in spend
+
+
+@stores
+def test_daily_budgets_reset_at_midnight(tmp_path: Path, *, shared: bool) -> None:
+    clock = FakeClock()
+    accountant = limited(
+        UsageConfig(user_daily_tokens=1000), clock, tmp_path if shared else None
+    )
+    big = {"generation": [{"model": "m", "prompt": 900, "completion": 200}]}
+
+    accountant.record(trace_with("RagRouter", big), accountant.check("alice"))
+    with pytest.raises(UsageLimitError) as exceeded:
+        accountant.check("alice")
+    assert exceeded.value.limit == "user_daily_tokens"
+    assert exceeded.value.retry_after == pytest.approx(DAY)
+    accountant.check("bob")
+
+    clock.now += DAY
+    accountant.check("alice")
+    assert accountant.spend()["rejected"] == {"user_daily_tokens": 1}
+
+
+@stores
+def test_rate_limits_use_a_sliding_window(tmp_path: Path, *, shared: bool) -> None:
+    clock = FakeClock()
+    accountant = limited(
+        UsageConfig(user_requests_per_minute=2), clock, tmp_path if shared else None
+    )
+
+    for _ in range(2):
+        admission = accountant.check("alice")
+        accountant.record(PipelineTrace(route="Conversational"), admission)
+        clock.now += 10
+    with pytest.raises(UsageLimitError) as exceeded:
+        accountant.check("alice")
+    assert exceeded.value.limit == "user_requests_per_minute"
+    assert exceeded.value.retry_after == pytest.approx(40)
+
+    clock.now += 40
+    accountant.check("alice")
+
+
+@stores
+def test_admitted_requests_count_before_they_complete(
+    tmp_path: Path, *, shared: bool
+) -> None:
+    accountant = limited(
+        UsageConfig(user_requests_per_minute=2),
+        FakeClock(),
+        tmp_path if shared else None,
+    )
+
+    in_flight = [accountant.check("alice") for _ in range(2)]
+    with pytest.raises(UsageLimitError) as exceeded:
+        accountant.check("alice")
+    assert exceeded.value.limit == "user_requests_per_minute"
+
+    for admission in in_flight:
+        accountant.record(PipelineTrace(route="Conversational"), admission)
+    assert accountant.spend()["total"]["requests"] == len(in_flight)
+
+
+@stores
+def test_daily_spend_is_kept_for_a_bounded_number_of_users(
+    tmp_path: Path, *, shared: bool
+) -> None:
+    clock = FakeClock()
+    accountant = limited(
+        UsageConfig(user_daily_tokens=1000, max_tracked_users=2),
+        clock,
+        tmp_path if shared else None,
+    )
+    big = {"generation": [{"model": "m", "prompt": 900, "completion": 200}]}
+
+    for user in ("alice", "bob", "carol"):
+        accountant.record(trace_with("RagRouter", big), accountant.check(user))
+        clock.now += 1
+
+    today = accountant.spend()["today"]
+    assert today["users"] == 2  # noqa: PLR2004
+    assert today["total_tokens"] == 3 * 1100
+    # Alice was seen least recently, so her spend is forgotten first.
+    accountant.check("alice")
+    with pytest.raises(UsageLimitError):
+        accountant.check("carol")
+
+
+def test_shared_limits_hold_across_workers(tmp_path: Path) -> None:
+    clock = FakeClock()
+    config = UsageConfig(user_requests_per_minute=3, daily_cost=0.01)
+    workers = [limited(config, clock, tmp_path) for _ in range(2)]
+    costly = {
+        "generation": [{"model": "m", "prompt": 1, "completion": 1, "cost": 0.01}]
+    }
+
+    workers[0].check("alice")
+    workers[1].check("alice")
+    workers[0].check("alice")
+    with pytest.raises(UsageLimitError) as exceeded:
+        workers[1].check("alice")
+    assert exceeded.value.limit == "user_requests_per_minute"
+
+    workers[0].record(trace_with("RagRouter", costly), workers[0].check("bob"))
+    with pytest.raises(UsageLimitError) as exceeded:
+        workers[1].check("carol")
+    assert exceeded.value.limit == "daily_cost"
+    assert workers[1].spend()["today"]["users"] == 1
+
+
+def test_limits_without_a_shared_store_need_a_single_worker(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(main.settings, "data_path", tmp_path)
+    monkeypatch.setattr(main.settings, "api_workers", 2)
+    usage = {"prices": {}, "user_requests_per_minute": 10}
+
+    with pytest.raises(ValueError, match="shared_path"):
+        main.setup_usage({"usage": usage})
+    assert main.setup_usage({"usage": {"prices": {}}}) is not None
+    accountant = main.setup_usage({"usage": {**usage, "shared_path": "limits.sqlite3"}})
+    assert accountant is not None
+    assert isinstance(accountant.limits, SharedLimitStore)
+
+
+def test_users_are_identified_by_client_address() -> None:
+    request = Request({"type": "http", "client": ("203.0.113.7", 52100)})
+    message = ChatMessage.model_validate({"message": "Hi", "user": "someone-else"})
+
+    assert client_identity(request) == "203.0.113.7"
+    assert client_identity(Request({"type": "http"})) is None
+    assert "user" not in message.model_dump()